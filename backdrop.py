@@ -0,0 +1,88 @@
+from PIL import Image, ImageDraw
+from spatial import BBox
+from typing import List, Dict, Tuple, Optional, Iterable, Callable, Any
+import math
+
+TILE_SIZE: int = 512  # The size of a backdrop tile, in screen pixels
+MAX_TILES: int = 64  # How many rendered tiles are kept for reuse
+
+Color = Tuple[int, int, int]
+
+# The types of objects that can be frozen into the backdrop.
+# Text is left out, its Tk fonts can not be drawn by PIL.
+FREEZABLE_TYPES: List[str] = ["line", "rectangle", "oval", "polygon"]
+
+
+def tile_range(region: BBox, zoom: float) -> Tuple[int, int, int, int]:
+    """
+    This function finds the tiles that cover a region.
+    :param region: The region, in canvas coordinates.
+    :param zoom: The zoom of the canvas.
+    :return: The first and last tile columns and rows.
+    """
+    size = TILE_SIZE / zoom
+    return (math.floor(region[0] / size), math.floor(region[1] / size),
+            math.floor(region[2] / size), math.floor(region[3] / size))
+
+
+def tile_region(col: int, row: int, zoom: float) -> BBox:
+    """
+    This function calculates the region a tile covers.
+    :param col: The column of the tile.
+    :param row: The row of the tile.
+    :param zoom: The zoom of the canvas.
+    :return: The region of the tile, in canvas coordinates.
+    """
+    size = TILE_SIZE / zoom
+    return col * size, row * size, (col + 1) * size, (row + 1) * size
+
+
+def render_tile(objects: Iterable[Dict[str, Any]], col: int, row: int,
+                zoom: float, background: Color,
+                to_rgb: Callable[[str], Optional[Color]]) -> Image.Image:
+    """
+    This function draws objects onto a tile of the backdrop.
+    Like Tk items, line widths are in screen pixels whatever the zoom is.
+    :param objects: The information of the objects, bottom first,
+                    as returned by file_manager.get_item_info.
+    :param col: The column of the tile.
+    :param row: The row of the tile.
+    :param zoom: The zoom of the canvas.
+    :param background: The color of the canvas.
+    :param to_rgb: A function that converts a Tk color to RGB,
+                   or to None for an empty (transparent) color.
+    :return: The rendered tile.
+    """
+    image = Image.new("RGB", (TILE_SIZE, TILE_SIZE), background)
+    draw = ImageDraw.Draw(image)
+    left, top = col * TILE_SIZE, row * TILE_SIZE
+    for info in objects:
+        coords: List[float] = info["coords"]
+        points = [(x * zoom - left, y * zoom - top)
+                  for x, y in zip(coords[::2], coords[1::2])]
+        if len(points) < 2:
+            continue
+        try:
+            width = max(1, round(float(info.get("width", 1))))
+        except ValueError:
+            width = 1
+        fill = to_rgb(info.get("fill", ""))
+        outline = to_rgb(info.get("outline", ""))
+        obj_type = info["type"]
+        if obj_type == "line":
+            if fill is not None:
+                draw.line(points, fill=fill, width=width, joint="curve")
+        elif obj_type in ["rectangle", "oval"]:
+            xs = [x for x, _ in points]
+            ys = [y for _, y in points]
+            box = (min(xs), min(ys), max(xs), max(ys))
+            if obj_type == "rectangle":
+                draw.rectangle(box, fill=fill, outline=outline,
+                               width=width if outline is not None else 0)
+            else:
+                draw.ellipse(box, fill=fill, outline=outline,
+                             width=width if outline is not None else 0)
+        elif obj_type == "polygon":
+            draw.polygon(points, fill=fill, outline=outline,
+                         width=width if outline is not None else 0)
+    return image
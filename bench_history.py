@@ -0,0 +1,74 @@
+"""
+This script measures how much memory the history of a pencil drawing takes
+when its actions are kept as dictionaries and as the records of records.py.
+It needs no display, run it with: python bench_history.py [count]
+"""
+from records import compact
+from typing import Any, Callable, Dict, List
+import random
+import sys
+import tracemalloc
+
+DEFAULT_COUNT: int = 100000  # How many pencil segments are drawn
+
+
+def pencil_actions(count: int) -> List[Dict[str, Any]]:
+    """
+    This function makes the actions of drawing pencil segments, the way
+    CanvasApp records them. The coordinates, colors and widths are made
+    anew for every segment, like the ones Tk returns for every
+    get_item_info call.
+    :param count: How many segments to draw.
+    :return: The actions.
+    """
+    rng = random.Random(0)
+    actions = []
+    x, y = 400.0, 300.0
+    for item in range(1, count + 1):
+        start_x, start_y = x, y
+        x, y = x + rng.randint(-3, 3), y + rng.randint(-3, 3)
+        actions.append({
+            'type': 'drawing',
+            'object': item,
+            'info': {
+                "type": "line",
+                "coords": [float(value) for value
+                           in f"{start_x} {start_y} {x} {y}".split()],
+                "fill": "".join(["#", "000000"]),
+                "width": str(2.0),
+                "layer": "Layer 1",
+                "id": item
+            }
+        })
+    return actions
+
+
+def measured(function: Callable[[], Any]) -> int:
+    """
+    This function measures how much memory the result of a function keeps.
+    :param function: The function to measure.
+    :return: The size of the memory the result keeps, in bytes.
+    """
+    tracemalloc.start()
+    result = function()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    print(f"{count} pencil segments")
+    sizes = {
+        "dictionaries": measured(lambda: pencil_actions(count)),
+        "records": measured(lambda: [compact(action) for action
+                                     in pencil_actions(count)])
+    }
+    for name, size in sizes.items():
+        print(f"{name:<24}{size / count:>10.0f} bytes per action"
+              f"   ({sizes['dictionaries'] / size:.1f}x smaller)")
+
+
+if __name__ == '__main__':
+    main()
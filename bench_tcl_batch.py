@@ -0,0 +1,139 @@
+"""
+This script measures how much faster bulk canvas changes are through
+TclBatch than through one tkinter call per item.
+It needs a display, run it with: python bench_tcl_batch.py [count]
+"""
+from tcl_batch import TclBatch
+from virtual_canvas import VirtualCanvas
+from typing import List, Callable
+import tkinter as tk
+import random
+import time
+import sys
+
+DEFAULT_COUNT: int = 20000  # How many items each benchmark makes
+
+
+def timed(function: Callable[[], None]) -> float:
+    """
+    This function measures how long a function takes.
+    :param function: The function to measure.
+    :return: The time it took, in seconds.
+    """
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def random_lines(count: int) -> List[List[float]]:
+    """
+    This function makes the coordinates of short random lines,
+    like the segments a pencil draws.
+    :param count: How many lines to make.
+    :return: The flat coordinates of every line.
+    """
+    rng = random.Random(0)
+    lines = []
+    for _ in range(count):
+        x, y = rng.uniform(0, 800), rng.uniform(0, 600)
+        lines.append([x, y, x + rng.uniform(-5, 5), y + rng.uniform(-5, 5)])
+    return lines
+
+
+def bench_canvas(root: tk.Tk, lines: List[List[float]]) -> None:
+    """
+    This function compares creating and deleting items on a tk.Canvas
+    one call at a time and in a batch.
+    :param root: The main window.
+    :param lines: The coordinates of the lines to create.
+    """
+    canvas = tk.Canvas(root, width=800, height=600)
+    canvas.pack()
+    ids: List[int] = []
+
+    def create_each() -> None:
+        ids.extend(canvas.create_line(*coords, fill="black", width=2)
+                   for coords in lines)
+
+    def delete_each() -> None:
+        for item in ids:
+            canvas.delete(item)
+
+    batch = TclBatch(canvas)
+
+    def create_batch() -> None:
+        for coords in lines:
+            batch.create("line", coords, {"fill": "black", "width": 2})
+        ids[:] = [item for item in batch.run() if item is not None]
+
+    def delete_batch() -> None:
+        for item in ids:
+            batch.add("delete", item)
+        batch.run()
+
+    report("create, one call each", "create, batched",
+           timed(create_each), timed(create_batch), delete_each, delete_batch)
+    canvas.destroy()
+
+
+def report(each_name: str, batch_name: str, each_time: float,
+           batch_time: float, *cleanups: Callable[[], None]) -> None:
+    """
+    This function prints the times of a benchmark and its speedup,
+    and then the times of its cleanups the same way.
+    :param each_name: The name of the one call per item version.
+    :param batch_name: The name of the batched version.
+    :param each_time: The time of the one call per item version.
+    :param batch_time: The time of the batched version.
+    :param cleanups: The one call per item and the batched cleanup,
+                     for example deleting what was created.
+    """
+    print(f"{each_name:<32}{each_time * 1000:>10.1f} ms")
+    print(f"{batch_name:<32}{batch_time * 1000:>10.1f} ms"
+          f"   ({each_time / batch_time:.1f}x faster)")
+    if cleanups:
+        each_cleanup, batch_cleanup = cleanups
+        report(each_name.replace("create", "delete"),
+               batch_name.replace("create", "delete"),
+               timed(each_cleanup), timed(batch_cleanup))
+
+
+def bench_virtual_canvas(root: tk.Tk, lines: List[List[float]]) -> None:
+    """
+    This function compares loading a drawing into a VirtualCanvas
+    with and without VirtualCanvas.batch, like file_manager.load_canvas.
+    :param root: The main window.
+    :param lines: The coordinates of the lines to load.
+    """
+    canvas = VirtualCanvas(root, width=800, height=600)
+    canvas.pack()
+    root.update()
+    canvas.refresh_view(force=True)
+
+    def load() -> None:
+        for coords in lines:
+            canvas.create_line(*coords, fill="black", width=2)
+
+    def load_batch() -> None:
+        with canvas.batch():
+            load()
+
+    each_time = timed(load)
+    canvas.delete("all")
+    report("load, one call each", "load, batched", each_time,
+           timed(load_batch))
+    canvas.destroy()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    root = tk.Tk()
+    lines = random_lines(count)
+    print(f"{count} lines, Tk {root.tk.call('info', 'patchlevel')}")
+    bench_canvas(root, lines)
+    bench_virtual_canvas(root, lines)
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,120 +1,3 @@
-FONT_OPTIONS = ['Agency FB', 'Aharoni', 'Algerian',
-                'Arabic Transparent', 'Arial', 'Arial Baltic', 'Arial Black',
-                'Arial CE', 'Arial CYR', 'Arial Greek', 'Arial Narrow',
-                'Arial Rounded MT Bold', 'Arial TUR', 'Bahnschrift',
-                'Bahnschrift Condensed', 'Bahnschrift Light',
-                'Bahnschrift Light Condensed',
-                'Bahnschrift Light SemiCondensed', 'Bahnschrift SemiBold',
-                'Bahnschrift SemiBold Condensed',
-                'Bahnschrift SemiBold SemiConden', 'Bahnschrift SemiCondensed',
-                'Bahnschrift SemiLight', 'Bahnschrift SemiLight Condensed',
-                'Bahnschrift SemiLight SemiConde', 'Baskerville Old Face',
-                'Bauhaus 93', 'Bell MT', 'Berlin Sans FB',
-                'Berlin Sans FB Demi', 'Bernard MT Condensed',
-                'Blackadder ITC', 'Bodoni MT', 'Bodoni MT Black',
-                'Bodoni MT Condensed', 'Bodoni MT Poster Compressed',
-                'Book Antiqua', 'Bookman Old Style', 'Bookshelf Symbol 7',
-                'Bradley Hand ITC', 'Britannic Bold', 'Broadway',
-                'Brush Script MT', 'Calibri', 'Calibri Light',
-                'Californian FB', 'Calisto MT', 'Cambria', 'Cambria Math',
-                'Candara', 'Candara Light', 'Cascadia Code',
-                'Cascadia Code ExtraLight', 'Cascadia Code Light',
-                'Cascadia Code SemiBold', 'Cascadia Code SemiLight',
-                'Cascadia Mono', 'Cascadia Mono ExtraLight',
-                'Cascadia Mono Light', 'Cascadia Mono SemiBold',
-                'Cascadia Mono SemiLight', 'Castellar', 'Centaur', 'Century',
-                'Century Gothic', 'Century Schoolbook', 'Chiller',
-                'Colonna MT', 'Comic Sans MS', 'Consolas', 'Constantia',
-                'Cooper Black', 'Copperplate Gothic Bold',
-                'Copperplate Gothic Light', 'Corbel', 'Corbel Light',
-                'Courier', 'Courier New', 'Courier New Baltic',
-                'Courier New CE', 'Courier New CYR', 'Courier New Greek',
-                'Courier New TUR', 'Curlz MT', 'David', 'Dubai', 'Dubai Light',
-                'Dubai Medium', 'Ebrima', 'Edwardian Script ITC', 'Elephant',
-                'Engravers MT', 'Eras Bold ITC', 'Eras Demi ITC',
-                'Eras Light ITC', 'Eras Medium ITC', 'Felix Titling',
-                'Fixedsys', 'Footlight MT Light', 'Forte', 'FrankRuehl',
-                'Franklin Gothic Book', 'Franklin Gothic Demi',
-                'Franklin Gothic Demi Cond', 'Franklin Gothic Heavy',
-                'Franklin Gothic Medium', 'Franklin Gothic Medium Cond',
-                'Freestyle Script', 'French Script MT', 'Gabriola', 'Gadugi',
-                'Garamond', 'Georgia', 'Gigi', 'Gill Sans MT',
-                'Gill Sans MT Condensed', 'Gill Sans MT Ext Condensed Bold',
-                'Gill Sans Ultra Bold', 'Gill Sans Ultra Bold Condensed',
-                'Gisha', 'Gloucester MT Extra Condensed', 'Goudy Old Style',
-                'Goudy Stout', 'Haettenschweiler', 'Harlow Solid Italic',
-                'Harrington', 'High Tower Text', 'HoloLens MDL2 Assets',
-                'Impact', 'Imprint MT Shadow', 'Informal Roman', 'Ink Free',
-                'Javanese Text', 'Jokerman', 'Juice ITC', 'Kristen ITC',
-                'Kunstler Script', 'Leelawadee', 'Leelawadee UI',
-                'Leelawadee UI Semilight', 'Levenim MT', 'Lucida Bright',
-                'Lucida Calligraphy', 'Lucida Console', 'Lucida Fax',
-                'Lucida Handwriting', 'Lucida Sans', 'Lucida Sans Typewriter',
-                'Lucida Sans Unicode', 'MS Gothic', 'MS Outlook', 'MS PGothic',
-                'MS Reference Sans Serif', 'MS Reference Specialty',
-                'MS Sans Serif', 'MS Serif', 'MS UI Gothic', 'MT Extra',
-                'MV Boli', 'Magneto', 'Maiandra GD', 'Malgun Gothic',
-                'Malgun Gothic Semilight', 'Marlett',
-                'Matura MT Script Capitals', 'Microsoft Himalaya',
-                'Microsoft JhengHei', 'Microsoft JhengHei Light',
-                'Microsoft JhengHei UI', 'Microsoft JhengHei UI Light',
-                'Microsoft New Tai Lue', 'Microsoft PhagsPa',
-                'Microsoft Sans Serif', 'Microsoft Tai Le', 'Microsoft Uighur',
-                'Microsoft YaHei', 'Microsoft YaHei Light',
-                'Microsoft YaHei UI', 'Microsoft YaHei UI Light',
-                'Microsoft Yi Baiti', 'MingLiU-ExtB', 'MingLiU_HKSCS-ExtB',
-                'Miriam', 'Miriam Fixed', 'Mistral', 'Modern', 'Modern No. 20',
-                'Mongolian Baiti', 'Monotype Corsiva', 'Myanmar Text',
-                'NSimSun', 'Narkisim', 'Niagara Engraved', 'Niagara Solid',
-                'Nirmala UI', 'Nirmala UI Semilight', 'OCR A Extended',
-                'Old English Text MT', 'Onyx', 'PMingLiU-ExtB',
-                'Palace Script MT', 'Palatino Linotype', 'Papyrus',
-                'Parchment', 'Perpetua', 'Perpetua Titling MT', 'Playbill',
-                'Poor Richard', 'Pristina', 'Rage Italic', 'Ravie', 'Rockwell',
-                'Rockwell Condensed', 'Rockwell Extra Bold', 'Rod', 'Roman',
-                'Sans Serif Collection', 'Script', 'Script MT Bold',
-                'Segoe Fluent Icons', 'Segoe MDL2 Assets', 'Segoe Print',
-                'Segoe Script', 'Segoe UI', 'Segoe UI Black', 'Segoe UI Emoji',
-                'Segoe UI Historic', 'Segoe UI Light', 'Segoe UI Semibold',
-                'Segoe UI Semilight', 'Segoe UI Symbol',
-                'Segoe UI Variable Display', 'Segoe UI Variable Display Light',
-                'Segoe UI Variable Display Semib',
-                'Segoe UI Variable Display Semil', 'Segoe UI Variable Small',
-                'Segoe UI Variable Small Light',
-                'Segoe UI Variable Small Semibol',
-                'Segoe UI Variable Small Semilig', 'Segoe UI Variable Text',
-                'Segoe UI Variable Text Light',
-                'Segoe UI Variable Text Semibold',
-                'Segoe UI Variable Text Semiligh', 'Showcard Gothic', 'SimSun',
-                'SimSun-ExtB', 'Sitka Banner', 'Sitka Banner Semibold',
-                'Sitka Display', 'Sitka Display Semibold', 'Sitka Heading',
-                'Sitka Heading Semibold', 'Sitka Small',
-                'Sitka Small Semibold', 'Sitka Subheading',
-                'Sitka Subheading Semibold', 'Sitka Text',
-                'Sitka Text Semibold', 'Small Fonts', 'Snap ITC', 'Stencil',
-                'Sylfaen', 'Symbol', 'System', 'Tahoma', 'Tempus Sans ITC',
-                'Terminal', 'Times New Roman', 'Times New Roman Baltic',
-                'Times New Roman CE', 'Times New Roman CYR',
-                'Times New Roman Greek', 'Times New Roman TUR', 'Trebuchet MS',
-                'Tw Cen MT', 'Tw Cen MT Condensed',
-                'Tw Cen MT Condensed Extra Bold', 'Verdana', 'Viner Hand ITC',
-                'Vivaldi', 'Vladimir Script', 'Webdings', 'Wide Latin',
-                'Wingdings', 'Wingdings 2', 'Wingdings 3', 'Yu Gothic',
-                'Yu Gothic Light', 'Yu Gothic Medium', 'Yu Gothic UI',
-                'Yu Gothic UI Light', 'Yu Gothic UI Semibold',
-                'Yu Gothic UI Semilight',
-                '8514oem', '@MS Gothic', '@MS PGothic', '@MS UI Gothic',
-                '@Malgun Gothic', '@Malgun Gothic Semilight',
-                '@Microsoft JhengHei', '@Microsoft JhengHei Light',
-                '@Microsoft JhengHei UI', '@Microsoft JhengHei UI Light',
-                '@Microsoft YaHei', '@Microsoft YaHei Light',
-                '@Microsoft YaHei UI', '@Microsoft YaHei UI Light',
-                '@MingLiU-ExtB', '@MingLiU_HKSCS-ExtB', '@NSimSun',
-                '@PMingLiU-ExtB', '@SimSun', '@SimSun-ExtB', '@Yu Gothic',
-                '@Yu Gothic Light', '@Yu Gothic Medium', '@Yu Gothic UI',
-                '@Yu Gothic UI Light', '@Yu Gothic UI Semibold',
-                '@Yu Gothic UI Semilight']
-
 HELP = """
 Hi! welcome to OF8-Illustrator, an AdobeIllustrator-like program that was
 written by Or Forshmit for the course: '67101-1 Introduction to Computer Science'.
@@ -137,6 +20,8 @@ To save your canvas, press the 'File' button, and then 'Save The Canvas'.
 you will be prompted to select a location to store your canvas,
 and it is important to remember where you have chosen to save your canvas,
 in order to load it again.
+To save a canvas compressed, which makes big drawings many times smaller,
+end its name with .json.gz, .json.xz or .json.bz2. Compressed canvases load like any other.
 
 To use my program, you can simply press the buttons that are on the screen!
 When you start the program, it asks you whether you want to load an existing canvas or not.
@@ -159,9 +44,56 @@ click on 'Tools' and choose your desired change.
 To change the current mode,
 you can also click on the button that states the current mode,
 or click on the "Move Drawn Objects" button.
+In 'Moving Objects Mode', drag on an empty spot to select the objects inside a
+rectangle, or hold Shift to draw a free-form lasso around them.
+Objects are picked by their exact shape: click on the line or outline of a hollow
+shape, or anywhere inside a filled one.
+Dragging one of the selected objects moves all of them, and right-clicking it
+reorders, fills, recolors or deletes all of them. Press Delete to delete them.
+Every pencil stroke is saved as many short lines. 'Tools' > 'Optimize Drawing' joins
+them into one line per stroke, which makes big drawings load, draw and save faster.
+Check 'File' > 'Optimize Imported Canvases' to do it while importing, or run
+'python optimizer.py canvas.json' to optimize a saved canvas without opening it.
+'Remove Unseen Objects...' reports and removes the objects that are never seen:
+single clicks, exact copies below their duplicates and objects covered by filled shapes.
+Check 'Tools' > 'Precise Eraser' to erase only what the eraser passes over:
+lines and hollow outlines are cut, leaving the pieces around the eraser,
+and other objects are erased only where the eraser touches their shape.
+Undo brings back everything one eraser stroke erased.
+To draw precisely, open 'Tools' > 'Snapping' and turn on 'Snap To Grid' or 'Snap To Objects'.
+Rectangles, ovals, triangles, polygon dots and dragged objects then snap to the grid,
+or to the vertices, edge midpoints and corners of nearby objects.
+To rotate, scale, skew or mirror objects, right-click them and choose 'Transform'.
+The transform keeps the chosen 'Pivot' in place, the center of the objects by default.
+To see how an object has changed, right-click it and choose 'Revert Object To...',
+then pick the change to bring the object back to.
+To go back to any point of the drawing's history, open 'View' > 'History Timeline'
+and drag the slider, or use the arrow keys. Every action after it can be redone
+by dragging the slider forward. Drawing something new after undoing starts a new
+branch, and the undone actions are kept: pick a branch in the timeline's list
+to switch to it.
+Saved canvases keep their undo history while 'File' > 'Save Undo History' is checked,
+so undo, redo and the timeline keep working after the canvas is opened again.
 
 To clear the canvas, simply press the 'Clear Canvas' button. 
 
+The canvas has no edges. To move around it, use the scrollbars,
+or drag the canvas with the middle mouse button.
+The mouse wheel scrolls the canvas (hold Shift to scroll sideways),
+and the arrow keys move it too.
+To zoom, hold Control and turn the mouse wheel, or press Control and +, - or 0.
+
+Drawings can be split into layers, in 'View' and then 'Layers'.
+New objects are drawn on the highlighted layer. Hidden layers are not shown,
+and the objects of locked layers can not be erased or selected.
+To move an object to the highlighted layer, right-click it and choose 'Move To Current Layer'.
+
+Big drawings can be frozen, in 'View' and then 'Freeze'. Frozen objects are drawn
+as one picture below the other objects, which is much faster, but they can not be
+selected or erased until they are thawed. They are still saved and exported.
+Only objects below all the editable ones are frozen, and drawing or moving an object
+below frozen ones thaws them.
+
 To change your view mode (fullscreen), simply press the view and then "Toggle Fullscreen".
 To exit fullscreen, press the escape (esc) key.
 
@@ -1,16 +1,40 @@
-import math
 from tkinter import messagebox, simpledialog
 from tkinter.colorchooser import askcolor
-from bigvars import FONT_OPTIONS
-from typing import Optional, Union, List, Tuple, Dict, Any
-from PIL import ImageTk
+from fonts import available_fonts, get_font, split_font, FontIndex
+from typing import Optional, Union, List, Tuple, Dict, Any, Callable, \
+    Mapping
+from image_cache import ImageCache
+from virtual_canvas import VirtualCanvas
+from selection import objects_in_lasso
+from history import History, HistoryNode, describe, state_after
+from transform import rotation, scaling, skewing, mirroring, around, \
+    transform_shapes
+from snapping import snap_to_grid
 import tkinter as tk
 import tkinter.ttk as ttk
 import _tkinter
 import file_manager
+import eraser
+import optimizer
 import os
 
 SHAPES: List[str] = ["Pencil", "Rectangle", "Oval", "Triangle", "Text"]
+ZOOM_STEP: float = 1.25  # How much one wheel step or key press zooms by
+PICK_RADIUS: int = 5  # How close to an object a click selects it, in pixels
+SNAP_RADIUS: int = 8  # How close to a point of an object snaps to it, in pixels
+GRID_SPACING: int = 20  # The default distance between the lines of the grid
+# Dragged objects with more points than this snap by their bounding box only
+DRAG_SNAP_POINTS: int = 32
+FREEZE_KEEP: int = 200  # How many of the newest objects stay editable
+SELECTED_TAG: str = "selected"  # The tag of the selected objects
+# The selected objects are split by the option their color is in,
+# so a group is recolored in one call per kind
+SELECTED_SHAPES_TAG: str = "selected-shape"  # Colored by 'outline'
+SELECTED_STROKES_TAG: str = "selected-stroke"  # Colored by 'fill'
+SELECTION_COLOR: str = "#3399ff"  # The color of the selection's outline
+# The points objects can be rotated, scaled, skewed or mirrored around
+PIVOTS: List[str] = ["Center", "Top Left", "Top Right", "Bottom Left",
+                     "Bottom Right", "Clicked Point"]
 
 
 class CanvasApp:
@@ -20,29 +44,35 @@ class CanvasApp:
     Attributes:
         master (tk.Tk): The primary window of the canvas.
         canvas (tk.Canvas): The canvas to be drawn over.
-        actions (List[Dict[str, Any]]): A list containing all the done actions.
+        actions (History): A list containing all the done actions,
+                           indexed by the objects they changed.
         file_path (str): The path the canvas has been saved to.
     """
 
-    def __init__(self, master: tk.Tk, is_load: bool = False) -> None:
+    def __init__(self, master: tk.Tk, is_load: bool = False,
+                 images: Optional[ImageCache] = None) -> None:
         """
         Initialize the canvas.
         :param master: The primary window of the canvas.
         :param is_load: Whether to load an existing canvas or not.
                         Default value is False.
+        :param images: The cache to get the toolbar images from.
+                       Defaults to a new cache owned by master.
         """
         self.master: tk.Tk = master
         self.master.title("Canvas")
 
         self.file_path: List[str] = ['']  # The path the canvas has been saved to
 
+        self.__images: ImageCache = images if images is not None \
+            else ImageCache(self.master)
         if os.name == 'posix':  # If linux
             self.master.attributes("-zoomed", True)
-            self.__undo_image = ImageTk.PhotoImage(file="Images/Undo.png")
-            self.__redo_image = ImageTk.PhotoImage(file="Images/Redo.png")
+            self.__undo_image = self.__images.get("Images/Undo.png")
+            self.__redo_image = self.__images.get("Images/Redo.png")
         else:
-            self.__undo_image = ImageTk.PhotoImage(file="Images\\Undo.png")
-            self.__redo_image = ImageTk.PhotoImage(file="Images\\Redo.png")
+            self.__undo_image = self.__images.get("Images\\Undo.png")
+            self.__redo_image = self.__images.get("Images\\Redo.png")
             self.master.state("zoomed")
 
         self.master.bind("<Escape>", lambda fs=False:
@@ -51,30 +81,76 @@ class CanvasApp:
         self.master.bind("<Control-y>", lambda event: self.__redo())
         self.master.bind("<Control-s>", lambda event: self.__save_canvas())
         self.master.bind("<Control-w>", lambda event: self.__on_exit())
+        self.master.bind("<Control-plus>", lambda event: self.__zoom(ZOOM_STEP))
+        self.master.bind("<Control-equal>",
+                         lambda event: self.__zoom(ZOOM_STEP))
+        self.master.bind("<Control-minus>",
+                         lambda event: self.__zoom(1 / ZOOM_STEP))
+        self.master.bind("<Control-0>", lambda event: self.__reset_zoom())
+        self.master.bind("<Delete>", lambda event: self.__delete_selected())
+        # Pan the canvas with the arrow keys
+        self.master.bind("<Left>", lambda event:
+                         self.canvas.xview_scroll(-1, "units"))
+        self.master.bind("<Right>", lambda event:
+                         self.canvas.xview_scroll(1, "units"))
+        self.master.bind("<Up>", lambda event:
+                         self.canvas.yview_scroll(-1, "units"))
+        self.master.bind("<Down>", lambda event:
+                         self.canvas.yview_scroll(1, "units"))
 
         # Add a protocol that when the user clicks the red 'X' to exit the
         # program, it will ask him exit questions.
         self.master.protocol("WM_DELETE_WINDOW", self.__on_exit)
 
-        self.canvas: tk.Canvas = tk.Canvas(self.master, bg="white")
+        # Only the objects near the view exist as Tk items,
+        # the rest of the drawing is kept by the canvas in Python
+        self.canvas: VirtualCanvas = VirtualCanvas(self.master, bg="white")
 
-        # Initialize an empty list containing all the done actions
-        self.actions: List[Dict[str, Any]] = []
-        # Initialize an empty list containing all undone actions
-        self.__undone_actions: List[Dict[str, Any]] = []
+        # Initialize an empty list containing all the done actions,
+        # whose undo tree keeps the undone actions
+        self.actions: History = History()
+        # How each type of action is undone and redone
+        self.__undoers: Dict[str, Callable[[Mapping[str, Any]], None]] = \
+            self.__make_undoers()
+        self.__redoers: Dict[str, Callable[[Mapping[str, Any]], None]] = \
+            self.__make_redoers()
 
         if is_load:  # If the user wants to load a canvas
             file_manager.load_canvas(self.canvas, self.actions,
-                                     self.__on_text_right_click,
                                      self.file_path)
 
+        # Add scrollbars, the canvas is effectively unbounded
+        y_scrollbar = ttk.Scrollbar(self.master, orient=tk.VERTICAL,
+                                    command=self.canvas.yview)
+        x_scrollbar = ttk.Scrollbar(self.master, orient=tk.HORIZONTAL,
+                                    command=self.canvas.xview)
+        self.canvas.config(xscrollcommand=x_scrollbar.set,
+                           yscrollcommand=y_scrollbar.set)
+        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+
         # Make the canvas visible
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
         # Initialize values regarding the 'Moving Objects Mode'
         self.__selected_object: Union[str, int] = 0
-        self.__selected_object_start_x: int = 0
-        self.__selected_object_start_y: int = 0
+        self.__selected_object_start_x: float = 0
+        self.__selected_object_start_y: float = 0
+        # How far the dragged objects have moved, and their points that snap
+        self.__dragged: Tuple[float, float] = (0, 0)
+        self.__drag_points: List[Tuple[float, float]] = []
+        # The rubber band (or lasso) while it is dragged, and its points
+        self.__band: Optional[int] = None
+        self.__band_points: List[float] = []
+        # The outline around the selected objects, and its coordinates
+        self.__selection_box: Optional[int] = None
+        self.__selection_box_coords: List[float] = []
+        self.__is_lasso: bool = False
+        # Whether the context menu acts on all the selected objects
+        self.__is_group: bool = False
+        # Where the context menu was opened, a pivot for transforms
+        self.__clicked_x: float = 0
+        self.__clicked_y: float = 0
 
         # Initialize default values regarding the drawing
         self.__outline_color: str = "white" if self.canvas.cget('bg') == "black" else "black"
@@ -83,9 +159,40 @@ class CanvasApp:
         self.__fill: str = ''
         self.__current_drawable: str = "Pencil"
         self.__current_object: Optional[int] = None
+        # Whether the eraser cuts lines and outlines instead of deleting
+        # the objects it touches
+        self.__precise_eraser: tk.BooleanVar = tk.BooleanVar(self.master,
+                                                             value=False)
+        # The objects erased by the current eraser gesture, by id, and the
+        # pieces left of each of them
+        self.__erased: Dict[int, Dict[str, Any]] = {}
+        self.__erase_pieces: Dict[int, List[int]] = {}
+        # The object each piece of the current gesture was cut from
+        self.__piece_sources: Dict[int, int] = {}
+        # Snapping of shapes, polygon dots and dragged objects
+        self.__snap_to_grid: tk.BooleanVar = tk.BooleanVar(self.master,
+                                                           value=False)
+        self.__snap_to_objects: tk.BooleanVar = tk.BooleanVar(self.master,
+                                                              value=False)
+        self.__grid_spacing: int = GRID_SPACING
+        # Whether imported canvases have their pencil strokes joined
+        self.__optimize_on_import: tk.BooleanVar = tk.BooleanVar(self.master,
+                                                                 value=False)
+        # Whether saved canvases keep their history, so undo works
+        # once they are loaded again
+        self.__save_history: tk.BooleanVar = tk.BooleanVar(self.master,
+                                                           value=True)
 
         self.__mode: str = 'Drawing Mode'
 
+        # The type-ahead index of the installed fonts, built on first use
+        self.__font_index: Optional[FontIndex] = None
+
+        # The layers window, while it is open
+        self.__layers_window: Optional[tk.Toplevel] = None
+        # The history timeline window, while it is open
+        self.__timeline_window: Optional[tk.Toplevel] = None
+
         # Initialize lists that will hold all the polygon dots and points
         self.__polygon_points: List[Tuple[int, int]] = []
         self.__polygon_dots: List[int] = []
@@ -100,7 +207,8 @@ class CanvasApp:
         self.__create_menus()  # Top menus (File, Tools, View, etc)
         self.__init_frame_buttons()  # Pencil, Oval, Text, etc
 
-        # Initialize the 'Create the polygon' button
+        # Initialize the 'Create the polygon' button,
+        # it is only packed while in 'Polygon From Dots Mode'
         self.__polygon_button = ttk.Button(self.__frame,
                                            text="Create the polygon",
                                            command=lambda:
@@ -113,12 +221,29 @@ class CanvasApp:
         self.__init_text_context_menu()
         self.__init_context_menu()
 
+        # Bind the context menus to canvas objects. This is the only right-click
+        # binding, the menu is chosen by the type of the clicked object.
+        self.canvas.bind("<Button-3>", self.__select_object_right_click)
+
         # Bind mouse events to methods that handle them
         self.canvas.bind("<ButtonPress-1>", self.__on_click)
         self.canvas.bind("<B1-Motion>", self.__on_drag)
         self.canvas.bind("<ButtonRelease-1>", lambda event: self.__on_release())
         self.canvas.bind("<Double-Button-3>", lambda event:
                          self.__set_selecting_mode())
+        # Pan the canvas by dragging it with the middle mouse button
+        self.canvas.bind("<ButtonPress-2>", lambda event:
+                         self.canvas.scan_mark(event.x, event.y))
+        self.canvas.bind("<B2-Motion>", lambda event:
+                         self.canvas.scan_dragto(event.x, event.y, gain=1))
+        # Scroll with the mouse wheel, and zoom with it while holding Control.
+        # Linux reports the wheel as buttons 4 and 5.
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind(sequence, lambda event: self.__on_wheel(event))
+            self.canvas.bind(f"<Shift-{sequence[1:]}",
+                             lambda event: self.__on_wheel(event, "x"))
+            self.canvas.bind(f"<Control-{sequence[1:]}",
+                             lambda event: self.__on_wheel(event, "zoom"))
 
     def __buttons_config(self, *buttons: ttk.Button) -> None:
         """
@@ -127,28 +252,31 @@ class CanvasApp:
         """
         for button in buttons:
             button.config(
-                state=tk.DISABLED if not self.canvas.find_all() else tk.NORMAL
+                state=tk.DISABLED if not self.canvas.object_count() else tk.NORMAL
             )
         # These are not part of self.__config_buttons
         # because they are configured differently than the rest of the buttons
         self.__undo_button.config(state=tk.DISABLED if not self.actions else tk.NORMAL)
-        self.__redo_button.config(state=tk.DISABLED if not self.__undone_actions else tk.NORMAL)
+        self.__redo_button.config(state=tk.DISABLED if self.actions.next_action() is None
+                                  else tk.NORMAL)
 
     def __init_frame_buttons(self) -> None:
         """
         This function initializes all the buttons that are on the frame.
         """
-        self.__undo_button = ttk.Button(self.__frame,
-                                        image=self.__undo_image,
+        # The text is shown if the image could not be opened
+        self.__undo_button = ttk.Button(self.__frame, text="Undo",
+                                        image=self.__undo_image or '',
                                         command=self.__undo,
                                         state=tk.DISABLED if not
                                         self.actions else tk.NORMAL)
         self.__undo_button.pack(side=tk.LEFT)
-        self.__redo_button = ttk.Button(self.__frame,
-                                        image=self.__redo_image,
+        self.__redo_button = ttk.Button(self.__frame, text="Redo",
+                                        image=self.__redo_image or '',
                                         command=self.__redo,
-                                        state=tk.DISABLED if not
-                                        self.__undone_actions else tk.NORMAL)
+                                        state=tk.DISABLED if
+                                        self.actions.next_action() is None
+                                        else tk.NORMAL)
         self.__redo_button.pack(side=tk.LEFT)
 
         for shape in SHAPES:  # Buttons for Pencil, Oval, etc
@@ -164,12 +292,12 @@ class CanvasApp:
                                                command=lambda t="Eraser":
                                                self.__choose_drawable(t),
                                                state=tk.DISABLED if not
-                                               self.canvas.find_all()
+                                               self.canvas.object_count()
                                                else tk.NORMAL)
         move_button: ttk.Button = ttk.Button(self.__frame, text="Move Drawn Objects",
                                              command=self.__set_selecting_mode,
                                              state=tk.DISABLED if not
-                                             self.canvas.find_all()
+                                             self.canvas.object_count()
                                              else tk.NORMAL)
 
         self.__config_buttons = [move_button, eraser_button]
@@ -202,14 +330,17 @@ class CanvasApp:
                                       )
         self.__text_context_menu.add_cascade(label="Change Order",
                                              menu=change_order_menu)
+        self.__text_context_menu.add_command(
+            label="Move To Current Layer",
+            command=self.__move_to_current_layer)
+        self.__text_context_menu.add_command(
+            label="Revert Text To...", command=self.__show_object_history)
         self.__text_context_menu.add_command(label="Delete Text",
                                              command=self.__delete_object)
 
-    def __init_context_menu(self, is_polygon: bool = False) -> None:
+    def __init_context_menu(self) -> None:
         """
         This function initializes the context menu for non-text objects.
-        :param is_polygon: Whether the object is a polygon or not
-                           Defaults to False.
         """
         # Create a context menu
         self.__context_menu: tk.Menu = tk.Menu(self.master, tearoff=0)
@@ -230,109 +361,225 @@ class CanvasApp:
                                       )
         self.__context_menu.add_cascade(label="Change order",
                                         menu=change_order_menu)
+        self.__context_menu.add_command(label="Move To Current Layer",
+                                        command=self.__move_to_current_layer)
         self.__context_menu.add_command(label="Change Outline Color",
                                         command=self.__change_color)
         self.__context_menu.add_command(label="Change Outline Width",
                                         command=self.__change_object_width)
-        if is_polygon:
-            self.__context_menu.add_command(label="Rotate object",
-                                            command=self.__rotate)
+        transform_menu = tk.Menu(self.__context_menu, tearoff=0)
+        for label, kind in [("Rotate...", "rotate"), ("Scale...", "scale"),
+                            ("Skew...", "skew"),
+                            ("Mirror Horizontally", "mirror horizontally"),
+                            ("Mirror Vertically", "mirror vertically")]:
+            transform_menu.add_command(label=label, command=lambda kind=kind:
+                                       self.__transform(kind))
+        transform_menu.add_separator()
+        # The point the transforms keep in place
+        self.__pivot: tk.StringVar = tk.StringVar(self.master, value=PIVOTS[0])
+        pivot_menu = tk.Menu(transform_menu, tearoff=0)
+        for pivot in PIVOTS:
+            pivot_menu.add_radiobutton(label=pivot, value=pivot,
+                                       variable=self.__pivot)
+        transform_menu.add_cascade(label="Pivot", menu=pivot_menu)
+        self.__context_menu.add_cascade(label="Transform", menu=transform_menu)
+        self.__context_menu.add_command(label="Revert Object To...",
+                                        command=self.__show_object_history)
         self.__context_menu.add_command(label="Delete Object",
                                         command=self.__delete_object)
 
-        # Bind the context menu to canvas objects
-        self.canvas.bind("<Button-3>", self.__select_object_right_click)
-
-    def __rotate(self) -> None:
+    def __transform(self, kind: str) -> None:
         """
-        This function gets the degrees the user wants to rotate the object by.
+        This function asks the user how to transform the selected objects,
+        and transforms them around the chosen pivot.
+        :param kind: 'rotate', 'scale', 'skew', 'mirror horizontally'
+                     or 'mirror vertically'.
         """
-        if self.__selected_object:
-            obj_type = self.canvas.type(self.__selected_object)
-            if obj_type != 'polygon':
-                messagebox.showinfo("ERROR",
-                                    "You can only rotate polygons")
+        if kind == 'mirror horizontally':
+            matrix = mirroring(True)
+        elif kind == 'mirror vertically':
+            matrix = mirroring(False)
+        else:
+            prompts: Dict[str, str] = {
+                'rotate': "Enter the degrees to rotate the object by:",
+                'scale': "Enter the percentage to scale the object to:",
+                'skew': "Enter the degrees to slant the object by:"
+            }
+            self.__disable_canvas_touch()
+            value: Optional[float] = simpledialog.askfloat(
+                f"{kind.capitalize()} Object", prompts[kind],
+                parent=self.master)
+            self.__enable_canvas_touch()
+            if not value or (kind == 'scale' and value < 0):
                 return
-            angle = simpledialog.askinteger("Rotate Object",
-                                            "Enter the degrees to rotate the object by:",
-                                            parent=self.master)
-            if angle:
-                self.__rotate_object(angle)
+            if kind == 'rotate':
+                matrix = rotation(value)
+            elif kind == 'scale':
+                matrix = scaling(value / 100, value / 100)
+            else:
+                matrix = skewing(value, 0)
+        objects: List[int] = list(self.canvas.find_withtag(SELECTED_TAG)) \
+            if self.__is_group else [self.__selected_object]
+        if objects and objects[0]:
+            self.__transform_objects(objects, matrix)
+
+    def __transform_objects(self, objects: List[int], matrix: Any) -> None:
+        """
+        This function transforms objects around the chosen pivot,
+        all of them at once. Their coordinates are changed in place,
+        so they keep their ids.
+        :param objects: The objects to transform.
+        :param matrix: The 2x2 matrix of the transform.
+        """
+        x1, y1, x2, y2 = self.canvas.bbox(*objects)
+        pivots: Dict[str, Tuple[float, float]] = {
+            "Center": ((x1 + x2) / 2, (y1 + y2) / 2),
+            "Top Left": (x1, y1),
+            "Top Right": (x2, y1),
+            "Bottom Left": (x1, y2),
+            "Bottom Right": (x2, y2),
+            "Clicked Point": (self.__clicked_x, self.__clicked_y)
+        }
+        prev_states: List[Tuple[str, List[float]]] = [
+            (self.canvas.type(item), self.canvas.coords(item))
+            for item in objects]
+        new_states = transform_shapes(prev_states, around(
+            matrix, pivots.get(self.__pivot.get(), pivots["Center"])))
+        action: Dict[str, Any] = {
+            'type': 'transform',
+            'objects': objects,
+            'prev_states': prev_states,
+            'new_states': new_states
+        }
+        self.actions.append(action)
+        self.__set_shapes(objects, new_states)
 
-    def __rotate_object(self, angle) -> None:
+    def __show_object_history(self) -> None:
         """
-        This function rotates the selected object.
+        This function opens a window that lists the actions that changed
+        the selected object, where the user can revert the object to how
+        it was right after one of them.
         """
-        if self.__selected_object:
-            # Get the current coordinates of the object
-            coords = self.canvas.coords(self.__selected_object)
-
-            # Calculate the center point of the object
-            center_x = sum(coords[::2]) / (len(coords) // 2)
-            center_y = sum(coords[1::2]) / (len(coords) // 2)
-
-            # Convert the rotation angle to radians
-            angle_rad = math.radians(angle)
-
-            # Calculate the new coordinates for each point in the object
-            new_coords = []
-            for x, y in zip(coords[::2], coords[1::2]):
-                new_x = center_x + (x - center_x) * math.cos(angle_rad) - (
-                            y - center_y) * math.sin(angle_rad)
-                new_y = center_y + (x - center_x) * math.sin(angle_rad) + (
-                            y - center_y) * math.cos(angle_rad)
-                new_coords.extend([new_x, new_y])
-
-            info = file_manager.get_item_info(self.canvas, self.__selected_object)
-
-            action: Dict[str, Any] = {
-                'type': 'rotate object',
-                'old_object': self.__selected_object,
-                'old_info': info
-            }
-
-            # Delete the original object from the canvas
-            self.canvas.delete(self.__selected_object)
-
-            # Draw a new object with the calculated coordinates
-            # Assuming the object is a polygon; if not, you'll need to adjust this
-            self.__selected_object = self.canvas.create_polygon(
-                new_coords,
-                fill=info['fill'],
-                outline=info['outline'],
-                width=info['width']
-            )
+        item: int = self.__selected_object
+        if not item:
+            return
+        positions: List[int] = self.actions.positions_of(item)
+        if not positions:
+            messagebox.showinfo("Object History",
+                                "This object has not been changed.")
+            return
+        history_window: tk.Toplevel = tk.Toplevel(self.master)
+        history_window.title("Object History")
+        # Make it not resizeable
+        history_window.resizable(False, False)
 
-            action['new_object'] = self.__selected_object
-            action['new_info'] = file_manager.get_item_info(self.canvas,
-                                                            self.__selected_object)
-            self.actions.append(action)
+        label: ttk.Label = ttk.Label(history_window, text="Revert the object to",
+                                     font=("David", 14))
+        label.pack(side=tk.TOP)
 
-    def __on_text_right_click(self, event: tk.Event) -> None:
-        """
-        This function shows the context menu for text objects when they are
-        clicked on using the right mouse button ("<ButtonPress-3>").
-        :param event: The "<ButtonPress-3>" event to handle.
-        """
-        # Display the context menu for text objects at the mouse position
-        self.__text_context_menu.post(event.x_root, event.y_root)
+        history_listbox: tk.Listbox = tk.Listbox(history_window, width=40,
+                                                 exportselection=False)
+        history_listbox.pack(padx=10, pady=10, fill=tk.X)
+        for number, position in enumerate(positions, 1):
+            history_listbox.insert(tk.END, f"{number}. "
+                                   f"{describe(self.actions[position])}")
+        history_listbox.selection_set(tk.END)
+        history_listbox.see(tk.END)
 
-    def __change_font(self) -> None:
-        """
-        This function changes a text object's font.
-        """
-        self.__disable_canvas_touch()
-        new_window: tk.Toplevel = tk.Toplevel(self.master)
-        new_window.title("Select Font")
+        def revert() -> None:
+            """
+            This function reverts the object to the highlighted action.
+            """
+            selected_index: Tuple[int, ...] = history_listbox.curselection()
+            history_window.destroy()
+            if selected_index and self.canvas.type(item) is not None:
+                self.__revert_object(item, positions[selected_index[0]])
+
+        ttk.Button(history_window, text="Revert",
+                   command=revert).pack(pady=(0, 10))
+        history_window.bind('<Return>', lambda event: revert())
+
+    def __revert_object(self, item: int, position: int) -> None:
+        """
+        This function reverts an object to how it was right after an action.
+        The object's later actions stay in the history, and the revert
+        itself is one more action, so it can be undone.
+        :param item: The object.
+        :param position: The position of the action in the history.
+        """
+        prev_info: Dict[str, Any] = file_manager.get_item_info(self.canvas, item)
+        new_info: Dict[str, Any] = state_after(
+            self.actions, self.actions.positions_of(item), position, item,
+            prev_info)
+        if new_info == prev_info:
+            return
+        action: Dict[str, Any] = {
+            'type': 'revert object',
+            'object': item,
+            'prev_info': prev_info,
+            'new_info': new_info
+        }
+        self.actions.append(action)
+        self.__apply_info(item, new_info)
+
+    def __apply_info(self, item: int, info: Dict[str, Any]) -> None:
+        """
+        This function changes an object to match its information.
+        :param item: The object.
+        :param info: The information, as returned by
+                     file_manager.get_item_info.
+        """
+        self.canvas.set_shape(item, info['type'], info['coords'])
+        self.canvas.itemconfig(item, **{
+            option: info[option] for option in
+            ['fill', 'outline', 'width', 'text', 'font'] if option in info})
+        if info.get('layer', self.canvas.layer_of(item)) != \
+                self.canvas.layer_of(item):
+            self.canvas.set_layer(item, info['layer'])
+        self.__show_selection_box()
+
+    def __set_shapes(self, objects: List[int],
+                     shapes: List[Tuple[str, List[float]]]) -> None:
+        """
+        This function changes the type and the coordinates of objects.
+        :param objects: The objects to change.
+        :param shapes: The new type and coordinates of each object.
+        """
+        for item, (obj_type, coords) in zip(objects, shapes):
+            self.canvas.set_shape(item, obj_type, coords)
+        self.__show_selection_box()
+
+    def __choose_font(self, on_select: Callable[[str], None]) -> None:
+        """
+        This function opens a window that the user will choose a font from.
+        Only the fonts that are installed on this computer are offered,
+        and typing in the search box filters them.
+        :param on_select: A function to call with the chosen font,
+                          after the window is closed.
+        """
+        fonts: List[str] = available_fonts(self.master)
+        if self.__font_index is None:
+            self.__font_index = FontIndex(fonts)
+        font_index: FontIndex = self.__font_index
+        shown_fonts: List[str] = fonts
+
+        font_window: tk.Toplevel = tk.Toplevel(self.master)
+        font_window.title("Select Font")
         # Make it not resizeable
-        new_window.resizable(False, False)
+        font_window.resizable(False, False)
 
-        label: ttk.Label = ttk.Label(new_window, text="Choose Font",
+        label: ttk.Label = ttk.Label(font_window, text="Choose Font",
                                      font=("David", 14))
         label.pack(side=tk.TOP)
 
+        # Create a search box that filters the fonts while typing
+        search: tk.StringVar = tk.StringVar(font_window)
+        search_entry: ttk.Entry = ttk.Entry(font_window, textvariable=search)
+        search_entry.pack(padx=10, fill=tk.X)
+        search_entry.focus_set()
+
         # Create a frame for the font list and scrollbar
-        font_frame: ttk.Frame = ttk.Frame(new_window)
+        font_frame: ttk.Frame = ttk.Frame(font_window)
         font_frame.pack(padx=10, pady=10)
         font_listbox: tk.Listbox = tk.Listbox(font_frame)
         font_listbox.pack(side=tk.LEFT)
@@ -342,64 +589,111 @@ class CanvasApp:
         font_listbox.config(yscrollcommand=scrollbar.set)
 
         # Add all the fonts to the listbox
-        font_listbox.insert(tk.END, *FONT_OPTIONS)
+        font_listbox.insert(tk.END, *shown_fonts)
+
+        # Show a sample of the highlighted font
+        preview: ttk.Label = ttk.Label(font_window, text="AaBbCc 123")
+        preview.pack()
+
+        def filter_fonts(*_: Any) -> None:
+            """
+            This function shows only the fonts that match the search box.
+            """
+            nonlocal shown_fonts
+            shown_fonts = font_index.search(search.get())
+            font_listbox.delete(0, tk.END)
+            font_listbox.insert(tk.END, *shown_fonts)
+            if shown_fonts:
+                font_listbox.selection_set(0)
+                show_preview()
+
+        def show_preview(*_: Any) -> None:
+            """
+            This function shows a sample of the highlighted font.
+            """
+            selected_index: Tuple[int, ...] = font_listbox.curselection()
+            if selected_index:
+                preview.config(font=get_font(self.master,
+                                             shown_fonts[selected_index[0]],
+                                             14))
 
         def select_font() -> None:
             """
-            This function selects the font and
-            updates the selected text object's font.
+            This function selects the font and passes it to on_select.
             """
             selected_index: Tuple[int, ...] = font_listbox.curselection()
             if selected_index:
-                selected_font: str = FONT_OPTIONS[selected_index[0]]
-                new_window.destroy()
-                # Get the current text of the selected text object
-                current_text: str = self.canvas.itemcget(
-                    self.__selected_object,
-                    "text")
-                # Get the current size of the selected text object
-                current_state = self.canvas.itemcget(self.__selected_object,
-                                                     "font").split()
-                current_size = current_state[1]
-                # Update the font of the selected text object
-                self.canvas.itemconfig(self.__selected_object,
-                                       font=(selected_font, current_size),
-                                       text=current_text)
-                action: Dict[str, Any] = {
-                    'type': 'change object font',
-                    'object': self.__selected_object,
-                    'prev_font': current_state,
-                    'new_font': self.canvas.itemcget(self.__selected_object,
-                                                     "font").split()
-                }
-                self.actions.append(action)
-            self.__enable_canvas_touch()
+                selected_font: str = shown_fonts[selected_index[0]]
+                font_window.destroy()
+                on_select(selected_font)
+
+        search.trace_add("write", filter_fonts)
+        font_listbox.bind("<<ListboxSelect>>", show_preview)
 
         # Add a button so the user will be able to select the font
-        select_button: ttk.Button = ttk.Button(new_window, text="Select",
+        select_button: ttk.Button = ttk.Button(font_window, text="Select",
                                                command=select_font)
         select_button.pack(pady=10)
 
         # Bind the "Enter" key to the select_font function
-        new_window.bind('<Return>', lambda event: select_font())
+        font_window.bind('<Return>', lambda event: select_font())
+
+        def on_close() -> None:
+            """
+            This function closes the window without choosing a font.
+            """
+            font_window.destroy()
+            self.__enable_canvas_touch()
+
+        font_window.protocol("WM_DELETE_WINDOW", on_close)
+
+    def __change_font(self) -> None:
+        """
+        This function changes a text object's font.
+        """
+        self.__disable_canvas_touch()
+
+        def set_font(selected_font: str) -> None:
+            """
+            This function updates the selected text object's font.
+            :param selected_font: The font the user has chosen.
+            """
+            # Get the current text of the selected text object
+            current_text: str = self.canvas.itemcget(self.__selected_object,
+                                                     "text")
+            # Get the current size of the selected text object
+            current_state = split_font(
+                self.canvas, self.canvas.itemcget(self.__selected_object, "font"))
+            current_size = current_state[1]
+            # Update the font of the selected text object
+            self.canvas.itemconfig(self.__selected_object,
+                                   font=(selected_font, current_size),
+                                   text=current_text)
+            action: Dict[str, Any] = {
+                'type': 'change object font',
+                'object': self.__selected_object,
+                'prev_font': current_state,
+                'new_font': split_font(
+                    self.canvas,
+                    self.canvas.itemcget(self.__selected_object, "font"))
+            }
+            self.actions.append(action)
+            self.__enable_canvas_touch()
+
+        self.__choose_font(set_font)
 
     def __change_text(self) -> None:
         """
         This function changes the text of a text object.
         """
-        # Create a new window so the user input
-        # won't be deleted before its visibility changed
         self.__disable_canvas_touch()
-        new_window: tk.Tk = tk.Tk()
-        new_window.withdraw()
 
         prev_text = self.canvas.itemcget(self.__selected_object, 'text')
 
         new_text: Optional[str] = simpledialog.askstring(title="Change Text",
                                                          prompt="Enter the new text:",
                                                          initialvalue=prev_text,
-                                                         parent=new_window)
-        new_window.destroy()
+                                                         parent=self.master)
         if new_text is not None:
 
             # Change the text of the selected text object
@@ -419,14 +713,10 @@ class CanvasApp:
         This function changes the size of the text object.
         """
         self.__disable_canvas_touch()
-        # Create a new window so the user input
-        # won't be deleted before its visibility changed
-        new_window: tk.Tk = tk.Tk()
-        new_window.withdraw()
 
         # Get the current font of the selected text object
-        current_state: str = self.canvas.itemcget(self.__selected_object,
-                                                  "font").split()
+        current_state: List[str] = split_font(
+            self.canvas, self.canvas.itemcget(self.__selected_object, "font"))
         current_font = current_state[0]
 
         # Prompt the user to enter a new size for text
@@ -434,11 +724,10 @@ class CanvasApp:
             title="Change Text Size",
             prompt="Enter the new"
                    " text size:",
-            parent=new_window,
+            parent=self.master,
             initialvalue=int(current_state[1]),
             minvalue=1,
             maxvalue=100)
-        new_window.destroy()
         if new_size is not None:
             # Change the size of the selected text object
             # while keeping the font family
@@ -448,26 +737,36 @@ class CanvasApp:
                 'type': 'change text size',
                 'object': self.__selected_object,
                 'prev_font': current_state,
-                'new_font': self.canvas.itemcget(self.__selected_object,
-                                                 "font").split()
+                'new_font': split_font(
+                    self.canvas,
+                    self.canvas.itemcget(self.__selected_object, "font"))
             }
             self.actions.append(action)
         self.__enable_canvas_touch()
 
     def __select_object_right_click(self, event: tk.Event) -> None:
         """
-        This function shows the context menu for non-text objects when they are
+        This function shows the context menu of the object that was
         clicked on using the right mouse button (<ButtonPress-3>).
-        """
-        if len(self.canvas.find_all()) != 0:  # If the board is not empty
-            # Find the object closest to the mouse cursor
-            self.__selected_object = \
-                self.canvas.find_closest(event.x, event.y)[0]
-            if self.canvas.type(self.__selected_object) == 'text':
+        Text objects get the text context menu, other objects get the
+        general context menu.
+        :param event: The <ButtonPress-3> event to handle.
+        """
+        if self.canvas.object_count() != 0:  # If the board is not empty
+            x, y = self.__to_canvas(event)
+            self.__clicked_x, self.__clicked_y = x, y
+            self.__selected_object = self.__object_at(x, y)
+            if not self.__selected_object:
+                return  # There is no unlocked object under the mouse cursor
+            # Right-clicking one of several selected objects acts on them all
+            selection: Tuple[int, ...] = self.canvas.find_withtag(SELECTED_TAG)
+            self.__is_group = len(selection) > 1 and \
+                self.__selected_object in selection
+            if self.__is_group:
+                self.__context_menu.post(event.x_root, event.y_root)
+            elif self.canvas.type(self.__selected_object) == 'text':
                 self.__text_context_menu.post(event.x_root, event.y_root)
             else:
-                self.__init_context_menu(
-                    self.canvas.type(self.__selected_object) == 'polygon')
                 # Display the context menu at the mouse position
                 self.__context_menu.post(event.x_root, event.y_root)
 
@@ -478,6 +777,9 @@ class CanvasApp:
         :param order_action (bool): True if the action is to bring to the front,
                                     False otherwise.
         """
+        if self.__is_group:
+            self.__change_group_order(order_action)
+            return
         action: Dict[str, Any] = {
             'type': 'changing order',
             'prev_state': not order_action,
@@ -492,10 +794,352 @@ class CanvasApp:
             # Send the selected object to the back
             self.canvas.tag_lower(self.__selected_object)
 
+    def __move_to_current_layer(self) -> None:
+        """
+        This function moves the selected object to the current layer.
+        """
+        if self.__selected_object:
+            prev_state: str = self.canvas.layer_of(self.__selected_object)
+            new_state: str = self.canvas.current_layer
+            if prev_state == new_state:
+                return
+            action: Dict[str, Any] = {
+                'type': 'change layer',
+                'object': self.__selected_object,
+                'prev_state': prev_state,
+                'new_state': new_state
+            }
+            self.actions.append(action)
+            self.canvas.set_layer(self.__selected_object, new_state)
+
+    def __object_at(self, x: float, y: float) -> int:
+        """
+        This function finds the topmost object whose exact shape is within
+        PICK_RADIUS of a point, skipping the objects of locked layers.
+        Clicking inside a hollow shape does not pick it, only its outline does.
+        :param x: The x canvas coordinate of the point.
+        :param y: The y canvas coordinate of the point.
+        :return: The id of the object, or 0 if there is no such object.
+        """
+        hits: List[int] = [item for item in self.canvas.find_hits(
+            x, y, PICK_RADIUS / self.canvas.zoom)
+                           if not self.canvas.is_locked(item)]
+        return hits[-1] if hits else 0
+
+    def __can_draw(self) -> bool:
+        """
+        This function checks whether the current layer can be drawn on,
+        and tells the user why not if it can not.
+        :return: True if the current layer is visible and unlocked,
+                 False otherwise.
+        """
+        layer = self.canvas.layer(self.canvas.current_layer)
+        if layer.visible and not layer.locked:
+            return True
+        self.__disable_canvas_touch()  # Until the user clicks ok
+        messagebox.showinfo(title="ERROR!",
+                            message=f"The layer '{layer.name}' is "
+                                    f"{'locked' if layer.visible else 'hidden'}."
+                                    "\nChoose another layer, or "
+                                    f"{'unlock' if layer.visible else 'show'}"
+                                    " it, in 'View' and then 'Layers'.")
+        self.__enable_canvas_touch()
+        return False
+
+    def __freeze_older(self) -> None:
+        """
+        This function freezes all the objects except for the newest ones.
+        """
+        self.__disable_canvas_touch()
+        keep: Optional[int] = simpledialog.askinteger(
+            "Freeze Older Objects",
+            "How many of the newest objects should stay editable?",
+            initialvalue=FREEZE_KEEP, minvalue=0, parent=self.master)
+        self.__enable_canvas_touch()
+        if keep is None:
+            return
+        # New objects are drawn on top, so the oldest are the lowest ones
+        # (ids are not ages, undo brings deleted objects back with their ids)
+        items: Tuple[int, ...] = self.canvas.find_all()
+        self.canvas.freeze(items[:max(0, len(items) - keep)])
+
+    def __show_layers(self) -> None:
+        """
+        This function opens the layers window, where layers are added,
+        removed, reordered, hidden and locked.
+        The highlighted layer is the layer new objects are drawn on.
+        """
+        if self.__layers_window is not None and \
+                self.__layers_window.winfo_exists():
+            self.__layers_window.lift()
+            return
+        layers_window: tk.Toplevel = tk.Toplevel(self.master)
+        self.__layers_window = layers_window
+        layers_window.title("Layers")
+        # Make it not resizeable
+        layers_window.resizable(False, False)
+
+        label: ttk.Label = ttk.Label(layers_window, text="Layers",
+                                     font=("David", 14))
+        label.pack(side=tk.TOP)
+
+        layers_listbox: tk.Listbox = tk.Listbox(layers_window,
+                                                exportselection=False)
+        layers_listbox.pack(padx=10, pady=10, fill=tk.X)
+        # The names of the layers in the listbox, the top layer first
+        shown_layers: List[str] = []
+
+        def show_layers() -> None:
+            """
+            This function lists the layers and highlights the current one.
+            """
+            nonlocal shown_layers
+            layers = list(reversed(self.canvas.layers()))
+            shown_layers = [layer.name for layer in layers]
+            layers_listbox.delete(0, tk.END)
+            for layer in layers:
+                states: List[str] = []
+                if not layer.visible:
+                    states.append("hidden")
+                if layer.locked:
+                    states.append("locked")
+                layers_listbox.insert(tk.END, f"{layer.name} ({', '.join(states)})"
+                                      if states else layer.name)
+            layers_listbox.selection_set(
+                shown_layers.index(self.canvas.current_layer))
+
+        def choose_layer(*_: Any) -> None:
+            """
+            This function makes the highlighted layer the current layer.
+            """
+            selected_index: Tuple[int, ...] = layers_listbox.curselection()
+            if selected_index:
+                self.canvas.current_layer = shown_layers[selected_index[0]]
+
+        def new_layer() -> None:
+            """
+            This function adds a layer on top of the other layers.
+            """
+            number = len(shown_layers) + 1
+            while f"Layer {number}" in shown_layers:
+                number += 1
+            name: Optional[str] = simpledialog.askstring(
+                "New Layer", "Enter the name of the layer:",
+                initialvalue=f"Layer {number}", parent=layers_window)
+            if not name:
+                return
+            if name in shown_layers:
+                messagebox.showerror("ERROR",
+                                     f"There is already a layer named '{name}'",
+                                     parent=layers_window)
+                return
+            self.canvas.add_layer(name)
+            self.canvas.current_layer = name
+            show_layers()
+
+        def delete_layer() -> None:
+            """
+            This function removes the current layer,
+            its objects are moved to the layer below it.
+            """
+            if len(shown_layers) == 1:
+                messagebox.showerror("ERROR",
+                                     "The canvas must have at least one layer",
+                                     parent=layers_window)
+                return
+            name = self.canvas.current_layer
+            position = shown_layers.index(name)
+            merge_into = shown_layers[position + 1] \
+                if position + 1 < len(shown_layers) \
+                else shown_layers[position - 1]
+            if messagebox.askyesno("Delete Layer?",
+                                   f"Are you sure you want to delete '{name}'?"
+                                   "\nIts objects will be moved to "
+                                   f"'{merge_into}'.", parent=layers_window):
+                self.canvas.remove_layer(name, merge_into)
+                show_layers()
+
+        def move_layer(steps: int) -> None:
+            """
+            This function moves the current layer up or down.
+            :param steps: How many layers to move up, negative moves down.
+            """
+            self.canvas.move_layer(self.canvas.current_layer, steps)
+            show_layers()
+
+        def toggle_visible() -> None:
+            """
+            This function hides the current layer, or shows it if it is hidden.
+            """
+            layer = self.canvas.layer(self.canvas.current_layer)
+            self.canvas.set_layer_visible(layer.name, not layer.visible)
+            show_layers()
+
+        def toggle_locked() -> None:
+            """
+            This function locks the current layer, or unlocks it if it is locked.
+            """
+            layer = self.canvas.layer(self.canvas.current_layer)
+            self.canvas.set_layer_locked(layer.name, not layer.locked)
+            show_layers()
+
+        layers_listbox.bind("<<ListboxSelect>>", choose_layer)
+        show_layers()
+
+        buttons_frame: ttk.Frame = ttk.Frame(layers_window)
+        buttons_frame.pack(padx=10, pady=10)
+        for column, (text, command) in enumerate([
+                ("New", new_layer), ("Delete", delete_layer),
+                ("Move Up", lambda: move_layer(1)),
+                ("Move Down", lambda: move_layer(-1)),
+                ("Show / Hide", toggle_visible),
+                ("Lock / Unlock", toggle_locked)]):
+            ttk.Button(buttons_frame, text=text, command=command).grid(
+                row=column // 2, column=column % 2, sticky=tk.EW)
+
+    def __show_timeline(self) -> None:
+        """
+        This function opens the history timeline window, whose slider undoes
+        or redoes actions until the drawing is as it was at any point of its
+        history, and which lists the branches of the history to switch to.
+        """
+        if self.__timeline_window is not None and \
+                self.__timeline_window.winfo_exists():
+            self.__timeline_window.lift()
+            return
+        timeline_window: tk.Toplevel = tk.Toplevel(self.master)
+        self.__timeline_window = timeline_window
+        timeline_window.title("History Timeline")
+        # Make it not resizeable
+        timeline_window.resizable(False, False)
+
+        label: ttk.Label = ttk.Label(timeline_window, text="History",
+                                     font=("David", 14))
+        label.pack(side=tk.TOP)
+        scale: ttk.Scale = ttk.Scale(timeline_window, from_=0,
+                                     orient=tk.HORIZONTAL, length=400)
+        scale.pack(padx=10, pady=10)
+        position_label: ttk.Label = ttk.Label(timeline_window)
+        position_label.pack(padx=10, pady=(0, 10))
+        branches_label: ttk.Label = ttk.Label(timeline_window, text="Branches",
+                                              font=("David", 14))
+        branches_label.pack(side=tk.TOP)
+        branches_listbox: tk.Listbox = tk.Listbox(timeline_window, width=50,
+                                                  exportselection=False)
+        branches_listbox.pack(padx=10, pady=10, fill=tk.X)
+        # The tips of the branches in the listbox, the latest first
+        shown_branches: List[HistoryNode] = []
+        # The position to jump to once the slider stops for a moment
+        target: List[int] = []
+
+        def show_position(*_: Any) -> None:
+            """
+            This function updates the slider, describes the last done action
+            and lists the branches, highlighting the current one.
+            """
+            nonlocal shown_branches
+            done = len(self.actions)
+            total = done + len(self.actions.future())
+            scale.configure(to=max(1, total))
+            scale.set(done)
+            archived = self.actions.archived_count()
+            position_label.configure(
+                text=f"{done} of {total} actions"
+                     + (f" - {describe(self.actions[-1])}" if done else "")
+                     + (f"\n{archived} earlier actions are loaded once"
+                        " undo reaches them" if archived else ""))
+            shown_branches = list(reversed(self.actions.branches()))
+            branches_listbox.delete(0, tk.END)
+            for branch in shown_branches:
+                branches_listbox.insert(
+                    tk.END, f"{branch.depth} actions - {describe(branch.action)}"
+                    if branch.action is not None else "No actions")
+            branches_listbox.selection_set(
+                shown_branches.index(self.actions.current_branch()))
+
+        def choose_branch(*_: Any) -> None:
+            """
+            This function switches to the highlighted branch, at its tip.
+            """
+            selected_index: Tuple[int, ...] = branches_listbox.curselection()
+            if selected_index and shown_branches[selected_index[0]] is not \
+                    self.actions.current_branch():
+                self.__jump_to(shown_branches[selected_index[0]])
+            show_position()
+
+        def jump() -> None:
+            """
+            This function jumps to the position the slider was moved to.
+            """
+            position = target.pop()
+            if position != len(self.actions):
+                self.__jump_to(position)
+            show_position()
+
+        def scrub(value: str) -> None:
+            """
+            This function handles the slider being moved, jumping once
+            the events that are already waiting are handled.
+            :param value: The value of the slider.
+            """
+            if not target:
+                timeline_window.after_idle(jump)
+            target[:] = [round(float(value))]
+
+        scale.configure(command=scrub)
+        branches_listbox.bind("<<ListboxSelect>>", choose_branch)
+        timeline_window.bind("<Left>",
+                             lambda event: scale.set(scale.get() - 1))
+        timeline_window.bind("<Right>",
+                             lambda event: scale.set(scale.get() + 1))
+        # The history changes while the window is open
+        timeline_window.bind("<Enter>", show_position)
+        show_position()
+
+    def __jump_to(self, target: Union[int, HistoryNode]) -> None:
+        """
+        This function undoes or redoes actions until the drawing is as it
+        was at a point of its history. The document is found from the nearest
+        history checkpoint, so only the objects that differ are deleted and
+        created.
+        :param target: How many actions of the current branch will be done,
+                       or the node of the undo tree to switch to.
+        """
+        prev_document = self.actions.document_at(len(self.actions))
+        document = self.actions.jump(target) if isinstance(target, int) \
+            else self.actions.switch_to(target)
+        self.__clear_selection()
+        changed = [item for item, info in prev_document.items()
+                   if document.get(item) is not info and
+                   document.get(item) != info]
+        changed_set = set(changed)
+        created = [item for item, info in document.items()
+                   if item not in prev_document or item in changed_set]
+        # All the Tk items are created and deleted by one Tcl call
+        with self.canvas.batch():
+            self.canvas.delete(*changed)
+            for item in created:
+                self.__recreate(document[item])
+            order = self.canvas.find_all()
+            # The canvas stacks the objects by their layers first
+            ranks = {layer.name: rank for rank, layer
+                     in enumerate(self.canvas.layers())}
+            existing = set(order)
+            target = sorted((item for item in document if item in existing),
+                            key=lambda item: ranks[self.canvas.layer_of(item)])
+            first = next((i for i, (item, target_item)
+                          in enumerate(zip(order, target))
+                          if item != target_item), len(target))
+            self.canvas.raise_in_order(target[first:])
+        self.__buttons_config(*self.__config_buttons)
+
     def __change_color(self) -> None:
         """
         This function changes the outline color of the selected object.
         """
+        if self.__is_group:
+            self.__change_group_color()
+            return
         if self.__selected_object:
             try:
                 # Check the type of the selected object
@@ -534,6 +1178,9 @@ class CanvasApp:
         """
         This function deletes the selected object.
         """
+        if self.__is_group:
+            self.__delete_group()
+            return
         if self.__selected_object:
             action: Dict[str, Any] = {
                 'type': 'delete object',
@@ -542,6 +1189,7 @@ class CanvasApp:
             }
             self.actions.append(action)
             self.canvas.delete(self.__selected_object)
+            self.__show_selection_box()
             self.__buttons_config(*self.__config_buttons)
 
     def __fill_object(self, is_clear: bool = False) -> None:
@@ -549,6 +1197,9 @@ class CanvasApp:
         This function fills the selected object.
         :param is_clear (bool): Whether to clear the fill or not.
         """
+        if self.__is_group:
+            self.__fill_group(is_clear)
+            return
         if self.__selected_object:
             try:
                 prev_state = self.canvas.itemcget(self.__selected_object,
@@ -567,13 +1218,15 @@ class CanvasApp:
                     self.__disable_canvas_touch()
                     # Prompt the user to select a new color
                     color: Optional[str] = askcolor()[1]
-                    if color:
-                        action['new_state'] = color
-
-                        # Update the color of the selected object
-                        self.canvas.itemconfig(self.__selected_object,
-                                               fill=color)
                     self.__enable_canvas_touch()
+                    if not color:
+                        # The color window was closed, nothing changed
+                        return
+                    action['new_state'] = color
+
+                # Update the fill of the selected object
+                self.canvas.itemconfig(self.__selected_object,
+                                       fill=action['new_state'])
                 self.actions.append(action)
             except _tkinter.TclError:
                 messagebox.showerror("ERROR",
@@ -646,11 +1299,182 @@ class CanvasApp:
                                  "computer must thought you meant an object"
                                  " you did not, please try again")
 
+    def __select(self, items: List[int]) -> None:
+        """
+        This function selects objects, instead of the selected ones.
+        The selected objects share a tag, so the whole group is moved,
+        reordered, recolored or deleted by one call to the canvas.
+        :param items: The objects to select.
+        """
+        self.canvas.dtag(SELECTED_TAG)
+        self.canvas.dtag(SELECTED_SHAPES_TAG)
+        self.canvas.dtag(SELECTED_STROKES_TAG)
+        # Lines and texts are colored by their fill
+        strokes = [item for item in items
+                   if self.canvas.type(item) in ['line', 'text']]
+        shapes = [item for item in items
+                  if self.canvas.type(item) not in ['line', 'text']]
+        self.canvas.add_tags({SELECTED_TAG: items,
+                              SELECTED_STROKES_TAG: strokes,
+                              SELECTED_SHAPES_TAG: shapes})
+
+    def __show_selection_box(self) -> None:
+        """
+        This function draws the outline around the selected objects,
+        or removes it if no object is selected.
+        """
+        if self.__selection_box is not None:
+            self.canvas.delete_overlay(self.__selection_box)
+            self.__selection_box = None
+        bbox = self.canvas.bbox(SELECTED_TAG)
+        if bbox is None:
+            return
+        self.__selection_box_coords = [bbox[0] - 2, bbox[1] - 2,
+                                       bbox[2] + 2, bbox[3] + 2]
+        self.__selection_box = self.canvas.create_overlay(
+            'rectangle', self.__selection_box_coords,
+            outline=SELECTION_COLOR, dash=(4, 2))
+
+    def __clear_selection(self) -> None:
+        """
+        This function unselects all the objects.
+        """
+        if self.__band is not None:
+            self.canvas.delete_overlay(self.__band)
+            self.__band = None
+        self.__select([])
+        self.__show_selection_box()
+        self.__is_group = False
+
+    def __apply_to_group(self, objects: List[int],
+                         function: Callable[[], None]) -> None:
+        """
+        This function selects objects and calls function, which changes
+        all the selected objects at once. The objects stay selected
+        only in 'Moving Objects Mode'.
+        :param objects: The objects to change.
+        :param function: The function that changes the selected objects.
+        """
+        self.__select(objects)
+        function()
+        if self.__mode != 'Moving Objects Mode':
+            self.__select([])
+        self.__show_selection_box()
+
+    def __change_group_order(self, order_action: bool) -> None:
+        """
+        This function brings all the selected objects to the front
+        or sends them to the back, keeping their order among themselves.
+        :param order_action (bool): True if the action is to bring to the front,
+                                    False otherwise.
+        """
+        action: Dict[str, Any] = {
+            'type': 'changing group order',
+            'prev_state': not order_action,
+            'new_state': order_action,
+            'objects': list(self.canvas.find_withtag(SELECTED_TAG))
+        }
+        self.actions.append(action)
+        if order_action:
+            self.canvas.tag_raise(SELECTED_TAG)
+        else:
+            self.canvas.tag_lower(SELECTED_TAG)
+
+    def __change_group_color(self) -> None:
+        """
+        This function changes the color of all the selected objects,
+        the outline of shapes and the fill of lines and texts.
+        """
+        self.__disable_canvas_touch()
+        color: Optional[str] = askcolor()[1]
+        self.__enable_canvas_touch()
+        if not color:
+            return
+        objects: List[int] = list(self.canvas.find_withtag(SELECTED_TAG))
+        action: Dict[str, Any] = {
+            'type': 'change group color',
+            'objects': objects,
+            'prev_states': [self.canvas.itemcget(
+                item, 'fill' if self.canvas.type(item) in ['line', 'text']
+                else 'outline') for item in objects],
+            'new_state': color
+        }
+        self.actions.append(action)
+        self.__color_group(color)
+
+    def __color_group(self, color: str) -> None:
+        """
+        This function colors the selected objects, in a call for shapes
+        and a call for lines and texts.
+        :param color: The color to change to.
+        """
+        self.canvas.itemconfigure(SELECTED_SHAPES_TAG, outline=color)
+        self.canvas.itemconfigure(SELECTED_STROKES_TAG, fill=color)
+
+    def __fill_group(self, is_clear: bool = False) -> None:
+        """
+        This function fills all the selected shapes.
+        Lines and texts are left as they are, their fill is their color.
+        :param is_clear (bool): Whether to clear the fill or not.
+        """
+        objects: List[int] = list(self.canvas.find_withtag(SELECTED_SHAPES_TAG))
+        if not objects:
+            return
+        if is_clear:
+            color: Optional[str] = ''
+        else:
+            self.__disable_canvas_touch()
+            color = askcolor()[1]
+            self.__enable_canvas_touch()
+            if not color:
+                return
+        action: Dict[str, Any] = {
+            'type': 'change group fill',
+            'objects': objects,
+            'prev_states': [self.canvas.itemcget(item, 'fill')
+                            for item in objects],
+            'new_state': color
+        }
+        self.actions.append(action)
+        self.canvas.itemconfigure(SELECTED_SHAPES_TAG, fill=color)
+
+    def __delete_group(self) -> None:
+        """
+        This function deletes all the selected objects.
+        """
+        objects: List[int] = list(self.canvas.find_withtag(SELECTED_TAG))
+        action: Dict[str, Any] = {
+            'type': 'delete group',
+            'objects': objects,
+            'infos': [file_manager.get_item_info(self.canvas, item)
+                      for item in objects]
+        }
+        self.actions.append(action)
+        self.canvas.delete(SELECTED_TAG)
+        self.__show_selection_box()
+        self.__is_group = False
+        self.__buttons_config(*self.__config_buttons)
+
+    def __delete_selected(self) -> None:
+        """
+        This function deletes the selected objects, when the user presses
+        the Delete key in 'Moving Objects Mode'.
+        """
+        selection: Tuple[int, ...] = self.canvas.find_withtag(SELECTED_TAG)
+        if self.__mode != 'Moving Objects Mode' or not selection:
+            return
+        self.__selected_object = selection[-1]
+        self.__is_group = len(selection) > 1
+        self.__delete_object()
+
     def __create_menus(self) -> None:
         """
         This function creates the menu bar for the canvas.
+        It is created once, mode changes only update its mode label
+        (see __update_mode_label).
         """
         menubar: tk.Menu = tk.Menu(self.__frame)
+        self.__menubar: tk.Menu = menubar
 
         # Configure the submenu 'File' inside the main menu
         file_menu: tk.Menu = tk.Menu(menubar, tearoff=0)
@@ -680,10 +1504,13 @@ class CanvasApp:
                               command=self.__save_canvas)
         file_menu.add_command(label="Import A Canvas",
                               command=lambda:
-                              file_manager.load_canvas(self.canvas,
-                                                       self.actions,
-                                                       self.__on_text_right_click,
-                                                       self.file_path))
+                              file_manager.load_canvas(
+                                  self.canvas, self.actions, self.file_path,
+                                  self.__optimize_on_import.get()))
+        file_menu.add_checkbutton(label="Optimize Imported Canvases",
+                                  variable=self.__optimize_on_import)
+        file_menu.add_checkbutton(label="Save Undo History",
+                                  variable=self.__save_history)
 
         file_menu.add_cascade(label="Export As:", menu=export_as_menu)
         file_menu.add_command(label="Exit", command=self.__on_exit)
@@ -696,6 +1523,24 @@ class CanvasApp:
                                command=lambda: self.__change_width("Line"))
         tools_menu.add_command(label="Change Eraser Width",
                                command=lambda: self.__change_width("Eraser"))
+        tools_menu.add_checkbutton(label="Precise Eraser",
+                                   variable=self.__precise_eraser)
+        snap_menu = tk.Menu(tools_menu, tearoff=0)
+        snap_menu.add_checkbutton(label="Snap To Grid",
+                                  variable=self.__snap_to_grid)
+        snap_menu.add_checkbutton(label="Snap To Objects",
+                                  variable=self.__snap_to_objects)
+        snap_menu.add_command(label="Grid Spacing...",
+                              command=self.__change_grid_spacing)
+        tools_menu.add_cascade(label="Snapping", menu=snap_menu)
+        optimize_menu = tk.Menu(tools_menu, tearoff=0)
+        optimize_menu.add_command(label="Join Pencil Strokes",
+                                  command=lambda: self.__optimize(False))
+        optimize_menu.add_command(label="Join And Simplify Strokes...",
+                                  command=lambda: self.__optimize(True))
+        optimize_menu.add_command(label="Remove Unseen Objects...",
+                                  command=self.__cull)
+        tools_menu.add_cascade(label="Optimize Drawing", menu=optimize_menu)
 
         # Create the 'View' submenu inside the main menu
         view_menu = tk.Menu(menubar, tearoff=0)
@@ -708,6 +1553,27 @@ class CanvasApp:
                               command=lambda: self.__change_mode("black"))
         view_menu.add_command(label="Daily Mode",
                               command=lambda: self.__change_mode("white"))
+        view_menu.add_separator()
+        view_menu.add_command(label="Zoom In", accelerator="Ctrl++",
+                              command=lambda: self.__zoom(ZOOM_STEP))
+        view_menu.add_command(label="Zoom Out", accelerator="Ctrl+-",
+                              command=lambda: self.__zoom(1 / ZOOM_STEP))
+        view_menu.add_command(label="Actual Size", accelerator="Ctrl+0",
+                              command=self.__reset_zoom)
+        view_menu.add_separator()
+        view_menu.add_command(label="Layers", command=self.__show_layers)
+        view_menu.add_command(label="History Timeline",
+                              command=self.__show_timeline)
+        # Freezing draws objects as one image, so big drawings stay fast
+        freeze_menu = tk.Menu(view_menu, tearoff=0)
+        freeze_menu.add_command(label="Freeze Current Layer",
+                                command=lambda: self.canvas.freeze(
+                                    self.canvas.layer_items(
+                                        self.canvas.current_layer)))
+        freeze_menu.add_command(label="Freeze Older Objects",
+                                command=self.__freeze_older)
+        freeze_menu.add_command(label="Thaw All", command=self.canvas.thaw)
+        view_menu.add_cascade(label="Freeze", menu=freeze_menu)
 
         # Create "Choose Mode" submenu inside the "Tools" menu
         choose_mode_menu = tk.Menu(tools_menu, tearoff=0)
@@ -725,10 +1591,18 @@ class CanvasApp:
         menubar.add_command(label="Clear Canvas", command=self.__delete_all)
         menubar.add_cascade(label=f"Current Mode: {self.__mode}",
                             menu=choose_mode_menu)
+        self.__mode_menu_index = menubar.index(tk.END)
 
         # Add the main menu to the master window
         self.master.config(menu=menubar)
 
+    def __update_mode_label(self) -> None:
+        """
+        This function updates the menu bar's label of the current mode.
+        """
+        self.__menubar.entryconfig(self.__mode_menu_index,
+                                   label=f"Current Mode: {self.__mode}")
+
     def __change_mode(self, bg: str) -> None:
         """
         This function changes the background of the canvas
@@ -820,7 +1694,7 @@ class CanvasApp:
         # Bind the Enter key to the set_width function
         scale_window.bind('<Return>', lambda event: set_width())
 
-    def __create_text(self, event_x: int, event_y: int) -> None:
+    def __create_text(self, event_x: float, event_y: float) -> None:
         """
         This function creates the user's input text in (event_x, event_y) location
         :param event_x: X position of the user's input.
@@ -851,130 +1725,109 @@ class CanvasApp:
             # If we get here, this means the user has canceled the operation
             self.__enable_canvas_touch()
             return
-        # Create a window that the user will choose a font from
-        font_window = tk.Toplevel(self.master)
-        font_window.title("Select Font")
-        # Make it not resizeable
-        font_window.resizable(False, False)
 
-        label = ttk.Label(font_window, text="Choose Font", font=("David", 14))
-        label.pack(side=tk.TOP)
-
-        # Create a frame for the font list and scrollbar
-        font_frame = ttk.Frame(font_window)
-        font_frame.pack(padx=10, pady=10)
-        font_listbox = tk.Listbox(font_frame)
-        font_listbox.pack(side=tk.LEFT)
-        scrollbar = ttk.Scrollbar(font_frame, orient=tk.VERTICAL,
-                                  command=font_listbox.yview)
-        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
-        font_listbox.config(yscrollcommand=scrollbar.set)
-
-        # Add all the fonts to the listbox
-        font_listbox.insert(tk.END, *FONT_OPTIONS)
-
-        def select_font() -> None:
+        def add_text(selected_font: str) -> None:
             """
-            This function selects the font and adds the text to the canvas
+            This function adds the text to the canvas in the selected font.
+            :param selected_font: The font the user has chosen.
             """
-            selected_index: Tuple[int, ...] = font_listbox.curselection()
-            if selected_index:
-                selected_font: str = FONT_OPTIONS[selected_index[0]]
-                font_window.destroy()
-                # Create the text object
-                text_obj: int = self.canvas.create_text(event_x, event_y,
-                                                        text=text,
-                                                        font=(selected_font,
-                                                              selected_size),
-                                                        fill=str(text_color))
-                # Bind right-click event for the text object
-                self.canvas.tag_bind(text_obj, "<Button-3>",
-                                     lambda event, obj=text_obj:
-                                     self.__on_text_right_click(event))
+            # Create the text object
+            text_obj: int = self.canvas.create_text(event_x, event_y,
+                                                    text=text,
+                                                    font=(selected_font,
+                                                          selected_size),
+                                                    fill=str(text_color))
 
-                action: Dict[str, Any] = {
-                    'type': 'drawing',
-                    'object': text_obj,
-                    'info': file_manager.get_item_info(self.canvas, text_obj)
-                }
-                self.actions.append(action)
-                self.__buttons_config(*self.__config_buttons)
+            action: Dict[str, Any] = {
+                'type': 'drawing',
+                'object': text_obj,
+                'info': file_manager.get_item_info(self.canvas, text_obj)
+            }
+            self.actions.append(action)
+            self.__buttons_config(*self.__config_buttons)
             self.__enable_canvas_touch()
 
-        # Add a button so the user will be able to select the font
-        select_button = ttk.Button(font_window, text="Select",
-                                   command=select_font)
-        select_button.pack(pady=10)
-
-        # Bind the "Enter" key to the select_font function
-        font_window.bind('<Return>', lambda event: select_font())
+        # Let the user choose a font for the text
+        self.__choose_font(add_text)
 
     def __on_click(self, event: tk.Event) -> None:
         """
         This function handles <ButtonPress-1> event.
         :param event: The <ButtonPress-1> event to handle.
         """
+        x, y = self.__to_canvas(event)
+        if self.__mode in ['Drawing Mode', 'Polygon From Dots Mode'] and \
+                self.__current_drawable != "Eraser" and \
+                not self.__can_draw():
+            # Make sure dragging the mouse draws nothing either
+            self.__start_x = self.__start_y = None
+            self.__current_object = None
+            return
         if self.__mode == 'Drawing Mode':
-            self.__start_x: int = event.x
-            self.__start_y: int = event.y
+            if self.__current_drawable in ["Rectangle", "Oval", "Triangle"]:
+                x, y = self.__snap(x, y)
+            self.__start_x: float = x
+            self.__start_y: float = y
             if self.__current_drawable == "Pencil":
                 self.__current_object = self.canvas.create_line(
-                    event.x, event.y, event.x, event.y,
+                    x, y, x, y,
                     fill=self.__outline_color,
                     width=self.__line_width
                 )
             elif self.__current_drawable == "Rectangle":
                 self.__current_object = self.canvas.create_rectangle(
-                    event.x, event.y, event.x, event.y,
+                    x, y, x, y,
                     outline=self.__outline_color,
                     width=self.__line_width,
                     fill=self.__fill
                 )
             elif self.__current_drawable == "Oval":
                 self.__current_object = self.canvas.create_oval(
-                    event.x, event.y, event.x, event.y,
+                    x, y, x, y,
                     outline=self.__outline_color,
                     width=self.__line_width,
                     fill=self.__fill
                 )
             elif self.__current_drawable == "Triangle":
-                self.__triangle_start_x: int = event.x
-                self.__triangle_start_y: int = event.y
+                self.__triangle_start_x: float = x
+                self.__triangle_start_y: float = y
                 self.__current_object = self.canvas.create_polygon(
-                    event.x, event.y, event.x, event.y, event.x, event.y,
+                    x, y, x, y, x, y,
                     outline=self.__outline_color,
                     width=self.__line_width,
                     fill=self.__fill
                 )
             elif self.__current_drawable == "Text":
-                self.__create_text(event.x, event.y)
+                self.__create_text(x, y)
         elif self.__mode == 'Polygon From Dots Mode':
+            x, y = self.__snap(x, y)
             # Create a dot at the clicked point
-            dot = self.canvas.create_oval(event.x - 2,
-                                          event.y - 2,
-                                          event.x + 2,
-                                          event.y + 2,
+            dot = self.canvas.create_oval(x - 2,
+                                          y - 2,
+                                          x + 2,
+                                          y + 2,
                                           fill=self.__outline_color,
                                           outline='')
             self.__polygon_dots.append(dot)
             # Add the clicked point to the list of polygon points
-            self.__polygon_points.append((event.x, event.y))
+            self.__polygon_points.append((x, y))
 
     def __on_drag(self, event: tk.Event) -> None:
         """
         This function handles <B1-Motion> event.
         :param event: The <B1-Motion> event to handle.
         """
+        x, y = self.__to_canvas(event)
         if self.__mode == 'Drawing Mode':
             if self.__current_drawable == "Pencil":
                 if self.__start_x is not None and self.__start_y is not None:
                     line = self.canvas.create_line(self.__start_x,
                                                    self.__start_y,
-                                                   event.x, event.y,
+                                                   x, y,
                                                    fill=self.__outline_color,
                                                    width=self.__line_width)
-                    self.__start_x = event.x
-                    self.__start_y = event.y
+                    self.__start_x = x
+                    self.__start_y = y
                     action = {
                         'type': 'drawing',
                         'object': line,
@@ -982,19 +1835,22 @@ class CanvasApp:
                     }
                     self.actions.append(action)
             elif self.__current_drawable in ["Rectangle", "Oval", "Triangle"]:
+                if not self.__current_object:
+                    return  # Nothing is being drawn
+                x, y = self.__snap(x, y, (self.__current_object,))
                 if self.__current_drawable == "Triangle":
                     self.canvas.coords(self.__current_object,
                                        self.__triangle_start_x,
                                        self.__triangle_start_y,
-                                       event.x, event.y,
-                                       event.x - (
-                                               event.x - self.__triangle_start_x) * 2,
-                                       event.y)
+                                       x, y,
+                                       x - (
+                                               x - self.__triangle_start_x) * 2,
+                                       y)
                 else:
                     self.canvas.coords(self.__current_object, self.__start_x,
-                                       self.__start_y, event.x, event.y)
+                                       self.__start_y, x, y)
             elif self.__current_drawable == "Eraser":
-                if not self.canvas.find_all():  # If the canvas is empty
+                if not self.canvas.object_count():  # If the canvas is empty
                     self.__disable_canvas_touch()  # Until the user clicks ok
                     messagebox.showinfo(title="Eraser Off",
                                         message="Eraser turned off because there"
@@ -1005,28 +1861,125 @@ class CanvasApp:
                     self.__current_drawable = "Pencil"
                     self.__buttons_config(*self.__config_buttons)
                     return
-                # Find all objects within a certain radius around the mouse cursor
-                overlapping_objects: Tuple[int, ...] = self.canvas.find_overlapping(
-                    event.x - self.__eraser_width,
-                    event.y - self.__eraser_width,
-                    event.x + self.__eraser_width,
-                    event.y + self.__eraser_width
-                )
-                # Delete all overlapping objects
-                for obj_id in overlapping_objects:
-                    action = {
-                        'type': 'delete object',
-                        'object': obj_id,
-                        'info': file_manager.get_item_info(self.canvas, obj_id)
-                    }
-                    self.actions.append(action)
-                    self.canvas.delete(obj_id)
+                self.__erase(x, y)
+
+    def __erase(self, x: float, y: float) -> None:
+        """
+        This function erases around a point. The precise eraser cuts the
+        circle out of lines and hollow outlines, leaving the pieces around
+        it, and deletes the other objects whose exact shape it touches.
+        Otherwise, every object whose bounding box it touches is deleted.
+        Locked objects are never erased.
+        :param x: The x canvas coordinate of the point.
+        :param y: The y canvas coordinate of the point.
+        """
+        radius = self.__eraser_width
+        # Only the objects whose bounding box is near the point can be erased
+        candidates = [item for item in self.canvas.find_overlapping(
+            x - radius, y - radius, x + radius, y + radius)
+                      if not self.canvas.is_locked(item)]
+        if not candidates:
+            return
+        # The pieces left of each erased object, by id
+        cut: Dict[int, eraser.Pieces] = {}
+        if not self.__precise_eraser.get():
+            cut = {item: [] for item in candidates}
+        else:
+            infos = [self.canvas.object_info(item) for item in candidates]
+            # The outlines of filled shapes and of text cannot be cut
+            is_cuttable = [info["type"] == "line" or
+                           info["type"] in ["rectangle", "oval", "polygon"] and
+                           info.get("fill") == "" and info.get("outline") != ""
+                           for info in infos]
+            shapes = [(info["type"], info["coords"])
+                      for info, cuttable in zip(infos, is_cuttable)
+                      if cuttable]
+            cuttable_items = [item for item, cuttable
+                              in zip(candidates, is_cuttable) if cuttable]
+            for item, pieces in zip(cuttable_items,
+                                    eraser.cut_shapes(shapes, x, y, radius)):
+                if pieces is not None:
+                    cut[item] = pieces
+            hits = set(self.canvas.find_hits(x, y, radius))
+            for item, cuttable in zip(candidates, is_cuttable):
+                if not cuttable and item in hits:
+                    cut[item] = []
+        if not cut:
+            return
+        # All the Tk items are created and deleted by one Tcl call
+        with self.canvas.batch():
+            for item, pieces in cut.items():
+                source = self.__piece_sources.pop(item, item)
+                if source == item:
+                    # The object existed before the gesture
+                    self.__erased[item] = file_manager.get_item_info(
+                        self.canvas, item)
+                    self.__erase_pieces[item] = []
+                else:
+                    self.__erase_pieces[source].remove(item)
+                if pieces:
+                    info = self.canvas.object_info(item)
+                    color = info["fill"] if info["type"] == "line" \
+                        else info["outline"]
+                    with self.canvas.drawing_on(self.canvas.layer_of(item)):
+                        for coords in pieces:
+                            piece = self.canvas.create_line(
+                                coords, fill=color, width=info["width"])
+                            # The pieces keep the place of the object
+                            self.canvas.tag_lower(piece, item)
+                            self.__erase_pieces[source].append(piece)
+                            self.__piece_sources[piece] = source
+            self.canvas.delete(*cut)
+
+    def __finish_erasing(self) -> None:
+        """
+        This function records the current eraser gesture as one action:
+        the objects it erased, and the pieces left of each of them.
+        """
+        action: Dict[str, Any] = {
+            'type': 'erase',
+            'prev_infos': list(self.__erased.values()),
+            'new_infos': [[file_manager.get_item_info(self.canvas, piece)
+                           for piece in self.__erase_pieces[item]]
+                          for item in self.__erased]
+        }
+        self.actions.append(action)
+        self.__erased = {}
+        self.__erase_pieces = {}
+        self.__piece_sources = {}
+        self.__buttons_config(*self.__config_buttons)
+
+    def __swap_erased(self, action: Dict[str, Any], is_undo: bool) -> None:
+        """
+        This function undoes or redoes an eraser gesture, keeping the
+        stacking order of the erased objects and of their pieces.
+        :param action: The 'erase' action.
+        :param is_undo: True to bring the erased objects back,
+                        False to erase them again.
+        """
+        with self.canvas.batch():
+            for info, pieces in zip(action['prev_infos'],
+                                    action['new_infos']):
+                if is_undo:
+                    self.__recreate(info)
+                    if pieces:
+                        self.canvas.tag_lower(info['id'], pieces[0]['id'])
+                    self.canvas.delete(*[piece['id'] for piece in pieces])
+                else:
+                    for piece in pieces:
+                        self.__recreate(piece)
+                        self.canvas.tag_lower(piece['id'], info['id'])
+                    self.canvas.delete(info['id'])
 
     def __on_release(self) -> None:
         """
         This function handles <ButtonRelease-1> event.
         """
-        if self.__current_object:
+        if self.__mode == 'Moving Objects Mode':
+            self.__finish_selecting()
+        elif self.__erased:
+            self.__finish_erasing()
+        elif self.__current_object:
             action = {
                 'type': 'drawing',
                 'object': self.__current_object,
@@ -1038,6 +1991,56 @@ class CanvasApp:
             self.__buttons_config(*self.__config_buttons)
             self.master.update()
 
+    def __to_canvas(self, event: tk.Event) -> Tuple[float, float]:
+        """
+        This function converts the location of a mouse event to canvas
+        coordinates, which differ from window coordinates once the canvas
+        is scrolled.
+        :param event: The mouse event.
+        :return: The x and y canvas coordinates of the event.
+        """
+        return self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+
+    def __zoom(self, factor: float, event: Optional[tk.Event] = None) -> None:
+        """
+        This function zooms the canvas in or out.
+        :param factor: How much to zoom by, more than 1 zooms in.
+        :param event: The mouse event to zoom around.
+                      Defaults to None, which zooms around the window's center.
+        """
+        if event is None:
+            x, y = self.canvas.winfo_width() // 2, self.canvas.winfo_height() // 2
+        else:
+            x, y = event.x, event.y
+        self.canvas.zoom_at(factor, x, y)
+
+    def __reset_zoom(self) -> None:
+        """
+        This function zooms the canvas back to its actual size.
+        """
+        self.__zoom(1 / self.canvas.zoom)
+
+    def __on_wheel(self, event: tk.Event, action: str = "y") -> None:
+        """
+        This function handles the mouse wheel.
+        :param event: The mouse wheel event.
+        :param action: 'y' to scroll vertically, 'x' to scroll horizontally,
+                       'zoom' to zoom around the mouse. Defaults to 'y'.
+        """
+        # Windows and macOS report a delta, Linux reports button 4 or 5
+        if event.num == 4 or event.delta > 0:
+            direction = -1
+        elif event.num == 5 or event.delta < 0:
+            direction = 1
+        else:
+            return
+        if action == "zoom":
+            self.__zoom(ZOOM_STEP if direction == -1 else 1 / ZOOM_STEP, event)
+        elif action == "x":
+            self.canvas.xview_scroll(direction, "units")
+        else:
+            self.canvas.yview_scroll(direction, "units")
+
     def __disable_canvas_touch(self) -> None:
         """
         This function disables the canvas' touch.
@@ -1051,9 +2054,13 @@ class CanvasApp:
         """
         This function enables the canvas' touch.
         """
-        # Rebind canvas events
-        self.canvas.bind("<ButtonPress-1>", self.__on_click)
-        self.canvas.bind("<B1-Motion>", self.__on_drag)
+        # Rebind canvas events, to the handlers of the current mode
+        if self.__mode == 'Moving Objects Mode':
+            self.canvas.bind("<ButtonPress-1>", self.__select_object)
+            self.canvas.bind("<B1-Motion>", self.__drag_object)
+        else:
+            self.canvas.bind("<ButtonPress-1>", self.__on_click)
+            self.canvas.bind("<B1-Motion>", self.__on_drag)
         self.canvas.bind("<ButtonRelease-1>", lambda event: self.__on_release())
 
     def __choose_drawable(self, drawable: str) -> None:
@@ -1086,10 +2093,7 @@ class CanvasApp:
         """
         if self.__mode == 'Polygon From Dots Mode':
             return
-        self.__polygon_button = ttk.Button(self.__frame,
-                                           text="Create the polygon",
-                                           command=lambda:
-                                           self.__create_polygon_from_dots())
+        self.__clear_selection()
         self.__polygon_button.pack(side=tk.LEFT)
         self.canvas.bind("<ButtonPress-1>", self.__on_click)
         self.canvas.bind("<B1-Motion>", self.__on_drag)
@@ -1100,7 +2104,7 @@ class CanvasApp:
         self.__current_drawable = "Polygon From Dots"
         # Set the draw mode to 'Polygon From Dots', in order to wait for user input
         self.__mode = 'Polygon From Dots Mode'
-        self.__create_menus()  # Update the menus
+        self.__update_mode_label()
         self.master.update()
         # Clear any existing polygon points
         self.__polygon_points.clear()
@@ -1109,8 +2113,9 @@ class CanvasApp:
         """
         This function sets the drawing mode.
         """
+        self.__clear_selection()
         self.__mode = 'Drawing Mode'
-        self.__create_menus()  # Update the menus
+        self.__update_mode_label()
         self.master.update()
         self.__current_drawable = "Pencil"
         self.canvas.bind("<ButtonPress-1>", self.__on_click)
@@ -1118,13 +2123,13 @@ class CanvasApp:
         self.canvas.bind("<ButtonRelease-1>", lambda event: self.__on_release())
         self.canvas.bind("<Double-Button-3>", lambda event:
                          self.__set_selecting_mode())
-        self.__polygon_button.destroy()
+        self.__polygon_button.pack_forget()
 
     def __set_selecting_mode(self) -> None:
         """
         This function sets the selecting objects mode.
         """
-        if not self.canvas.find_all():  # If the canvas is empty
+        if not self.canvas.object_count():  # If the canvas is empty
             self.__disable_canvas_touch()  # Until the user clicks ok
             messagebox.showinfo(title="ERROR!",
                                 message="There are no objects on the canvas"
@@ -1136,20 +2141,22 @@ class CanvasApp:
             self.__enable_canvas_touch()
             return
         self.__mode = 'Moving Objects Mode'
-        self.__create_menus()  # Update the menus
+        self.__update_mode_label()
         self.master.update()
         self.canvas.bind("<ButtonPress-1>", self.__select_object)
         self.canvas.bind("<B1-Motion>", self.__drag_object)
+        self.canvas.bind("<ButtonRelease-1>", lambda event: self.__on_release())
         self.canvas.bind("<Double-Button-3>", lambda event:
                          self.__set_drawing_mode())
-        self.__polygon_button.destroy()
+        self.__polygon_button.pack_forget()
 
     def __select_object(self, event: tk.Event) -> None:
         """
-        This function selects the closest object from the event.
+        This function selects the object under the event, or starts selecting
+        the objects inside a rubber band (or a lasso, while holding Shift).
         :param event: The event to handle.
         """
-        if not self.canvas.find_all():  # If the canvas is empty
+        if not self.canvas.object_count():  # If the canvas is empty
             self.__disable_canvas_touch()  # Until the user clicks ok
             messagebox.showinfo(title="ERROR!",
                                 message="There are no objects on the canvas"
@@ -1160,26 +2167,41 @@ class CanvasApp:
             self.__buttons_config(*self.__config_buttons)
             self.__enable_canvas_touch()
             return
-        # Clear any previously selected object
-        self.__selected_object = 0
-        self.__selected_object_start_x = 0
-        self.__selected_object_start_y = 0
-
         # Find the object under the mouse cursor
-        self.__selected_object = self.canvas.find_closest(event.x, event.y)[0]
+        x, y = self.__to_canvas(event)
+        self.__selected_object = self.__object_at(x, y)
+        self.__selected_object_start_x = x
+        self.__selected_object_start_y = y
 
         if self.__selected_object:
-            # If an object is selected, record its starting coordinates
-            bbox = self.canvas.bbox(self.__selected_object)
-            self.__selected_object_start_x = bbox[0]
-            self.__selected_object_start_y = bbox[1]
+            # Dragging one of the selected objects drags all of them
+            if self.__selected_object not in \
+                    self.canvas.find_withtag(SELECTED_TAG):
+                self.__select([self.__selected_object])
+                self.__show_selection_box()
+            self.__start_drag()
+            return
+        # Pressing on an empty spot starts a rubber band,
+        # or a free-form lasso while holding Shift
+        self.__clear_selection()
+        self.__is_lasso = bool(event.state & 0x0001)
+        if self.__is_lasso:
+            self.__band_points = [x, y]
+            self.__band = self.canvas.create_overlay(
+                'line', [x, y, x, y], fill=SELECTION_COLOR, dash=(4, 2))
+        else:
+            self.__band_points = [x, y, x, y]
+            self.__band = self.canvas.create_overlay(
+                'rectangle', self.__band_points, outline=SELECTION_COLOR,
+                dash=(4, 2))
 
     def __drag_object(self, event: tk.Event) -> None:
         """
-        This function drags the selected object over the canvas.
+        This function drags the selected objects over the canvas,
+        or the rubber band (or lasso) that selects objects.
         :param event: The event to handle.
         """
-        if not self.canvas.find_all():  # If the canvas is empty
+        if not self.canvas.object_count():  # If the canvas is empty
             self.__disable_canvas_touch()  # Until the user clicks ok
             messagebox.showinfo(title="ERROR!",
                                 message="There are no objects on the canvas"
@@ -1190,28 +2212,162 @@ class CanvasApp:
             self.__buttons_config(*self.__config_buttons)
             self.__enable_canvas_touch()
             return
-        if self.__selected_object:
-            prev_state = self.canvas.coords(self.__selected_object)
-
-            # Calculate the distance moved by the mouse
-            dx: int = event.x - self.__selected_object_start_x
-            dy: int = event.y - self.__selected_object_start_y
-
-            # Move the selected object by the calculated distance
-            self.canvas.move(self.__selected_object, dx, dy)
-
-            # Update the starting coordinates for the next drag event
-            self.__selected_object_start_x = event.x
-            self.__selected_object_start_y = event.y
+        x, y = self.__to_canvas(event)
+        if self.__band is not None:
+            if self.__is_lasso:
+                self.__band_points.extend((x, y))
+                # Show the lasso closed, as it will select
+                self.canvas.overlay_coords(self.__band, self.__band_points +
+                                           self.__band_points[:2])
+            else:
+                self.__band_points[2:] = [x, y]
+                self.canvas.overlay_coords(self.__band, self.__band_points)
+        elif self.__selected_object:
+            # How far the objects should be from where the drag started
+            total_dx, total_dy = self.__snap_drag(
+                x - self.__selected_object_start_x,
+                y - self.__selected_object_start_y)
+            dx: float = total_dx - self.__dragged[0]
+            dy: float = total_dy - self.__dragged[1]
+            self.__dragged = (total_dx, total_dy)
+
+            # Move only what is on the screen until the drag is done,
+            # all the selected objects are moved by one call
+            self.canvas.move_preview(SELECTED_TAG, dx, dy)
+            if self.__selection_box is not None:
+                self.__selection_box_coords = [
+                    value + (dy if i % 2 else dx)
+                    for i, value in enumerate(self.__selection_box_coords)]
+                self.canvas.overlay_coords(self.__selection_box,
+                                           self.__selection_box_coords)
+
+    def __start_drag(self) -> None:
+        """
+        This function prepares dragging the selected objects, finding the
+        points they snap by: all their points, or the corners and the center
+        of their bounding box if they have too many points.
+        """
+        self.__dragged = (0, 0)
+        points: List[Tuple[float, float]] = []
+        for item in self.canvas.find_withtag(SELECTED_TAG):
+            points.extend((x, y) for x, y in
+                          self.canvas.snap_points_of(item).tolist())
+        if len(points) > DRAG_SNAP_POINTS:
+            xs, ys = [x for x, _ in points], [y for _, y in points]
+            x1, y1, x2, y2 = min(xs), min(ys), max(xs), max(ys)
+            points = [(x1, y1), (x2, y1), (x2, y2), (x1, y2),
+                      ((x1 + x2) / 2, (y1 + y2) / 2)]
+        self.__drag_points = points
+
+    def __snap(self, x: float, y: float,
+               exclude: Tuple[int, ...] = ()) -> Tuple[float, float]:
+        """
+        This function snaps a point to the nearest point of an object,
+        or else to the grid, as chosen in the 'Snapping' menu.
+        :param x: The x canvas coordinate of the point.
+        :param y: The y canvas coordinate of the point.
+        :param exclude: The objects not to snap to. Defaults to none.
+        :return: The snapped point, or the point itself.
+        """
+        if self.__snap_to_objects.get():
+            target = self.canvas.snap_target(
+                x, y, SNAP_RADIUS / self.canvas.zoom, exclude)
+            if target is not None:
+                return target
+        if self.__snap_to_grid.get():
+            return snap_to_grid(x, y, self.__grid_spacing)
+        return x, y
+
+    def __snap_drag(self, dx: float, dy: float) -> Tuple[float, float]:
+        """
+        This function snaps a drag of the selected objects, so the point of
+        theirs that is nearest to a point of another object lands on it,
+        or else their first point lands on the grid.
+        :param dx: How far the mouse has moved on the x axis.
+        :param dy: How far the mouse has moved on the y axis.
+        :return: How far to move the objects on the x and y axes.
+        """
+        if not self.__drag_points:
+            return dx, dy
+        if self.__snap_to_objects.get():
+            selected = self.canvas.find_withtag(SELECTED_TAG)
+            radius = SNAP_RADIUS / self.canvas.zoom
+            best: Optional[Tuple[float, float, float]] = None
+            for x, y in self.__drag_points:
+                target = self.canvas.snap_target(x + dx, y + dy, radius,
+                                                 selected)
+                if target is None:
+                    continue
+                distance = (target[0] - x - dx) ** 2 + \
+                    (target[1] - y - dy) ** 2
+                if best is None or distance < best[0]:
+                    best = (distance, target[0] - x, target[1] - y)
+            if best is not None:
+                return best[1], best[2]
+        if self.__snap_to_grid.get():
+            x, y = self.__drag_points[0]
+            grid_x, grid_y = snap_to_grid(x + dx, y + dy, self.__grid_spacing)
+            return grid_x - x, grid_y - y
+        return dx, dy
+
+    def __change_grid_spacing(self) -> None:
+        """
+        This function asks the user for the distance between the lines
+        of the grid that points snap to.
+        """
+        self.__disable_canvas_touch()
+        spacing: Optional[int] = simpledialog.askinteger(
+            "Grid Spacing", "Enter the distance between the grid lines:",
+            initialvalue=self.__grid_spacing, minvalue=1, parent=self.master)
+        self.__enable_canvas_touch()
+        if spacing is not None:
+            self.__grid_spacing = spacing
+            self.__snap_to_grid.set(True)
+
+    def __finish_selecting(self) -> None:
+        """
+        This function handles <ButtonRelease-1> event in
+        'Moving Objects Mode', selecting the objects inside the rubber band
+        (or lasso), or finishing the drag of the selected objects.
+        """
+        if self.__band is not None:
+            self.canvas.delete_overlay(self.__band)
+            self.__band = None
+            xs: List[float] = self.__band_points[::2]
+            ys: List[float] = self.__band_points[1::2]
+            items: List[int] = [item for item in self.canvas.find_enclosed(
+                min(xs), min(ys), max(xs), max(ys))
+                                if not self.canvas.is_locked(item)]
+            if self.__is_lasso:
+                items = [items[i] for i in objects_in_lasso(
+                    [self.__outline_points(item) for item in items],
+                    self.__band_points)]
+            self.__select(items)
+            self.__show_selection_box()
+        elif self.__selected_object:
+            dx, dy = self.canvas.finish_move(SELECTED_TAG)
+            if dx or dy:
+                action: Dict[str, Any] = {
+                    'type': 'moving group',
+                    'objects': list(self.canvas.find_withtag(SELECTED_TAG)),
+                    'dx': dx,
+                    'dy': dy
+                }
+                self.actions.append(action)
+                self.__buttons_config(*self.__config_buttons)
 
-            new_state = self.canvas.coords(self.__selected_object)
-            action = {
-                'type': 'moving',
-                'object': self.__selected_object,
-                'prev_state': prev_state,
-                'new_state': new_state
-            }
-            self.actions.append(action)
+    def __outline_points(self, item: int) -> List[float]:
+        """
+        This function returns the points that outline an object,
+        which are all inside a lasso that encloses the object.
+        :param item: The object.
+        :return: The flat coordinates of the points.
+        """
+        if self.canvas.type(item) in ['line', 'polygon']:
+            return self.canvas.coords(item)
+        # The corners of the object's bounding box
+        x1, y1, x2, y2 = self.canvas.bbox(item)
+        return [x1, y1, x2, y1, x2, y2, x1, y2]
 
     def __delete_all(self, is_redo: bool = False) -> None:
         """
@@ -1234,124 +2390,265 @@ class CanvasApp:
                     {'info': file_manager.get_item_info(self.canvas, obj)}
                 )
             action['actions'] = actions_list
-            self.actions.append(action)
+            if not is_redo:
+                # Redo appends back the action it redoes
+                self.actions.append(action)
             self.canvas.delete("all")
             self.__set_drawing_mode()
-            self.__polygon_button = ttk.Button(self.__frame,
-                                               text="Create the polygon",
-                                               command=lambda:
-                                               self.__create_polygon_from_dots())
             self.__buttons_config(*self.__config_buttons)
 
+    def __optimize(self, is_simplify: bool) -> None:
+        """
+        This function joins the pencil strokes of the drawing into polylines,
+        so it has much fewer objects, and simplifies them if asked to.
+        :param is_simplify: Whether to ask for a tolerance and leave out
+                            the points of the strokes closer than it.
+        """
+        tolerance: Optional[float] = 0.0
+        if is_simplify:
+            self.__disable_canvas_touch()
+            tolerance = simpledialog.askfloat(
+                "Simplify Strokes",
+                "How far may the strokes move, in pixels?",
+                initialvalue=1.0, minvalue=0.0, parent=self.master)
+            self.__enable_canvas_touch()
+            if tolerance is None:
+                return
+        prev_infos: List[Dict[str, Any]] = [
+            file_manager.get_item_info(self.canvas, item)
+            for item in self.canvas.find_all()]
+        new_infos = optimizer.optimize(prev_infos, tolerance)
+        if new_infos == prev_infos:
+            messagebox.showinfo("Optimize Drawing",
+                                "The drawing is already optimized.")
+            return
+        self.__record_optimize(prev_infos, new_infos)
+        messagebox.showinfo("Optimize Drawing",
+                            f"{len(prev_infos)} objects became"
+                            f" {len(new_infos)}.")
+
+    def __cull(self) -> None:
+        """
+        This function finds the objects that are never seen: degenerate
+        objects, exact duplicates and objects covered by filled shapes,
+        reports them and removes them if the user agrees.
+        """
+        prev_infos: List[Dict[str, Any]] = [
+            file_manager.get_item_info(self.canvas, item)
+            for item in self.canvas.find_all()]
+        new_infos, report = optimizer.cull(prev_infos)
+        if not report.removed():
+            messagebox.showinfo("Remove Unseen Objects",
+                                "Every object of the drawing can be seen.")
+            return
+        self.__disable_canvas_touch()
+        is_remove = messagebox.askyesno("Remove Unseen Objects",
+                                        f"{report}\nRemove them?")
+        self.__enable_canvas_touch()
+        if is_remove:
+            self.__record_optimize(prev_infos, new_infos)
+
+    def __record_optimize(self, prev_infos: List[Dict[str, Any]],
+                          new_infos: List[Dict[str, Any]]) -> None:
+        """
+        This function replaces the objects of the drawing by their
+        optimized version, as one action that can be undone.
+        :param prev_infos: The information of the objects, bottom first.
+        :param new_infos: The information of the optimized objects.
+        """
+        action: Dict[str, Any] = {
+            'type': 'optimize',
+            'prev_infos': prev_infos,
+            'new_infos': new_infos
+        }
+        self.actions.append(action)
+        self.__replace_all(new_infos)
+        self.__buttons_config(*self.__config_buttons)
+
+    def __replace_all(self, infos: List[Dict[str, Any]]) -> None:
+        """
+        This function replaces all the objects of the canvas,
+        keeping the ids the objects had.
+        :param infos: The information of the new objects, bottom first,
+                      as returned by file_manager.get_item_info.
+        """
+        self.__clear_selection()
+        self.canvas.delete("all")
+        self.__recreate_all(infos)
+
     def __undo(self) -> None:
         """
         This function undoes the last-done action
         """
         if self.actions:
-            last_action: Dict[str, Any] = self.actions.pop()
-            action_type = last_action['type']
-            if action_type == 'drawing':
-                self.canvas.delete(last_action['object'])
-            elif action_type == 'moving':
-                self.canvas.coords(last_action['object'], *last_action['prev_state'])
-            elif action_type == 'change outline color':
-                self.canvas.itemconfig(last_action['object'],
-                                       outline=last_action['prev_state'])
-            elif action_type == 'changing order':
-                if last_action['prev_state']:
-                    self.canvas.tag_raise(last_action['object'])
-                else:
-                    self.canvas.tag_lower(last_action['object'])
-            elif action_type == "change text":
-                self.canvas.itemconfig(last_action['object'],
-                                       text=last_action['prev_text'])
-            elif action_type == "change fill":
-                self.canvas.itemconfig(last_action['object'],
-                                       fill=last_action['prev_state'])
-            elif action_type == 'change width':
-                self.canvas.itemconfig(last_action['object'],
-                                       width=last_action['prev_state'])
-            elif action_type == 'delete object':
-                file_manager.recreate_object(self.canvas, self.actions,
-                                             last_action['info'],
-                                             self.__on_text_right_click)
-            elif action_type in ['change text size', 'change object font']:
-                self.canvas.itemconfig(last_action['object'],
-                                       font=last_action['prev_font'])
-            elif action_type == 'delete all':
-                for item in last_action['actions']:
-                    file_manager.recreate_object(self.canvas, self.actions,
-                                                 item['info'],
-                                                 self.__on_text_right_click)
-            elif action_type == 'rotate object':
-                self.canvas.delete(last_action['new_object'])
-                last_action['old_object'] = self.canvas.create_polygon(
-                    last_action['old_info']['coords'],
-                    outline=last_action['old_info']['outline'],
-                    width=last_action['old_info']['width'],
-                    fill=last_action['old_info']['fill']
-                )
-                last_action['old_info'] = file_manager.get_item_info(
-                    self.canvas, last_action['old_object']
-                )
-            self.__undone_actions.append(last_action)
+            last_action: Mapping[str, Any] = self.actions.pop()
+            undo = self.__undoers.get(last_action['type'])
+            if undo is not None:
+                undo(last_action)
         self.__buttons_config(*self.__config_buttons)
         self.master.update()
 
+    def __configurer(self, option: str,
+                     key: str) -> Callable[[Mapping[str, Any]], None]:
+        """
+        This function makes a function that sets an option of the object
+        of an action.
+        :param option: The option to set.
+        :param key: The key of the action whose value the option is set to.
+        :return: The function, which gets the action.
+        """
+        return lambda action: self.canvas.itemconfig(
+            action['object'], **{option: action[key]})
+
+    def __make_undoers(self) -> Dict[str, Callable[[Mapping[str, Any]], None]]:
+        """
+        This function makes the table of how each type of action is undone.
+        :return: The function that undoes each type of action,
+                 which gets the action.
+        """
+        return {
+            'drawing': lambda action: self.canvas.delete(action['object']),
+            'moving': lambda action: self.canvas.coords(
+                action['object'], *action['prev_state']),
+            'change outline color': self.__configurer('outline', 'prev_state'),
+            'change layer': lambda action: self.canvas.set_layer(
+                action['object'], action['prev_state']),
+            'changing order': lambda action: (
+                self.canvas.tag_raise if action['prev_state']
+                else self.canvas.tag_lower)(action['object']),
+            'change text': self.__configurer('text', 'prev_text'),
+            'change fill': self.__configurer('fill', 'prev_state'),
+            'change width': self.__configurer('width', 'prev_state'),
+            'delete object': lambda action: self.__recreate(action['info']),
+            'change text size': self.__configurer('font', 'prev_font'),
+            'change object font': self.__configurer('font', 'prev_font'),
+            'delete all': lambda action: self.__recreate_all(
+                [entry['info'] for entry in action['actions']]),
+            'transform': lambda action: self.__set_shapes(
+                action['objects'], action['prev_states']),
+            'optimize': lambda action: self.__replace_all(
+                action['prev_infos']),
+            'erase': lambda action: self.__swap_erased(action, True),
+            'revert object': lambda action: self.__apply_info(
+                action['object'], action['prev_info']),
+            'moving group': lambda action: self.__apply_to_group(
+                action['objects'], lambda: self.canvas.move(
+                    SELECTED_TAG, -action['dx'], -action['dy'])),
+            'changing group order': lambda action: self.__apply_to_group(
+                action['objects'], lambda:
+                self.canvas.tag_raise(SELECTED_TAG) if action['prev_state']
+                else self.canvas.tag_lower(SELECTED_TAG)),
+            'change group fill': self.__undo_group_colors,
+            'change group color': self.__undo_group_colors,
+            'delete group': self.__undo_delete_group
+        }
+
+    def __undo_group_colors(self, action: Mapping[str, Any]) -> None:
+        """
+        This function undoes filling or coloring a group of objects.
+        :param action: The action, as kept in self.actions.
+        """
+        # The objects had different colors, restore them one by one
+        for item, prev_state in zip(action['objects'],
+                                    action['prev_states']):
+            if action['type'] == 'change group fill' or \
+                    self.canvas.type(item) in ['line', 'text']:
+                self.canvas.itemconfig(item, fill=prev_state)
+            else:
+                self.canvas.itemconfig(item, outline=prev_state)
+
+    def __undo_delete_group(self, action: Mapping[str, Any]) -> None:
+        """
+        This function undoes deleting a group of objects.
+        :param action: The action, as kept in self.actions.
+        """
+        self.__recreate_all(action['infos'])
+        # Select the objects that are back
+        self.__apply_to_group(action['objects'], lambda: None)
+
+    def __recreate_all(self, infos: List[Mapping[str, Any]]) -> None:
+        """
+        This function brings back deleted objects with their ids.
+        :param infos: The information of the objects, bottom first,
+                      as returned by file_manager.get_item_info.
+        """
+        # All the Tk items are created by one Tcl call
+        with self.canvas.batch():
+            for info in infos:
+                self.__recreate(info)
+
+    def __recreate(self, info: Dict[str, Any]) -> None:
+        """
+        This function brings back a deleted object with its id,
+        so the history entries that refer to the object keep working.
+        :param info: The object's information, as returned by
+                     file_manager.get_item_info.
+        """
+        # Recreating an object is part of the undone or redone action,
+        # not an action of its own
+        file_manager.recreate_object(self.canvas, [], info)
+
     def __redo(self) -> None:
         """
         This function redoes the last undone action.
         """
-        if self.__undone_actions:
-            last_undone_action = self.__undone_actions.pop()
-            action_type = last_undone_action['type']
-            if action_type == 'drawing':
-                obj_info: Dict[str, Any] = last_undone_action['info']
-                file_manager.recreate_object(self.canvas, self.actions,
-                                             obj_info,
-                                             self.__on_text_right_click)
-            elif action_type == 'moving':
-                self.canvas.coords(last_undone_action['object'],
-                                   *last_undone_action['new_state'])
-            elif action_type == 'change outline color':
-                self.canvas.itemconfig(last_undone_action['object'],
-                                       outline=last_undone_action['new_state'])
-            elif action_type == 'changing order':
-                if last_undone_action['prev_state']:
-                    self.canvas.tag_lower(last_undone_action['object'])
-                else:
-                    self.canvas.tag_raise(last_undone_action['object'])
-            elif action_type == "change text":
-                self.canvas.itemconfig(last_undone_action['object'],
-                                       text=last_undone_action['new_text'])
-            elif action_type == "change fill":
-                self.canvas.itemconfig(last_undone_action['object'],
-                                       fill=last_undone_action['new_state'])
-            elif action_type == 'change width':
-                self.canvas.itemconfig(last_undone_action['object'],
-                                       width=last_undone_action['new_state'])
-            elif action_type == 'delete object':
-                self.canvas.delete(last_undone_action['object'])
-            elif action_type in ['change text size', 'change object font']:
-                self.canvas.itemconfig(last_undone_action['object'],
-                                       font=last_undone_action['new_font'])
-            elif action_type == "delete all":
-                self.__delete_all(True)
-            elif action_type == 'rotate object':
-                self.canvas.delete(last_undone_action['old_object'])
-                last_undone_action['new_object'] = self.canvas.create_polygon(
-                    last_undone_action['new_info']['coords'],
-                    outline=last_undone_action['new_info']['outline'],
-                    width=last_undone_action['new_info']['width'],
-                    fill=last_undone_action['new_info']['fill']
-                )
-                last_undone_action['new_info'] = file_manager.get_item_info(
-                    self.canvas, last_undone_action['new_object']
-                )
+        last_undone_action = self.actions.next_action()
+        if last_undone_action is not None:
+            redo = self.__redoers.get(last_undone_action['type'])
+            if redo is not None:
+                redo(last_undone_action)
             self.actions.append(last_undone_action)
         self.__buttons_config(*self.__config_buttons)
         self.master.update()
 
+    def __make_redoers(self) -> Dict[str, Callable[[Mapping[str, Any]], None]]:
+        """
+        This function makes the table of how each type of action is redone.
+        :return: The function that redoes each type of action,
+                 which gets the action.
+        """
+        return {
+            'drawing': lambda action: self.__recreate(action['info']),
+            'moving': lambda action: self.canvas.coords(
+                action['object'], *action['new_state']),
+            'change outline color': self.__configurer('outline', 'new_state'),
+            'change layer': lambda action: self.canvas.set_layer(
+                action['object'], action['new_state']),
+            'changing order': lambda action: (
+                self.canvas.tag_lower if action['prev_state']
+                else self.canvas.tag_raise)(action['object']),
+            'change text': self.__configurer('text', 'new_text'),
+            'change fill': self.__configurer('fill', 'new_state'),
+            'change width': self.__configurer('width', 'new_state'),
+            'delete object': lambda action: self.canvas.delete(
+                action['object']),
+            'change text size': self.__configurer('font', 'new_font'),
+            'change object font': self.__configurer('font', 'new_font'),
+            'delete all': lambda action: self.__delete_all(True),
+            'transform': lambda action: self.__set_shapes(
+                action['objects'], action['new_states']),
+            'optimize': lambda action: self.__replace_all(
+                action['new_infos']),
+            'erase': lambda action: self.__swap_erased(action, False),
+            'revert object': lambda action: self.__apply_info(
+                action['object'], action['new_info']),
+            'moving group': lambda action: self.__apply_to_group(
+                action['objects'], lambda: self.canvas.move(
+                    SELECTED_TAG, action['dx'], action['dy'])),
+            'changing group order': lambda action: self.__apply_to_group(
+                action['objects'], lambda:
+                self.canvas.tag_lower(SELECTED_TAG) if action['prev_state']
+                else self.canvas.tag_raise(SELECTED_TAG)),
+            'change group fill': lambda action: self.__apply_to_group(
+                action['objects'], lambda: self.canvas.itemconfigure(
+                    SELECTED_SHAPES_TAG, fill=action['new_state'])),
+            'change group color': lambda action: self.__apply_to_group(
+                action['objects'], lambda: self.__color_group(
+                    action['new_state'])),
+            'delete group': lambda action: self.__apply_to_group(
+                action['objects'], lambda: self.canvas.delete(SELECTED_TAG))
+        }
+
     def __save_canvas(self) -> None:
         """
         This function saves the canvas.
@@ -1365,24 +2662,24 @@ class CanvasApp:
         else:
             messagebox.showinfo("Save Canvas",
                                 "Select where you want to save your canvas.")
-        file_manager.save_canvas(self.canvas, self.file_path, ans)
+        file_manager.save_canvas(self.canvas, self.file_path, ans,
+                                 self.actions if self.__save_history.get()
+                                 else None)
 
     def __save_as_type(self, type_to_save_as: str) -> None:
         """
         This function saves the canvas as a .type_to_save file.
         :param type_to_save_as: The type to save the canvas as.
         """
-        # Destroy the frame
-        self.__frame.destroy()
+        # Hide the frame so it won't be in the screenshot
+        self.__frame.place_forget()
 
         file_manager.save_as_type(self.master, self.canvas,
                                   f'{type_to_save_as}')
 
-        # Create again the frame
-        self.__frame = ttk.Frame(self.master)
-        self.__create_menus()
-        self.__init_frame_buttons()
+        # Show the frame again
         self.__frame.place(relx=0, rely=0)
+        self.__buttons_config(*self.__config_buttons)
         self.master.update()
 
     def __on_exit(self) -> None:
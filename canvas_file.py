@@ -0,0 +1,168 @@
+"""
+This module reads and writes the files of canvases: a JSON list of the canvas
+itself followed by its objects. The files can be compressed with gzip, bzip2
+or xz, and are read and written an entry at a time, so the text of a whole
+canvas is never kept in memory.
+"""
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, \
+    Optional, Tuple
+import bz2
+import gzip
+import json
+import lzma
+import os
+import zlib
+
+# How much text is read at a time, in characters
+READ_SIZE: int = 1 << 16
+
+# The compressions, by name: the bytes their files start with, and the
+# function that opens their files
+COMPRESSIONS: Dict[str, Tuple[bytes, Callable[..., IO[str]]]] = {
+    "gzip": (b"\x1f\x8b", gzip.open),
+    "bzip2": (b"BZh", bz2.open),
+    "xz": (b"\xfd7zXZ\x00", lzma.open)
+}
+
+# The compression each file extension saves with
+EXTENSIONS: Dict[str, str] = {".gz": "gzip", ".bz2": "bzip2", ".xz": "xz"}
+
+# The errors reading a file that is not a canvas raises
+READ_ERRORS: Tuple[type, ...] = (json.decoder.JSONDecodeError, OSError,
+                                 EOFError, lzma.LZMAError, zlib.error,
+                                 UnicodeDecodeError)
+
+WHITESPACE: str = " \t\n\r"
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """
+    This function finds how a file is compressed, by the bytes it starts with.
+    :param path: The path of the file.
+    :return: The name of the compression, or None if it is not compressed.
+    """
+    with open(path, "rb") as file:
+        start = file.read(max(len(magic) for magic, _
+                              in COMPRESSIONS.values()))
+    for name, (magic, _) in COMPRESSIONS.items():
+        if start.startswith(magic):
+            return name
+    return None
+
+
+def compression_for(path: str) -> Optional[str]:
+    """
+    This function finds how a file should be compressed, by its extension,
+    for example canvas.json.gz is compressed with gzip.
+    :param path: The path of the file.
+    :return: The name of the compression, or None for no compression.
+    """
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def open_text(path: str, mode: str,
+              compression: Optional[str] = None) -> IO[str]:
+    """
+    This function opens a file as text, through its compression.
+    :param path: The path of the file.
+    :param mode: "r" to read or "w" to write.
+    :param compression: The name of the compression. Defaults to None,
+                        no compression.
+    :return: The opened file.
+    """
+    if compression is None:
+        return open(path, mode)
+    return COMPRESSIONS[compression][1](path, mode + "t")
+
+
+def iter_entries(file: IO[str]) -> Iterator[Any]:
+    """
+    This function parses the entries of a JSON list one at a time, reading
+    only as much of the file as the next entry needs.
+    :param file: The file of the list.
+    :return: The entries, in order.
+    :raise json.decoder.JSONDecodeError: If the file is not a JSON list.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position = "", 0
+    is_end = False
+    expected = "["  # "[", then an entry or "]", then "," or "]"
+
+    def read_more(size: int) -> bool:
+        nonlocal buffer, position, is_end
+        chunk = file.read(size)
+        is_end = not chunk
+        # Only the text that was not parsed yet is kept
+        buffer, position = buffer[position:] + chunk, 0
+        return not is_end
+
+    while True:
+        while position < len(buffer) and buffer[position] in WHITESPACE:
+            position += 1
+        if position == len(buffer):
+            if not read_more(READ_SIZE):
+                raise json.decoder.JSONDecodeError("Expecting value", buffer,
+                                                   position)
+            continue
+        char = buffer[position]
+        if expected == "[":
+            if char != "[":
+                raise json.decoder.JSONDecodeError("Expecting '['", buffer,
+                                                   position)
+            position += 1
+            expected = "entry"
+        elif expected == "," and char == ",":
+            position += 1
+            expected = "entry after comma"
+        elif char == "]" and expected != "entry after comma":
+            return
+        elif expected == ",":
+            raise json.decoder.JSONDecodeError("Expecting ',' delimiter",
+                                               buffer, position)
+        else:
+            try:
+                entry, end = decoder.raw_decode(buffer, position)
+            except json.decoder.JSONDecodeError:
+                end = None
+                if is_end:
+                    raise
+            # An entry that reaches the end of the text may go on after it,
+            # like a number, so it is parsed again with more text
+            if end is None or (end == len(buffer) and not is_end):
+                # Read at least as much as there is, so a long entry is
+                # parsed only a few times
+                read_more(max(READ_SIZE, len(buffer)))
+                continue
+            position = end
+            expected = ","
+            yield entry
+
+
+def read_canvas(path: str) -> List[Dict[str, Any]]:
+    """
+    This function reads the file of a canvas, compressed or not.
+    :param path: The path of the file.
+    :return: The canvas itself, then its objects.
+    :raise One of READ_ERRORS: If the file is not a canvas.
+    """
+    with open_text(path, "r", detect_compression(path)) as file:
+        return list(iter_entries(file))
+
+
+def write_canvas(path: str, entries: Iterable[Dict[str, Any]],
+                 compression: Optional[str] = None) -> None:
+    """
+    This function writes the file of a canvas, an entry a line, each entry
+    encoded and compressed as it is written.
+    :param path: The path of the file.
+    :param entries: The canvas itself, then its objects.
+    :param compression: The name of the compression. Defaults to None,
+                        no compression.
+    """
+    with open_text(path, "w", compression) as file:
+        file.write("[")
+        for i, entry in enumerate(entries):
+            if i:
+                file.write(",\n")
+            file.write(json.dumps(entry))
+        file.write("]\n")
@@ -0,0 +1,67 @@
+from typing import List, Sequence
+import numpy as np
+import math
+
+PIXEL_TOLERANCE: float = 1.0  # How far, in screen pixels, points may move
+MIN_DETAIL_POINTS: int = 32  # Objects with fewer points are always exact
+MIN_LEVEL_POINTS: int = 4  # No detail level has less points than this
+MAX_LEVELS: int = 16  # Enough for zooming out 65536 times
+
+
+def decimate(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    This function removes the points that are closer than tolerance to the
+    point before them, by snapping the points to a grid of size tolerance
+    and dropping the repeated grid cells. The first and last points are kept.
+    :param points: An array of shape (n, 2) of the points.
+    :param tolerance: The size of the grid.
+    :return: An array of shape (m, 2) of the kept points, m <= n.
+    """
+    if len(points) <= 2:
+        return points
+    cells = np.floor(points / tolerance)
+    keep = np.empty(len(points), dtype=bool)
+    keep[0] = True
+    keep[1:] = np.any(cells[1:] != cells[:-1], axis=1)
+    keep[-1] = True
+    return points[keep]
+
+
+def build_detail_levels(coords: Sequence[float]) -> List[List[float]]:
+    """
+    This function precomputes coarser versions of a dense shape.
+    Level i is accurate to 2 ** (i + 1) canvas units.
+    :param coords: The flat coordinates of the shape.
+    :return: The coordinates of the detail levels, finest first.
+             Shapes with few points have no detail levels.
+    """
+    points = np.asarray(coords, dtype=float).reshape(-1, 2)
+    levels: List[List[float]] = []
+    if len(points) < MIN_DETAIL_POINTS:
+        return levels
+    tolerance = 2.0
+    count = len(points)
+    while count > MIN_LEVEL_POINTS and len(levels) < MAX_LEVELS:
+        points = decimate(points, tolerance)
+        if levels and len(points) == count:
+            # Nothing was dropped, share the previous level
+            levels.append(levels[-1])
+        else:
+            levels.append(points.ravel().tolist())
+        count = len(points)
+        tolerance *= 2
+    return levels
+
+
+def level_for_zoom(zoom: float, level_count: int) -> int:
+    """
+    This function chooses the detail level to draw a shape in.
+    :param zoom: The zoom of the canvas, 1 is the actual size.
+    :param level_count: The amount of detail levels the shape has.
+    :return: The index of the detail level, or -1 for the exact shape.
+    """
+    if level_count == 0 or zoom >= PIXEL_TOLERANCE / 2:
+        return -1
+    # The coarsest level whose accuracy is still below one screen pixel
+    level = math.floor(math.log2(PIXEL_TOLERANCE / zoom)) - 1
+    return min(level, level_count - 1)
@@ -0,0 +1,115 @@
+from hit_test import CLOSED_TYPES, outline_points
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+# (The type of the object, its coordinates). Rectangles and ovals are cut
+# along their outline, like polygons.
+CutShape = Tuple[str, Sequence[float]]
+Pieces = List[List[float]]  # The flat coordinates of each piece of an object
+
+
+def circle_intervals(starts: np.ndarray, ends: np.ndarray, x: float,
+                     y: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This function finds where many line segments enter and leave a circle,
+    at once.
+    :param starts: An array of shape (n, 2) of the first end of each segment.
+    :param ends: An array of shape (n, 2) of the other end of each segment.
+    :param x: The x coordinate of the circle's center.
+    :param y: The y coordinate of the circle's center.
+    :param radius: The radius of the circle.
+    :return: Two arrays of shape (n,): where each segment enters and leaves
+             the circle, as fractions of the segment from its first end,
+             clipped to [0, 1]. A segment is inside the circle between
+             them, and not at all if they are equal.
+    """
+    direction = ends - starts
+    offset = starts - np.array([x, y], dtype=float)
+    # |offset + t * direction| = radius, solved for t
+    a = np.einsum("ij,ij->i", direction, direction)
+    b = np.einsum("ij,ij->i", offset, direction)
+    c = np.einsum("ij,ij->i", offset, offset) - radius ** 2
+    discriminant = b ** 2 - a * c
+    crosses = (a > 0) & (discriminant > 0)
+    root = np.sqrt(np.where(crosses, discriminant, 0))
+    safe_a = np.where(crosses, a, 1)
+    enter = np.clip((-b - root) / safe_a, 0, 1)
+    leave = np.clip((-b + root) / safe_a, 0, 1)
+    # Segments of no length are inside if their point is
+    point_inside = (a == 0) & (c < 0)
+    enter = np.where(crosses, enter, 0)
+    leave = np.where(crosses, leave, np.where(point_inside, 1, 0))
+    return enter, leave
+
+
+def cut_shapes(shapes: Sequence[CutShape], x: float, y: float,
+               radius: float) -> List[Optional[Pieces]]:
+    """
+    This function erases a circle out of the lines and outlines of objects,
+    splitting them into the pieces outside of it. All the segments of all
+    the objects are tested at once, only the objects the circle touches
+    are split.
+    :param shapes: The objects to cut, usually the ones whose bounding box
+                   is near the circle. Closed outlines are cut open.
+    :param x: The x coordinate of the circle's center.
+    :param y: The y coordinate of the circle's center.
+    :param radius: The radius of the circle.
+    :return: For each object, None if the circle does not touch it,
+             or else the pieces left of it, an empty list if none is left.
+    """
+    outlines = [outline_points(obj_type, coords) if len(coords) >= 2
+                else np.empty((0, 2)) for obj_type, coords in shapes]
+    result: List[Optional[Pieces]] = [None] * len(shapes)
+    counts = [max(len(points) - 1, 0) for points in outlines]
+    if not any(counts):
+        return result
+    starts = np.concatenate([points[:-1] for points in outlines])
+    ends = np.concatenate([points[1:] for points in outlines])
+    enter, leave = circle_intervals(starts, ends, x, y, radius)
+    first = 0
+    for i, count in enumerate(counts):
+        last = first + count
+        if count and np.any(leave[first:last] > enter[first:last]):
+            result[i] = split(outlines[i], enter[first:last],
+                              leave[first:last], shapes[i][0] in CLOSED_TYPES)
+        first = last
+    return result
+
+
+def split(points: np.ndarray, enter: np.ndarray, leave: np.ndarray,
+          is_closed: bool) -> Pieces:
+    """
+    This function splits a polyline into the pieces outside a circle.
+    :param points: An array of shape (n, 2) of the polyline's points,
+                   closed polylines end with their first point again.
+    :param enter: Where each segment enters the circle, see circle_intervals.
+    :param leave: Where each segment leaves the circle.
+    :param is_closed: Whether the polyline is closed.
+    :return: The flat coordinates of each piece.
+    """
+    pieces: List[List[np.ndarray]] = []
+    current: List[np.ndarray] = []
+    for i in range(len(points) - 1):
+        start, end = points[i], points[i + 1]
+        if leave[i] <= enter[i]:  # The segment is outside the circle
+            if not current:
+                current = [start]
+            current.append(end)
+            continue
+        if enter[i] > 0:
+            if not current:
+                current = [start]
+            current.append(start + enter[i] * (end - start))
+        if len(current) > 1:
+            pieces.append(current)
+        current = []
+        if leave[i] < 1:
+            current = [start + leave[i] * (end - start), end]
+    if len(current) > 1:
+        if is_closed and pieces and np.array_equal(pieces[0][0], points[0]):
+            # The first and the last pieces meet where the outline closes
+            pieces[0] = current + pieces[0][1:]
+        else:
+            pieces.append(current)
+    return [np.ravel(piece).tolist() for piece in pieces
+            if np.any(np.ptp(np.array(piece), axis=0) > 0)]
@@ -1,12 +1,26 @@
 from PIL import ImageGrab
 from tkinter import filedialog, messagebox
-from typing import List, Dict, Any, Union, Callable
+from typing import List, Dict, Any, Union, Optional, Tuple
+from virtual_canvas import VirtualCanvas, Layer
+from history import History
+from styles import pack_styles, unpack_styles, is_valid_style_id, STYLE_KEY
+from canvas_file import read_canvas, write_canvas, compression_for, \
+    READ_ERRORS
+from contextlib import nullcontext
+from collections import OrderedDict
 import tkinter as tk
+import optimizer
 import time
-import json
 import canvasvg
 import os
 
+# The files canvases are saved in, compressed by their extension,
+# see canvas_file
+CANVAS_FILETYPES: List[Tuple[str, str]] = [
+    ("JSON files", "*.json"),
+    ("Compressed JSON files", "*.json.gz *.json.xz *.json.bz2")
+]
+
 REQUIRED_KEYS: Dict[str, List[str]] = {
         "line": ["type", "coords", "fill", "width"],
         "rectangle": ["type", "coords", "fill", "width", "outline"],
@@ -48,11 +62,15 @@ def get_item_info(canvas: tk.Canvas, item: Union[str, int]) -> Dict[str, Any]:
             "fill": canvas.itemcget(item, "fill"),
             "font": canvas.itemcget(item, "font"),
         }
+    if obj_info and isinstance(canvas, VirtualCanvas):
+        obj_info["layer"] = canvas.layer_of(item)
+        obj_info["id"] = item
     return obj_info
 
 
 def save_canvas(canvas: tk.Canvas, file_path: List[str] = '',
-                is_change: bool = False) -> None:
+                is_change: bool = False,
+                actions: Optional[History] = None) -> None:
     """
     This function saves the canvas as a .JSON file
     to continue drawing on it later.
@@ -61,12 +79,15 @@ def save_canvas(canvas: tk.Canvas, file_path: List[str] = '',
                       Defaults to ''.
     :param is_change: Whether to change to canvas' location or not.
                       Defaults to False.
+    :param actions: The history of the canvas, to save compressed with it
+                    so undo keeps working once it is loaded again.
+                    Defaults to None, which saves no history.
     """
     path = file_path[0]
     if path == '' or is_change:  # If the canvas hos not been saved yet
         # Prompt the user to choose the file to save the canvas
         path = filedialog.asksaveasfilename(defaultextension=".json",
-                                            filetypes=[("JSON files", "*.json")],
+                                            filetypes=CANVAS_FILETYPES,
                                             initialfile="canvas")
     if path:  # If the user has chosen a location
         if is_change:
@@ -74,17 +95,29 @@ def save_canvas(canvas: tk.Canvas, file_path: List[str] = '',
             os.remove(file_path[0])
         # Gather information about all drawn objects on the canvas
         objects: List[Dict[str, Any]] = [{"mode": canvas.cget("bg")}]
-        for item in canvas.find_all():
-            obj_info = get_item_info(canvas, item)
-            objects.append(obj_info)
+        if isinstance(canvas, VirtualCanvas):
+            objects[0]["layers"] = [layer.to_dict()
+                                    for layer in canvas.layers()]
+        if actions:
+            objects[0]["history"] = [list(chunk)
+                                     for chunk in actions.encoded()]
+            if isinstance(canvas, VirtualCanvas):
+                # The history may refer to deleted objects with higher ids
+                # than any saved object
+                objects[0]["next_id"] = canvas.next_id()
+        # The styles are saved once, and the objects refer to them by id
+        styles, packed = pack_styles(get_item_info(canvas, item)
+                                     for item in canvas.find_all())
+        objects[0]["styles"] = styles
+        objects.extend(packed)
 
-        # Write the gathered information to the .JSON file
-        with open(path, "w") as file:
-            json.dump(objects, file)
-            if path == '':
-                messagebox.showinfo("Success!",
-                                    "Your canvas has been saved to:"
-                                    f"\n{path}\nBe sure to remember its location!")
+        # Write the gathered information to the .JSON file, an object at
+        # a time, compressed if its extension is of a compression
+        write_canvas(path, objects, compression_for(path))
+        if path == '':
+            messagebox.showinfo("Success!",
+                                "Your canvas has been saved to:"
+                                f"\n{path}\nBe sure to remember its location!")
         file_path[0] = path
 
 
@@ -115,11 +148,43 @@ def is_parsed_correctly(objects: List[Dict[str, Any]]) -> bool:
             return False
     except KeyError:
         return False
+    # Canvases saved before layers existed have no layers
+    layers = mode.get('layers', [{"name": "Layer 1"}])
+    if not isinstance(layers, list) or not layers:
+        return False
+    for layer in layers:
+        if not isinstance(layer, dict) or \
+                not isinstance(layer.get("name"), str):
+            return False
+    # Layers are found by their name, so every name must be unique
+    if len({layer["name"] for layer in layers}) != len(layers):
+        return False
+    # The saved history is chunks of [the amount of actions, the actions]
+    history = mode.get('history', [])
+    if not isinstance(history, list):
+        return False
+    for chunk in history:
+        if not isinstance(chunk, list) or len(chunk) != 2 or \
+                not isinstance(chunk[0], int) or \
+                not isinstance(chunk[1], str):
+            return False
+    next_id = mode.get('next_id', 1)
+    if not isinstance(next_id, int) or isinstance(next_id, bool):
+        return False
+    # Canvases saved before the style table keep the styles in the objects
+    styles = mode.get('styles', [])
+    if not isinstance(styles, list) or \
+            not all(isinstance(style, dict) for style in styles):
+        return False
     for obj in objects[1:]:
         try:
             obj_type = obj["type"]
         except KeyError:
             return False
+        if STYLE_KEY in obj:
+            if not is_valid_style_id(obj[STYLE_KEY], styles):
+                return False
+            obj = unpack_styles(styles, [obj])[0]
         if obj_type is None or obj_type not in REQUIRED_KEYS:
             return False
         if not check_required_keys(obj, REQUIRED_KEYS[obj_type]):
@@ -130,89 +195,90 @@ def is_parsed_correctly(objects: List[Dict[str, Any]]) -> bool:
 
 
 def recreate_object(canvas: tk.Canvas, actions_list: List[Dict[str, Any]],
-                    obj_info: Dict[str, Any],
-                    text_right_click_callback: Callable[[tk.Event], None]) -> None:
+                    obj_info: Dict[str, Any]) -> None:
     """
     This function recreates an object.
     :param canvas: The canvas the object belongs to.
     :param actions_list: A list of actions to add all the actions to.
     :param obj_info: The object's information.
-    :param text_right_click_callback: A callback to bind text objects to.
     """
-    new_obj_info = obj_info
     obj_type = obj_info["type"]
     action: Dict[str, Any] = {
         'type': 'drawing'
     }
-    if obj_type == "line":
-        obj = canvas.create_line(obj_info["coords"], fill=obj_info.get("fill", ""),
-                                 width=obj_info.get("width", 1))
-        new_obj_info['object'] = obj
-        action['object'] = obj
-        action['info'] = get_item_info(canvas, obj)
-    elif obj_type == "rectangle":
-        obj = canvas.create_rectangle(obj_info["coords"], fill=obj_info.get("fill", ""),
-                                      outline=obj_info.get("outline", ""),
-                                      width=obj_info.get("width", 1))
-        action['object'] = obj
-        action['info'] = get_item_info(canvas, obj)
-    elif obj_type == "oval":
-        obj = canvas.create_oval(obj_info["coords"], fill=obj_info.get("fill", ""),
-                                 outline=obj_info.get("outline", ""),
-                                 width=obj_info.get("width", 1))
-        new_obj_info['object'] = obj
-        action['object'] = obj
-        action['info'] = get_item_info(canvas, obj)
-    elif obj_type == "polygon":
-        obj = canvas.create_polygon(obj_info["coords"], fill=obj_info.get("fill", ""),
-                                    outline=obj_info.get("outline", ""),
-                                    width=obj_info.get("width", 1))
-        new_obj_info['object'] = obj
-        action['object'] = obj
-        action['info'] = get_item_info(canvas, obj)
-    elif obj_type == "text":
-        text_obj = canvas.create_text(obj_info["coords"], text=obj_info["text"],
-                                      fill=obj_info.get("fill", ""),
-                                      font=obj_info.get("font", ""))
-        # Bind right-click event for text objects
-        canvas.tag_bind(text_obj, "<Button-3>",
-                        lambda event=obj_info["coords"]:
-                        text_right_click_callback(event))
-        new_obj_info['object'] = text_obj
-        action['object'] = text_obj
-        action['info'] = get_item_info(canvas, text_obj)
+    # Put the object back in its layer, with its id
+    layer = obj_info.get("layer")
+    is_virtual = isinstance(canvas, VirtualCanvas)
+    with canvas.drawing_on(layer) if layer is not None and is_virtual \
+            else nullcontext(), \
+            canvas.recreating(obj_info.get("id")) if is_virtual \
+            else nullcontext():
+        if obj_type == "line":
+            obj = canvas.create_line(obj_info["coords"], fill=obj_info.get("fill", ""),
+                                     width=obj_info.get("width", 1))
+            action['object'] = obj
+            action['info'] = get_item_info(canvas, obj)
+        elif obj_type == "rectangle":
+            obj = canvas.create_rectangle(obj_info["coords"], fill=obj_info.get("fill", ""),
+                                          outline=obj_info.get("outline", ""),
+                                          width=obj_info.get("width", 1))
+            action['object'] = obj
+            action['info'] = get_item_info(canvas, obj)
+        elif obj_type == "oval":
+            obj = canvas.create_oval(obj_info["coords"], fill=obj_info.get("fill", ""),
+                                     outline=obj_info.get("outline", ""),
+                                     width=obj_info.get("width", 1))
+            action['object'] = obj
+            action['info'] = get_item_info(canvas, obj)
+        elif obj_type == "polygon":
+            obj = canvas.create_polygon(obj_info["coords"], fill=obj_info.get("fill", ""),
+                                        outline=obj_info.get("outline", ""),
+                                        width=obj_info.get("width", 1))
+            action['object'] = obj
+            action['info'] = get_item_info(canvas, obj)
+        elif obj_type == "text":
+            text_obj = canvas.create_text(obj_info["coords"], text=obj_info["text"],
+                                          fill=obj_info.get("fill", ""),
+                                          font=obj_info.get("font", ""))
+            action['object'] = text_obj
+            action['info'] = get_item_info(canvas, text_obj)
     actions_list.append(action)
 
 
 def load_canvas(canvas: tk.Canvas, actions_list: List[Dict[str, Any]],
-                text_right_click_callback: Callable[[tk.Event], None],
-                file_path: List[str]) -> None:
+                file_path: List[str], is_optimize: bool = False) -> None:
     """
     This function loads the canvas from a .JSON file.
     :param canvas: The canvas to load the .json file to.
     :param actions_list: A list of actions to add all the actions to.
-    :param text_right_click_callback: A function to bind mouse button 3's clicks
-                                      to in order for the text context menu to
-                                      be displayed for loaded text objects.
     :param file_path: The path of the file will be saved here.
+    :param is_optimize: Whether to join the pencil strokes of the canvas
+                        into polylines and leave out the objects that are
+                        never seen while loading it, see optimizer.
+                        Defaults to False.
+
+    The saved history of the canvas is restored if it is loaded into an
+    empty canvas and is not optimized, otherwise every object is added
+    to actions_list as drawn.
     """
     # Prompt the user to choose the file to load the canvas from
-    path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+    path = filedialog.askopenfilename(filetypes=[
+        ("JSON files", " ".join(pattern for _, pattern in CANVAS_FILETYPES))])
     if path:
-        # Read the .JSON file and load the drawn objects
-        with open(path, "r") as file:
-            try:
-                objects: List[Dict[str, Any]] = json.load(file)
-            except json.decoder.JSONDecodeError as e:
-                messagebox.showerror("ERROR!",
-                                     "Your.JSON file is not parsed correctly!"
-                                     f"\n{e}"
-                                     "\nIt may not have been created by this software!"
-                                     "\nThe software will now create an empty canvas."
-                                     " If you wish to load an existing canvas, "
-                                     "restart the program or import a canvas."
-                                     )
-                return
+        # Read the .JSON file and load the drawn objects, compressed files
+        # are found by the bytes they start with
+        try:
+            objects: List[Dict[str, Any]] = read_canvas(path)
+        except READ_ERRORS as e:
+            messagebox.showerror("ERROR!",
+                                 "Your.JSON file is not parsed correctly!"
+                                 f"\n{e}"
+                                 "\nIt may not have been created by this software!"
+                                 "\nThe software will now create an empty canvas."
+                                 " If you wish to load an existing canvas, "
+                                 "restart the program or import a canvas."
+                                 )
+            return
         if not is_parsed_correctly(objects):
             messagebox.showerror("ERROR!",
                                  "Your.JSON file is not parsed correctly!"
@@ -222,10 +288,52 @@ def load_canvas(canvas: tk.Canvas, actions_list: List[Dict[str, Any]],
                                  "restart the program or import a canvas.")
             return
         canvas.config(bg=objects[0]['mode'])
-        objects = objects[1:]
-        # Recreate the drawn objects on the canvas
-        for obj in objects:
-            recreate_object(canvas, actions_list, obj, text_right_click_callback)
+        if 'layers' in objects[0] and isinstance(canvas, VirtualCanvas):
+            layers = [Layer(layer["name"], layer.get("visible", True),
+                            layer.get("locked", False))
+                      for layer in objects[0]['layers']]
+            if canvas.object_count() == 0:
+                canvas.set_layers(layers)
+            else:
+                # Importing into a drawing keeps its layers
+                names = [layer.name for layer in canvas.layers()]
+                for layer in layers:
+                    if layer.name not in names:
+                        canvas.add_layer(layer.name)
+        header = objects[0]
+        history = header.get('history', [])
+        objects = unpack_styles(objects[0].get('styles', []), objects[1:])
+        if is_optimize:
+            objects = optimizer.optimize(objects, is_cull=True)
+        # The saved ids are kept only in a new canvas, in a drawing they may
+        # be the ids of deleted objects that its history refers to
+        keep_ids = not actions_list and not canvas.find_all()
+        # The saved history leads to the saved objects, with their ids
+        is_restore = bool(history) and keep_ids and not is_optimize and \
+            isinstance(actions_list, History) and \
+            all("id" in obj for obj in objects)
+        document = OrderedDict((obj["id"], dict(obj)) for obj in objects) \
+            if is_restore else None
+        if document is not None:
+            try:
+                actions_list.restore(history, document)
+            except ValueError as e:
+                messagebox.showwarning("WARNING!",
+                                       "The history of the canvas could not "
+                                       f"be loaded!\n{e}\nThe drawing is "
+                                       "loaded without it.")
+                is_restore, document = False, None
+        # Recreate the drawn objects on the canvas,
+        # their Tk items are all created by one Tcl call
+        with canvas.batch() if isinstance(canvas, VirtualCanvas) \
+                else nullcontext():
+            for obj in objects:
+                if not keep_ids:
+                    obj.pop("id", None)
+                recreate_object(canvas, [] if is_restore else actions_list,
+                                obj)
+        if document is not None and isinstance(canvas, VirtualCanvas):
+            canvas.reserve_ids(header.get('next_id', 1))
         file_path[0] = path
 
 
@@ -287,7 +395,7 @@ def save_as_type(master: tk.Tk, canvas: tk.Canvas, type_to_save_as: str) -> None
                             f"{file_path}\nAs a .{type_to_save_as.upper()} file")
 
 
-def save_as_svg(canvas: tk.Canvas) -> None:
+def save_as_svg(canvas: VirtualCanvas) -> None:
     """
     This function saves the canvas as a .svg file.
     :param canvas: The canvas to save.
@@ -300,8 +408,9 @@ def save_as_svg(canvas: tk.Canvas) -> None:
              "*.svg")],
         initialfile="canvas")
     if file_path:
-        # Save the file
-        canvasvg.saveall(file_path, canvas)
+        # Save the file, canvasvg reads the Tk items of all the objects
+        with canvas.fully_materialized():
+            canvasvg.saveall(file_path, canvas)
         messagebox.showinfo("Success!",
                             "Your canvas has been exported to:"
                             f"\n{file_path}\nAs a .SVG file")
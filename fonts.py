@@ -0,0 +1,213 @@
+from bisect import bisect_left
+from typing import List, Dict, Tuple, Optional, Any
+import tkinter as tk
+import tkinter.font as tkfont
+import json
+import time
+import sys
+import os
+
+# Where the discovered fonts are cached between runs of the program
+CACHE_PATH: str = os.path.join(os.path.expanduser("~"), ".cache", "paintor",
+                               "fonts.json")
+CACHE_MAX_AGE: int = 30 * 24 * 60 * 60  # A month, in seconds
+
+# The directories fonts are installed to, on all supported systems.
+# Installing or removing a font changes their modification time.
+FONT_DIRS: List[str] = [
+    "/usr/share/fonts", "/usr/local/share/fonts",
+    os.path.join(os.path.expanduser("~"), ".fonts"),
+    os.path.join(os.path.expanduser("~"), ".local", "share", "fonts"),
+    "/Library/Fonts", "/System/Library/Fonts",
+    os.path.join(os.path.expanduser("~"), "Library", "Fonts"),
+    os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts")
+]
+
+# The fonts of this run of the program, discovered once
+_families: Optional[List[str]] = None
+# Font objects used to measure text, by (family, size)
+_font_objects: Dict[Tuple[str, int], tkfont.Font] = {}
+
+
+def fonts_signature(root: tk.Misc) -> Dict[str, Any]:
+    """
+    This function describes the installed fonts without listing them,
+    so a cached list of fonts can be checked for being outdated.
+    :param root: A widget of the Tk interpreter that lists the fonts.
+    :return: A dictionary describing the installed fonts.
+    """
+    dirs: Dict[str, float] = {}
+    for font_dir in FONT_DIRS:
+        if not os.path.isdir(font_dir):
+            continue
+        # Fonts are usually installed one directory deep
+        mtime = os.path.getmtime(font_dir)
+        try:
+            with os.scandir(font_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        mtime = max(mtime, entry.stat().st_mtime)
+        except OSError:
+            pass
+        dirs[font_dir] = mtime
+    return {
+        "tk": str(root.tk.call("info", "patchlevel")),
+        "platform": sys.platform,
+        "dirs": dirs
+    }
+
+
+def load_cached_fonts(signature: Dict[str, Any],
+                      path: str = CACHE_PATH) -> Optional[List[str]]:
+    """
+    This function reads the fonts cached in path.
+    :param signature: The signature of the currently installed fonts.
+    :param path: The path of the cache file. Defaults to CACHE_PATH.
+    :return: The cached fonts, or None if the cache is missing or outdated.
+    """
+    try:
+        with open(path, "r") as file:
+            cache: Dict[str, Any] = json.load(file)
+    except (OSError, json.decoder.JSONDecodeError):
+        return None
+    if not isinstance(cache, dict) or cache.get("signature") != signature:
+        return None
+    if time.time() - cache.get("time", 0) > CACHE_MAX_AGE:
+        return None
+    families = cache.get("families")
+    return families if isinstance(families, list) else None
+
+
+def save_cached_fonts(families: List[str], signature: Dict[str, Any],
+                      path: str = CACHE_PATH) -> None:
+    """
+    This function caches the fonts in path.
+    Failing to write the cache is not an error, the fonts are just
+    discovered again the next time.
+    :param families: The fonts to cache.
+    :param signature: The signature of the currently installed fonts.
+    :param path: The path of the cache file. Defaults to CACHE_PATH.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            json.dump({"signature": signature, "time": time.time(),
+                       "families": families}, file)
+    except OSError:
+        pass
+
+
+def available_fonts(root: tk.Misc) -> List[str]:
+    """
+    This function returns the fonts that are installed on this computer.
+    The fonts are discovered once per run, and cached on the disk between runs.
+    :param root: A widget of the Tk interpreter that lists the fonts.
+    :return: The sorted names of the installed fonts.
+    """
+    global _families
+    if _families is None:
+        signature = fonts_signature(root)
+        families = load_cached_fonts(signature)
+        if families is None:
+            # '@' fonts are the vertical variants of fonts on Windows
+            families = sorted({family for family in tkfont.families(root)
+                               if family and not family.startswith('@')},
+                              key=str.lower)
+            save_cached_fonts(families, signature)
+        _families = families
+    return _families
+
+
+def get_font(root: tk.Misc, family: str, size: int) -> tkfont.Font:
+    """
+    This function returns a Font object, creating it only the first time
+    it is asked for.
+    :param root: A widget of the Tk interpreter that owns the font.
+    :param family: The family of the font.
+    :param size: The size of the font.
+    :return: The Font object of family in size.
+    """
+    key = (family, int(size))
+    font = _font_objects.get(key)
+    if font is None:
+        font = tkfont.Font(root, family=family, size=int(size))
+        _font_objects[key] = font
+    return font
+
+
+def split_font(root: tk.Misc, font: str) -> List[str]:
+    """
+    This function splits a font description as returned by
+    tkinter.Canvas.itemcget, for example '{DejaVu Sans} 12',
+    without breaking the family names that contain spaces.
+    :param root: A widget of the Tk interpreter that owns the font.
+    :param font: The font description to split.
+    :return: A list of the font's family, size and styles.
+    """
+    return list(root.tk.splitlist(font))
+
+
+def measure_text(root: tk.Misc, font: str, text: str) -> Tuple[int, int]:
+    """
+    This function measures the size text is drawn in.
+    :param root: A widget of the Tk interpreter that owns the font.
+    :param font: The font description of the text, as returned by
+                 tkinter.Canvas.itemcget.
+    :param text: The text to measure.
+    :return: The width and the height of the text, in pixels.
+    """
+    parts = split_font(root, font)
+    family = parts[0] if parts else "TkDefaultFont"
+    try:
+        size = int(parts[1]) if len(parts) > 1 else 12
+    except ValueError:
+        size = 12  # The second part is a style, not a size
+    font_obj = get_font(root, family, size)
+    lines = text.split('\n')
+    width = max(font_obj.measure(line) for line in lines)
+    return width, font_obj.metrics("linespace") * len(lines)
+
+
+class FontIndex:
+    """
+    Class that represents a type-ahead search index over font names.
+    Every word of a name is indexed, so typing 'sans' finds 'DejaVu Sans'.
+
+    Attributes:
+        families (List[str]): The indexed font names, in their original order.
+    """
+
+    def __init__(self, families: List[str]) -> None:
+        """
+        Initialize the index.
+        :param families: The font names to index.
+        """
+        self.families: List[str] = families
+        keys: List[Tuple[str, int]] = []
+        for position, family in enumerate(families):
+            lower = family.lower()
+            keys.append((lower, position))
+            # Index the name from the start of every other word too
+            for i in range(1, len(lower)):
+                if lower[i - 1] in " -_" and lower[i] not in " -_":
+                    keys.append((lower[i:], position))
+        keys.sort()
+        self.__keys: List[str] = [key for key, _ in keys]
+        self.__positions: List[int] = [position for _, position in keys]
+
+    def search(self, query: str) -> List[str]:
+        """
+        This function finds the font names that have a word starting with query.
+        :param query: The text the user has typed.
+        :return: The matching font names, in their original order.
+        """
+        query = query.strip().lower()
+        if not query:
+            return self.families
+        start = bisect_left(self.__keys, query)
+        matches = set()
+        for i in range(start, len(self.__keys)):
+            if not self.__keys[i].startswith(query):
+                break
+            matches.add(self.__positions[i])
+        return [self.families[position] for position in sorted(matches)]
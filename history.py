@@ -0,0 +1,736 @@
+from records import compact
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import List, Dict, Any, Iterable, SupportsIndex, Optional, \
+    Tuple, Sequence
+import typing
+import base64
+import binascii
+import json
+import zlib
+
+# The fewest actions between two checkpoints of the document. Checkpoints
+# of bigger documents are further apart, as many actions as the last
+# checkpoint had objects, so they take about a pointer per action.
+CHECKPOINT_INTERVAL: int = 256
+
+# The information of each object by id, bottom first
+Document = typing.OrderedDict[int, Dict[str, Any]]
+# The ids and the information of the objects of a document, bottom first
+Checkpoint = Tuple[Tuple[int, ...], Tuple[Dict[str, Any], ...]]
+
+# The most actions of a saved history encoded together, all of them are
+# decoded once undo reaches the first
+HISTORY_CHUNK_SIZE: int = 1024
+# (The amount of actions, the actions as encoded by encode_actions)
+Chunk = Tuple[int, str]
+
+
+def encode_actions(actions: Sequence[Dict[str, Any]]) -> str:
+    """
+    This function encodes actions compactly, to be saved in a .JSON file.
+    :param actions: The actions, as kept in CanvasApp.actions.
+    :return: The actions as compact JSON, compressed and in base64.
+    """
+    # Records are written as the dictionaries they stand for
+    data = json.dumps(list(actions), separators=(",", ":"),
+                      default=dict).encode()
+    return base64.b64encode(zlib.compress(data, 9)).decode("ascii")
+
+
+def decode_actions(text: str) -> List[Dict[str, Any]]:
+    """
+    This function decodes actions encoded by encode_actions.
+    Tuples in the actions, like the states of transforms, become lists.
+    :param text: The encoded actions.
+    :return: The actions, as records where they can be, see records.compact.
+    """
+    return compact(json.loads(zlib.decompress(base64.b64decode(text))))
+
+# How each type of action is shown in the history of an object
+DESCRIPTIONS: Dict[str, str] = {
+    'drawing': "Drawn",
+    'moving': "Moved",
+    'moving group': "Moved",
+    'change outline color': "Outline color changed",
+    'change group color': "Color changed",
+    'change fill': "Fill changed",
+    'change group fill': "Fill changed",
+    'change width': "Width changed",
+    'change layer': "Moved to another layer",
+    'changing order': "Order changed",
+    'changing group order': "Order changed",
+    'change text': "Text changed",
+    'change text size': "Text size changed",
+    'change object font': "Font changed",
+    'transform': "Transformed",
+    'revert object': "Reverted",
+    'optimize': "Optimized",
+    'erase': "Erased",
+    'delete object': "Deleted",
+    'delete group': "Deleted",
+    'delete all': "Deleted"
+}
+
+
+def touched_objects(action: Dict[str, Any]) -> List[int]:
+    """
+    This function finds the objects an action has changed.
+    :param action: The action, as kept in CanvasApp.actions.
+    :return: The ids of the objects.
+    """
+    if 'object' in action:
+        return [action['object']]
+    if 'objects' in action:
+        return list(action['objects'])
+    if action.get('type') == 'delete all':
+        return [entry['info']['id'] for entry in action['actions']
+                if 'id' in entry['info']]
+    if action.get('type') == 'optimize':
+        return [info['id'] for info in action['prev_infos'] if 'id' in info]
+    if action.get('type') == 'erase':
+        # The erased objects, and the pieces left of them
+        return [info['id'] for info in action['prev_infos'] if 'id' in info] + \
+            [piece['id'] for pieces in action['new_infos'] for piece in pieces
+             if 'id' in piece]
+    return []
+
+
+def describe(action: Dict[str, Any]) -> str:
+    """
+    This function describes an action in a few words.
+    :param action: The action, as kept in CanvasApp.actions.
+    :return: The description of the action.
+    """
+    description = DESCRIPTIONS.get(action.get('type', ''), "Changed")
+    for key in ['new_state', 'new_text']:
+        value = action.get(key)
+        if isinstance(value, str) and value:
+            return f"{description} to {value}"
+    return description
+
+
+def undo_on_info(action: Dict[str, Any], item: int,
+                 info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    This function calculates what an object was like before an action.
+    Only the information get_item_info returns is changed, so the stacking
+    order is left as it is.
+    :param action: The action, as kept in CanvasApp.actions.
+    :param item: The id of the object.
+    :param info: The object's information after the action,
+                 as returned by file_manager.get_item_info.
+    :return: The object's information before the action.
+    """
+    info = dict(info)
+    action_type = action['type']
+    if action_type == 'moving':
+        info['coords'] = list(action['prev_state'])
+    elif action_type == 'moving group':
+        info['coords'] = [value - (action['dy'] if i % 2 else action['dx'])
+                          for i, value in enumerate(info['coords'])]
+    elif action_type == 'change outline color':
+        info['outline'] = action['prev_state']
+    elif action_type in ['change fill', 'change width', 'change layer']:
+        # The changed option is the last word of the type
+        info[action_type.split()[-1]] = action['prev_state']
+    elif action_type == 'change text':
+        info['text'] = action['prev_text']
+    elif action_type in ['change text size', 'change object font']:
+        info['font'] = action['prev_font']
+    elif action_type == 'revert object':
+        info = dict(action['prev_info'])
+    elif action_type in ['optimize', 'erase']:
+        for prev_info in action['prev_infos']:
+            if prev_info.get('id') == item:
+                info = dict(prev_info)
+                break
+    elif action_type in ['transform', 'change group fill',
+                         'change group color']:
+        prev_state = action['prev_states'][action['objects'].index(item)]
+        if action_type == 'transform':
+            info['type'], info['coords'] = prev_state[0], list(prev_state[1])
+        elif action_type == 'change group fill' or \
+                info['type'] in ['line', 'text']:
+            info['fill'] = prev_state
+        else:
+            info['outline'] = prev_state
+    return info
+
+
+def state_after(history: List[Dict[str, Any]], positions: List[int],
+                position: int, item: int,
+                info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    This function calculates what an object was like right after an action,
+    by undoing the object's later actions on its current information.
+    :param history: The done actions.
+    :param positions: The positions of the actions that changed the object,
+                      as returned by History.positions_of.
+    :param position: The position of the action.
+    :param item: The id of the object.
+    :param info: The object's current information,
+                 as returned by file_manager.get_item_info.
+    :return: The object's information right after the action.
+    """
+    for later in reversed(positions):
+        if later <= position:
+            break
+        info = undo_on_info(history[later], item, info)
+    return info
+
+
+def redo_on_document(action: Dict[str, Any], document: Document) -> None:
+    """
+    This function does an action on the information of the objects, the way
+    CanvasApp does it on the canvas. The information of a changed object is
+    replaced rather than changed, so documents share the information of the
+    objects they have in common.
+    :param action: The action, as kept in CanvasApp.actions.
+    :param document: The information of each object by id, bottom first.
+    """
+    def change(item: int, **options: Any) -> None:
+        if item in document:
+            document[item] = dict(document[item], **options)
+
+    action_type = action['type']
+    item = action.get('object')
+    if action_type == 'drawing':
+        document.pop(item, None)
+        document[item] = action['info']
+    elif action_type == 'moving':
+        change(item, coords=list(action['new_state']))
+    elif action_type == 'change outline color':
+        change(item, outline=action['new_state'])
+    elif action_type in ['change fill', 'change width', 'change layer']:
+        # The changed option is the last word of the type
+        change(item, **{action_type.split()[-1]: action['new_state']})
+    elif action_type == 'change text':
+        change(item, text=action['new_text'])
+    elif action_type in ['change text size', 'change object font']:
+        change(item, font=action['new_font'])
+    elif action_type == 'revert object':
+        if item in document:
+            document[item] = action['new_info']
+    elif action_type == 'changing order':
+        # The previous state is True if the object was sent to the back
+        if item in document:
+            document.move_to_end(item, last=not action['prev_state'])
+    elif action_type == 'changing group order':
+        # The objects keep their order among themselves
+        for obj in (reversed(action['objects']) if action['prev_state']
+                    else action['objects']):
+            if obj in document:
+                document.move_to_end(obj, last=not action['prev_state'])
+    elif action_type == 'delete object':
+        document.pop(item, None)
+    elif action_type == 'delete group':
+        for obj in action['objects']:
+            document.pop(obj, None)
+    elif action_type in ['delete all', 'optimize']:
+        document.clear()
+        for info in action.get('new_infos', []):
+            if 'id' in info:
+                document[info['id']] = info
+    elif action_type == 'erase':
+        # The pieces take the place of the object they were cut from
+        pieces_of = {info['id']: pieces for info, pieces
+                     in zip(action['prev_infos'], action['new_infos'])
+                     if 'id' in info}
+        objects = list(document.items())
+        document.clear()
+        for obj, info in objects:
+            if obj not in pieces_of:
+                document[obj] = info
+                continue
+            for piece in pieces_of[obj]:
+                if 'id' in piece:
+                    document[piece['id']] = piece
+    elif action_type == 'transform':
+        for obj, (obj_type, coords) in zip(action['objects'],
+                                           action['new_states']):
+            change(obj, type=obj_type, coords=list(coords))
+    elif action_type == 'moving group':
+        for obj in action['objects']:
+            if obj in document:
+                change(obj, coords=[
+                    value + (action['dy'] if i % 2 else action['dx'])
+                    for i, value in enumerate(document[obj]['coords'])])
+    elif action_type == 'change group fill':
+        for obj in action['objects']:
+            change(obj, fill=action['new_state'])
+    elif action_type == 'change group color':
+        for obj in action['objects']:
+            if obj in document:
+                if document[obj]['type'] in ['line', 'text']:
+                    change(obj, fill=action['new_state'])
+                else:
+                    change(obj, outline=action['new_state'])
+
+
+class HistoryNode:
+    """
+    Class that represents a point of the undo tree: the document after the
+    actions on the path from the root of the tree to the node. The branches
+    of the tree share the nodes of the actions they have in common.
+
+    Attributes:
+        action (Optional[Dict[str, Any]]): The action that leads to the node
+                                           from its parent, None for the root.
+        parent (Optional[HistoryNode]): The node before the action,
+                                        None for the root.
+        children (List[HistoryNode]): The nodes of the actions done right
+                                      after the node, the one redo goes to
+                                      last.
+        depth (int): How many actions lead to the node.
+        number (int): The order the nodes of the tree were made in.
+        checkpoint (Optional[Checkpoint]): The document at the node,
+                                           if the node is checkpointed.
+        base (HistoryNode): The nearest checkpointed node on the path to
+                            the node, the node itself if it is checkpointed.
+    """
+    __slots__ = ("action", "parent", "children", "depth", "number",
+                 "checkpoint", "base")
+
+    def __init__(self, action: Optional[Dict[str, Any]] = None,
+                 parent: Optional['HistoryNode'] = None,
+                 number: int = 0) -> None:
+        """
+        Initialize a node, the root of a tree if it has no parent.
+        :param action: The action that leads to the node from its parent.
+                       Defaults to None.
+        :param parent: The node before the action. Defaults to None.
+        :param number: The order of the node in its tree. Defaults to 0.
+        """
+        self.action: Optional[Dict[str, Any]] = action
+        self.parent: Optional[HistoryNode] = parent
+        self.children: List[HistoryNode] = []
+        self.depth: int = 0 if parent is None else parent.depth + 1
+        self.number: int = number
+        self.checkpoint: Optional[Checkpoint] = None
+        self.base: HistoryNode = self if parent is None else parent.base
+
+
+class History(list):
+    """
+    Class that represents the list of done actions, which also indexes
+    the positions of the actions that changed each object, so the history
+    of an object is found without going over all the actions.
+    Appending and popping actions keep the index up to date,
+    the other changes of the list build it again.
+
+    The done actions are a path of an undo tree. Popped actions stay in the
+    tree, so appending them back redoes them, and appending another action
+    starts a new branch instead of dropping them. The tree also checkpoints
+    the whole document every so many actions, so the document at any node
+    is found by replaying the few actions after the checkpoint before it.
+
+    A history restored from a file keeps the actions before the loaded
+    document encoded, and decodes them a chunk at a time, once popping or
+    replaying reaches them.
+
+    Appended actions are kept as the records of records.compact, which are
+    read like the dictionaries they replace but can not be changed.
+    """
+
+    def __init__(self, actions: Iterable[Dict[str, Any]] = ()) -> None:
+        """
+        Initialize the history.
+        :param actions: The actions the history starts with.
+                        Defaults to no actions.
+        """
+        super().__init__(compact(action) for action in actions)
+        # The positions of the actions that changed each object, in order
+        self.__positions: Dict[int, List[int]] = {}
+        # The nodes of the undo tree from its root to the done actions
+        self.__nodes: List[HistoryNode] = []
+        # The nodes no action was done after, the tips of the branches,
+        # the latest one last
+        self.__leaves: Dict[HistoryNode, None] = {}
+        self.__node_count: int = 0
+        # The document after the done actions, None until it is replayed
+        self.__document: Optional[Document] = None
+        # The encoded actions before the done actions, the latest last
+        self.__archive: List[Chunk] = []
+        self.__rebuild()
+
+    def __bool__(self) -> bool:
+        return len(self) > 0 or bool(self.__archive)
+
+    def __rebuild(self) -> None:
+        """
+        This function indexes all the actions again, in a new undo tree
+        whose only branch is the done actions.
+        """
+        if self.__archive:
+            # The tree starts at the empty document
+            archived = [action for _, text in self.__archive
+                        for action in decode_actions(text)]
+            self.__archive = []
+            super().__setitem__(slice(0, 0), archived)
+        self.__positions.clear()
+        root = HistoryNode()
+        root.checkpoint = ((), ())
+        self.__nodes = [root]
+        self.__leaves = {root: None}
+        self.__node_count = 1
+        self.__document = OrderedDict()
+        for action in self:
+            self.__push(action)
+
+    def __add(self, position: int, action: Dict[str, Any]) -> None:
+        """
+        This function indexes an action.
+        :param position: The position of the action.
+        :param action: The action.
+        """
+        for item in touched_objects(action):
+            self.__positions.setdefault(item, []).append(position)
+
+    def __forget(self, action: Dict[str, Any]) -> None:
+        """
+        This function removes the last action from the index.
+        :param action: The action.
+        """
+        for item in touched_objects(action):
+            positions = self.__positions[item]
+            positions.pop()
+            if not positions:
+                del self.__positions[item]
+
+    def positions_of(self, item: int) -> List[int]:
+        """
+        This function finds the actions that changed an object.
+        :param item: The id of the object.
+        :return: The positions of the actions, oldest first.
+        """
+        return list(self.__positions.get(item, []))
+
+    def __push(self, action: Dict[str, Any]) -> None:
+        """
+        This function moves the tip of the done actions to the node of an
+        action done after it, which is made if the action is new there.
+        The action is put at the end of the list after it, so an action
+        that can not be done leaves the history as it was.
+        :param action: The action.
+        """
+        # The document is only kept if the action is done on it,
+        # it may be half changed otherwise
+        document, self.__document = self.__document, None
+        if document is not None:
+            redo_on_document(action, document)
+            self.__document = document
+        tip = self.__nodes[-1]
+        for child in reversed(tip.children):
+            if child.action is action:
+                # The action is redone
+                tip.children.remove(child)
+                tip.children.append(child)
+                node = child
+                break
+        else:
+            node = HistoryNode(action, tip, self.__node_count)
+            self.__node_count += 1
+            tip.children.append(node)
+            self.__leaves.pop(tip, None)
+            self.__leaves[node] = None
+        self.__nodes.append(node)
+        self.__add(node.depth - 1, action)
+        self.__checkpoint(node)
+
+    def __checkpoint(self, node: HistoryNode) -> None:
+        """
+        This function checkpoints the document at the tip of the done
+        actions, if the last checkpoint is far enough before it.
+        :param node: The tip of the done actions.
+        """
+        base = node.base
+        # The base of decoded actions may be the root of a chunk
+        size = len(base.checkpoint[0]) if base.checkpoint is not None else 0
+        if node.checkpoint is not None or \
+                node.depth - base.depth < max(CHECKPOINT_INTERVAL, size):
+            return
+        if self.__document is None:
+            self.__document = self.__replay(node)
+        node.checkpoint = (tuple(self.__document),
+                           tuple(self.__document.values()))
+        node.base = node
+
+    def __replay(self, node: HistoryNode) -> Document:
+        """
+        This function replays the actions after the last checkpoint
+        before a node.
+        :param node: The node.
+        :return: The document at the node.
+        """
+        actions: List[Dict[str, Any]] = []
+        while node.checkpoint is None:
+            if node.parent is None:
+                # The document before the decoded actions is only known
+                # from the start of the history
+                while self.__archive:
+                    self.__unarchive()
+            actions.append(node.action)
+            node = node.parent
+        ids, infos = node.checkpoint
+        document: Document = OrderedDict(zip(ids, infos))
+        for action in reversed(actions):
+            redo_on_document(action, document)
+        return document
+
+    def __line_node(self, position: int) -> HistoryNode:
+        """
+        This function finds a node of the current branch.
+        :param position: How many actions lead to the node, more than
+                         len(self) for the nodes that redo reaches.
+        :return: The node.
+        """
+        if position < 0:
+            raise IndexError("history position out of range")
+        if position < len(self.__nodes):
+            return self.__nodes[position]
+        node = self.__nodes[-1]
+        for _ in range(position - len(self)):
+            if not node.children:
+                raise IndexError("history position out of range")
+            node = node.children[-1]
+        return node
+
+    def __unarchive(self) -> None:
+        """
+        This function decodes the last encoded chunk of actions, which
+        lead to the root of the undo tree, so they become its first nodes.
+        """
+        _, text = self.__archive.pop()
+        actions = decode_actions(text)
+        if not actions:
+            return
+        old_root = self.__nodes[0]
+        stack = [old_root]
+        while stack:
+            node = stack.pop()
+            node.depth += len(actions)
+            stack.extend(node.children)
+        root = HistoryNode(number=self.__node_count)
+        self.__node_count += 1
+        if not self.__archive:
+            root.checkpoint = ((), ())
+        nodes = [root]
+        for action in actions[:-1]:
+            nodes.append(HistoryNode(action, nodes[-1], self.__node_count))
+            self.__node_count += 1
+            nodes[-2].children.append(nodes[-1])
+        old_root.action = actions[-1]
+        old_root.parent = nodes[-1]
+        nodes[-1].children.append(old_root)
+        self.__nodes[:0] = nodes
+        super().__setitem__(slice(0, 0), actions)
+        self.__positions.clear()
+        for position, action in enumerate(self):
+            self.__add(position, action)
+
+    def restore(self, chunks: Sequence[Chunk], document: Document) -> None:
+        """
+        This function replaces the history by a saved one,
+        see encoded. Its actions are decoded once they are reached.
+        :param chunks: The encoded actions, in order.
+        :param document: The information of each object by id, bottom first,
+                         after the saved actions.
+        :raises ValueError: If a chunk cannot be decoded, the history is
+                            left as it is.
+        """
+        # Every chunk is decoded once now, so a corrupt history is found
+        # when it is loaded rather than when undo reaches it
+        for count, text in chunks:
+            try:
+                actions = decode_actions(text)
+            except (zlib.error, binascii.Error, ValueError) as e:
+                raise ValueError(f"The saved history is corrupt: {e}") from e
+            if not isinstance(actions, list) or len(actions) != count or \
+                    not all(isinstance(action, Mapping) and
+                            isinstance(action.get('type'), str)
+                            for action in actions):
+                raise ValueError("The saved history is corrupt")
+        self.clear()
+        self.__archive = [(int(count), text) for count, text in chunks]
+        root = self.__nodes[0]
+        root.checkpoint = (tuple(document), tuple(document.values()))
+        self.__document = OrderedDict(document)
+
+    def encoded(self) -> List[Chunk]:
+        """
+        This function encodes the done actions compactly, to be saved.
+        The actions restored from a file that were not decoded are saved
+        as they are.
+        :return: The encoded actions in chunks, in order.
+        """
+        chunks = list(self.__archive)
+        for start in range(0, len(self), HISTORY_CHUNK_SIZE):
+            actions = self[start:start + HISTORY_CHUNK_SIZE]
+            chunks.append((len(actions), encode_actions(actions)))
+        return chunks
+
+    def archived_count(self) -> int:
+        """
+        This function counts the restored actions that are not decoded yet.
+        :return: The amount of actions.
+        """
+        return sum(count for count, _ in self.__archive)
+
+    def next_action(self) -> Optional[Dict[str, Any]]:
+        """
+        This function finds the action redo appends back.
+        :return: The action, or None if there is nothing to redo.
+        """
+        children = self.__nodes[-1].children
+        return children[-1].action if children else None
+
+    def future(self) -> List[Dict[str, Any]]:
+        """
+        This function returns the actions redo appends back, one by one.
+        :return: The actions, the next one to append last.
+        """
+        actions: List[Dict[str, Any]] = []
+        node = self.__nodes[-1]
+        while node.children:
+            node = node.children[-1]
+            actions.append(node.action)
+        actions.reverse()
+        return actions
+
+    def branches(self) -> List[HistoryNode]:
+        """
+        This function returns the tips of the branches of the undo tree.
+        :return: The nodes, the latest one last.
+        """
+        return list(self.__leaves)
+
+    def current_branch(self) -> HistoryNode:
+        """
+        This function finds the tip of the branch of the done actions,
+        which redo goes to.
+        :return: The node.
+        """
+        node = self.__nodes[-1]
+        while node.children:
+            node = node.children[-1]
+        return node
+
+    def document_at(self, position: int) -> Document:
+        """
+        This function finds what the objects were like after some actions.
+        :param position: How many actions were done, more than len(self)
+                         for the document after redoing actions.
+        :return: The information of each object by id, bottom first.
+                 The information is shared with the history,
+                 so it must not be changed.
+        """
+        return self.document_of(self.__line_node(position))
+
+    def document_of(self, node: HistoryNode) -> Document:
+        """
+        This function finds what the objects are like at a node of the
+        undo tree.
+        :param node: The node.
+        :return: The information of each object by id, bottom first,
+                 see document_at.
+        """
+        if node is self.__nodes[-1] and self.__document is not None:
+            return OrderedDict(self.__document)
+        return self.__replay(node)
+
+    def jump(self, position: int) -> Document:
+        """
+        This function pops or appends back actions until the given amount
+        of actions are done.
+        :param position: How many actions will be done.
+        :return: The document after the actions, see document_at.
+        """
+        return self.switch_to(self.__line_node(position))
+
+    def switch_to(self, node: HistoryNode) -> Document:
+        """
+        This function pops actions until the done actions lead to a node
+        of the path to another node, and appends the rest of the path.
+        Redo then follows the path.
+        :param node: The node, of this history's undo tree.
+        :return: The document at the node, see document_at.
+        """
+        document = self.document_of(node)
+        path: List[HistoryNode] = []
+        # Find the last node the paths share
+        while node.depth >= len(self.__nodes) or \
+                self.__nodes[node.depth] is not node:
+            path.append(node)
+            node = node.parent
+        popped = self[node.depth:]
+        super().__delitem__(slice(node.depth, None))
+        del self.__nodes[node.depth + 1:]
+        for action in reversed(popped):
+            self.__forget(action)
+        for node in reversed(path):
+            siblings = node.parent.children
+            siblings.remove(node)
+            siblings.append(node)
+            super().append(node.action)
+            self.__nodes.append(node)
+            self.__add(node.depth - 1, node.action)
+        self.__document = OrderedDict(document)
+        return document
+
+    def append(self, action: Dict[str, Any]) -> None:
+        # Most actions are kept as records, which take much less memory
+        action = compact(action)
+        self.__push(action)
+        super().append(action)
+
+    def pop(self, index: SupportsIndex = -1) -> Dict[str, Any]:
+        while not len(self) and self.__archive:
+            self.__unarchive()
+        position = range(len(self))[index]
+        action: Dict[str, Any] = super().pop(index)
+        if position != len(self):
+            self.__rebuild()  # The actions after it have moved
+            return action
+        self.__forget(action)
+        # The node stays in the tree, so the action can be redone
+        self.__nodes.pop()
+        self.__document = None
+        return action
+
+    def extend(self, actions: Iterable[Dict[str, Any]]) -> None:
+        for action in actions:
+            self.append(action)
+
+    def __iadd__(self, actions: Iterable[Dict[str, Any]]) -> 'History':
+        self.extend(actions)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self.__archive = []
+        self.__rebuild()
+
+    def insert(self, *args: Any) -> None:
+        super().insert(*args)
+        self.__rebuild()
+
+    def remove(self, *args: Any) -> None:
+        super().remove(*args)
+        self.__rebuild()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self.__rebuild()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self.__rebuild()
+
+    def __setitem__(self, *args: Any) -> None:
+        super().__setitem__(*args)
+        self.__rebuild()
+
+    def __delitem__(self, *args: Any) -> None:
+        super().__delitem__(*args)
+        self.__rebuild()
@@ -0,0 +1,128 @@
+from transform import box_to_polygon
+from typing import List, Sequence, Tuple
+import numpy as np
+
+# The types of objects whose outline is closed
+CLOSED_TYPES: List[str] = ["rectangle", "oval", "polygon", "text"]
+
+# (The type of the object, its coordinates, whether its inside is filled,
+#  the width of its line or outline, in screen pixels). Text objects are
+# given by the two corners of their bounding box, and count as filled.
+HitShape = Tuple[str, Sequence[float], bool, float]
+
+
+def segment_distances(x: float, y: float, starts: np.ndarray,
+                      ends: np.ndarray) -> np.ndarray:
+    """
+    This function measures the distance from a point to many line segments
+    at once.
+    :param x: The x coordinate of the point.
+    :param y: The y coordinate of the point.
+    :param starts: An array of shape (n, 2) of the first end of each segment.
+    :param ends: An array of shape (n, 2) of the other end of each segment.
+    :return: An array of shape (n,) of the distances.
+    """
+    point = np.array([x, y], dtype=float)
+    direction = ends - starts
+    length_squared = np.einsum("ij,ij->i", direction, direction)
+    along = np.einsum("ij,ij->i", point - starts, direction)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Where on each segment the closest point is, 0 is its first end
+        t = np.clip(np.where(length_squared > 0, along / length_squared, 0),
+                    0, 1)
+    closest = starts + t[:, np.newaxis] * direction
+    return np.hypot(closest[:, 0] - x, closest[:, 1] - y)
+
+
+def outline_points(obj_type: str, coords: Sequence[float]) -> np.ndarray:
+    """
+    This function finds the points an object's line or outline goes through.
+    Closed outlines end with their first point again.
+    :param obj_type: The type of the object.
+    :param coords: The flat coordinates of the object.
+    :return: An array of shape (n, 2) of the points.
+    """
+    if obj_type in ["rectangle", "oval", "text"]:
+        coords = box_to_polygon("oval" if obj_type == "oval" else "rectangle",
+                                coords)
+    points = np.asarray(coords[:len(coords) // 2 * 2],
+                        dtype=float).reshape(-1, 2)
+    if obj_type in CLOSED_TYPES:
+        points = np.vstack((points, points[:1]))
+    if len(points) == 1:
+        # A single point is a segment of no length
+        points = np.vstack((points, points))
+    return points
+
+
+def hit_objects(shapes: Sequence[HitShape], x: float, y: float,
+                tolerance: float, zoom: float = 1.0) -> List[int]:
+    """
+    This function finds the objects whose exact shape is near a point:
+    their line or outline is within tolerance of it (and half the width of
+    the line), or their filled inside contains it. All the segments of all
+    the objects are tested at once.
+    :param shapes: The objects to test, usually the ones whose bounding box
+                   is near the point.
+    :param x: The x coordinate of the point.
+    :param y: The y coordinate of the point.
+    :param tolerance: How far from a line or an outline still hits it.
+    :param zoom: How many screen pixels a unit of the coordinates is drawn
+                 in, which converts the widths. Defaults to 1.
+    :return: The indices (in shapes) of the objects that are hit, in order.
+    """
+    indices = [i for i, (_, coords, _, _) in enumerate(shapes)
+               if len(coords) >= 2]
+    if not indices:
+        return []
+    outlines = [outline_points(shapes[i][0], shapes[i][1]) for i in indices]
+    counts = np.array([len(points) - 1 for points in outlines])
+    starts = np.concatenate([points[:-1] for points in outlines])
+    ends = np.concatenate([points[1:] for points in outlines])
+    # The index of each object's first segment
+    firsts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    nearest = np.minimum.reduceat(segment_distances(x, y, starts, ends),
+                                  firsts)
+    # The widths are drawn in screen pixels, whatever the zoom is
+    reach = tolerance + np.array([shapes[i][3] for i in indices]) / 2 / zoom
+    hit = nearest <= reach
+
+    # A horizontal ray from the point crosses the outline of a filled shape
+    # an odd amount of times if the point is inside it
+    crosses = (starts[:, 1] > y) != (ends[:, 1] > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_at = starts[:, 0] + (y - starts[:, 1]) * \
+            (ends[:, 0] - starts[:, 0]) / (ends[:, 1] - starts[:, 1])
+    crossings = np.add.reduceat((crosses & (x < x_at)).astype(int), firsts)
+    filled = np.array([shapes[i][2] and shapes[i][0] in CLOSED_TYPES
+                       for i in indices])
+    hit |= filled & (crossings % 2 == 1)
+
+    # The outline of an oval is only close to the ellipse, test the inside
+    # of filled ovals exactly
+    ovals = [n for n, i in enumerate(indices) if shapes[i][0] == "oval" and
+             shapes[i][2] and len(shapes[i][1]) >= 4]
+    if ovals:
+        boxes = np.array([shapes[indices[n]][1][:4] for n in ovals],
+                         dtype=float)
+        hit[ovals] |= in_ellipses(boxes, x, y)
+    return [indices[n] for n in np.flatnonzero(hit)]
+
+
+def in_ellipses(boxes: np.ndarray, x: float, y: float) -> np.ndarray:
+    """
+    This function checks whether a point is inside the ellipses of ovals.
+    :param boxes: An array of shape (n, 4) of the two corners of each oval.
+    :param x: The x coordinate of the point.
+    :param y: The y coordinate of the point.
+    :return: A boolean array of shape (n,), True for the ellipses
+             the point is inside.
+    """
+    rx = np.abs(boxes[:, 2] - boxes[:, 0]) / 2
+    ry = np.abs(boxes[:, 3] - boxes[:, 1]) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distance = ((x - (boxes[:, 0] + boxes[:, 2]) / 2) / rx) ** 2 + \
+            ((y - (boxes[:, 1] + boxes[:, 3]) / 2) / ry) ** 2
+    # Flat ovals have no inside
+    return (rx > 0) & (ry > 0) & (distance <= 1)
@@ -0,0 +1,152 @@
+from PIL import Image, ImageTk
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+import tkinter as tk
+import threading
+import queue
+
+DEFAULT_CAPACITY: int = 4  # The maximal amount of PhotoImages kept
+POLL_INTERVAL: int = 15  # Milliseconds between checks for decoded images
+
+
+class ImageCache:
+    """
+    Class that represents a cache of images for tkinter widgets.
+    The images are decoded from the disk in a background thread and kept
+    decoded, and are converted to PhotoImages on the Tk thread only (tkinter
+    is not thread-safe). Only the PhotoImages are bounded.
+
+    Attributes:
+        master (tk.Misc): The widget whose Tk interpreter owns the images.
+        capacity (int): The maximal amount of PhotoImages kept.
+    """
+
+    def __init__(self, master: tk.Misc,
+                 capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Initialize the cache.
+        :param master: The widget whose Tk interpreter owns the images.
+        :param capacity: The maximal amount of PhotoImages kept.
+                         Defaults to DEFAULT_CAPACITY.
+        """
+        self.master: tk.Misc = master
+        self.capacity: int = max(1, capacity)
+        # Least recently used images are at the start of the dictionary
+        self.__photos: OrderedDict[str, ImageTk.PhotoImage] = OrderedDict()
+        self.__queue: queue.Queue = queue.Queue()
+        self.__decoding: Set[str] = set()  # The images the worker owes us
+        # The decoded images, None for those that could not be read
+        self.__decoded: Dict[str, Optional[Image.Image]] = {}
+        self.__polling: bool = False
+
+    @staticmethod
+    def __decode(path: str) -> Image.Image:
+        """
+        This function reads and decodes an image from the disk.
+        :param path: The path of the image.
+        :return: The decoded image.
+        """
+        with Image.open(path) as img:
+            img.load()  # Force the decoding now, not on first use
+            return img.copy()
+
+    def __worker(self, paths: List[str]) -> None:
+        """
+        This function decodes the images in a background thread.
+        :param paths: The paths of the images to decode.
+        """
+        for path in paths:
+            try:
+                self.__queue.put((path, self.__decode(path)))
+            except OSError:
+                # A missing or broken image is shown as no image
+                self.__queue.put((path, None))
+
+    def __poll(self) -> None:
+        """
+        This function moves the decoded images from the worker to the cache.
+        It runs on the Tk thread.
+        """
+        while True:
+            try:
+                path, img = self.__queue.get_nowait()
+            except queue.Empty:
+                break
+            self.__receive(path, img)
+        if self.__decoding:
+            self.master.after(POLL_INTERVAL, self.__poll)
+        else:
+            self.__polling = False
+
+    def __receive(self, path: str, img: Optional[Image.Image]) -> None:
+        """
+        This function stores an image the worker decoded.
+        It runs on the Tk thread.
+        :param path: The path of the image.
+        :param img: The decoded image, None if it could not be decoded.
+        """
+        self.__decoding.discard(path)
+        self.__decoded[path] = img
+
+    def __store(self, path: str, photo: ImageTk.PhotoImage) -> None:
+        """
+        This function stores a PhotoImage and evicts the least recently used
+        images if the cache is full.
+        :param path: The path of the image.
+        :param photo: The PhotoImage to store.
+        """
+        self.__photos[path] = photo
+        self.__photos.move_to_end(path)
+        while len(self.__photos) > self.capacity:
+            self.__photos.popitem(last=False)
+
+    def preload(self, paths: List[str]) -> None:
+        """
+        This function starts decoding the images in a background thread.
+        :param paths: The paths of the images to decode.
+        """
+        paths = [path for path in paths
+                 if path not in self.__decoded and
+                 path not in self.__decoding]
+        if not paths:
+            return
+        self.__decoding.update(paths)
+        threading.Thread(target=self.__worker, args=(paths,),
+                         daemon=True).start()
+        if not self.__polling:
+            self.__polling = True
+            self.master.after(POLL_INTERVAL, self.__poll)
+
+    def get(self, path: str) -> Optional[ImageTk.PhotoImage]:
+        """
+        This function returns the PhotoImage of path.
+        If the worker is decoding the image, its result is waited for.
+        If the image was not decoded yet, it is decoded now.
+        :param path: The path of the image.
+        :return: The PhotoImage of path, or None if the image is missing
+                 or can not be decoded.
+        """
+        photo: Optional[ImageTk.PhotoImage] = self.__photos.get(path)
+        if photo is not None:
+            self.__photos.move_to_end(path)
+            return photo
+        while path in self.__decoding:
+            self.__receive(*self.__queue.get())
+        if path not in self.__decoded:
+            try:
+                self.__decoded[path] = self.__decode(path)
+            except OSError:
+                self.__decoded[path] = None
+        img = self.__decoded[path]
+        if img is None:
+            return None
+        photo = ImageTk.PhotoImage(img, master=self.master)
+        self.__store(path, photo)
+        return photo
+
+    def clear(self) -> None:
+        """
+        This function empties the cache.
+        """
+        self.__photos.clear()
+        self.__decoded.clear()
@@ -1,6 +1,6 @@
-from PIL import Image, ImageTk
 from tkinter import messagebox
 from bigvars import HELP
+from image_cache import ImageCache
 from typing import List
 import canvas
 import tkinter as tk
@@ -73,18 +73,37 @@ class State:
         self.state: str = state
 
 
-def tutorial(window: tk.Tk, is_load: State) -> None:
+def tutorial(window: tk.Tk, hello_frame: tk.Frame,
+             images: ImageCache) -> None:
     """
     This function shows a tutorial on how to use the Or's Illustrator.
-    :param window: A window to destroy.
-    :param is_load: Whether the user wants to load an existing canvas or not.
+    :param window: The root window of the program.
+    :param hello_frame: The frame of the hello screen, to hide while the
+                        tutorial is shown.
+    :param images: The cache to get the tutorial images from.
     """
-    window.destroy()
-    window = tk.Tk()
-    window.resizable(False, False)
+    hello_frame.pack_forget()
+    window.geometry('')  # Fit the window to the tutorial images
     window.title("Tutorial")
+    tutorial_frame: tk.Frame = tk.Frame(window)
+    tutorial_frame.pack(fill=tk.BOTH, expand=True)
     current_image_index = 0
 
+    # Decode all the tutorial images in the background,
+    # so stepping through them does not wait for the disk
+    images.preload(IMAGE_PATHS)
+
+    def exit_tutorial() -> None:
+        """
+        This function closes the tutorial and returns to the hello screen.
+        """
+        window.unbind('<Right>')
+        window.unbind('<Left>')
+        tutorial_frame.destroy()
+        window.geometry("480x100")
+        window.title("Or's Illustrator")
+        hello_frame.pack(fill=tk.BOTH, expand=True)
+
     def show_new_image(plus: bool = True) -> None:
         """
         This function shows the next image and configures the buttons.
@@ -105,7 +124,7 @@ def tutorial(window: tk.Tk, is_load: State) -> None:
             current_image_index -= 1
         # Check if this is the last image
         if current_image_index == len(IMAGE_PATHS):
-            window.destroy()
+            exit_tutorial()
             return
         if current_image_index == len(IMAGE_PATHS)-1:
             next_button.config(text="Exit Tutorial")
@@ -115,18 +134,20 @@ def tutorial(window: tk.Tk, is_load: State) -> None:
             prev_button.config(state=tk.DISABLED)
         else:
             prev_button.config(state=tk.NORMAL)
-        # Load the image
-        img = Image.open(IMAGE_PATHS[current_image_index])
-        img_tk = ImageTk.PhotoImage(img)
-        # Update the label to show the new image
-        label.configure(image=img_tk)
+        # Get the image from the cache
+        img_tk = images.get(IMAGE_PATHS[current_image_index])
+        # Update the label to show the new image, or its path if it is missing
+        label.configure(image=img_tk or '',
+                        text='' if img_tk else
+                        f"Could not open {IMAGE_PATHS[current_image_index]}")
         label.image = img_tk  # Keep a reference to avoid garbage collection
 
     # Display the initial image
-    image = Image.open(IMAGE_PATHS[current_image_index])
-    image_tk = ImageTk.PhotoImage(image)
+    image_tk = images.get(IMAGE_PATHS[current_image_index])
     # Display the image on a label
-    label = tk.Label(window, image=image_tk)
+    label = tk.Label(tutorial_frame, image=image_tk or '',
+                     text='' if image_tk else
+                     f"Could not open {IMAGE_PATHS[current_image_index]}")
     label.image = image_tk  # Keep a reference to avoid garbage collection
     label.pack()
 
@@ -135,14 +156,14 @@ def tutorial(window: tk.Tk, is_load: State) -> None:
     window.bind('<Left>', lambda event: show_new_image(False))
 
     # Button to show the next image
-    next_button = tk.Button(window, text="Next Step", command=show_new_image,
-                            relief="flat")
+    next_button = tk.Button(tutorial_frame, text="Next Step",
+                            command=show_new_image, relief="flat")
     next_button.bind("<Enter>", on_enter)
     next_button.bind("<Leave>", on_leave)
     next_button.pack(side=tk.RIGHT)
 
     # Button to show the previous image
-    prev_button = tk.Button(window, text="Previous Step",
+    prev_button = tk.Button(tutorial_frame, text="Previous Step",
                             command=lambda: show_new_image(False),
                             relief="flat", state=tk.DISABLED)
     prev_button.bind("<Enter>", on_enter)
@@ -150,18 +171,13 @@ def tutorial(window: tk.Tk, is_load: State) -> None:
     prev_button.pack(side=tk.RIGHT)
 
     # Button to exit the tutorial
-    exit_button = tk.Button(window, text="Exit The Tutorial",
-                            command=window.destroy,
+    exit_button = tk.Button(tutorial_frame, text="Exit The Tutorial",
+                            command=exit_tutorial,
                             relief="flat")
     exit_button.bind("<Enter>", on_enter)
     exit_button.bind("<Leave>", on_leave)
     exit_button.pack(side=tk.LEFT)
 
-    window.mainloop()
-
-    # Return to the main window after the tutorial window has been destroyed
-    hello_window(is_load)
-
 
 def click(tk_window: tk.Tk, is_load_button: State) -> None:
     """
@@ -169,17 +185,17 @@ def click(tk_window: tk.Tk, is_load_button: State) -> None:
     "if __name__ == '__main__'"
     part of the program know that the user wants
     to load an existing canvas.
-    :param tk_window: A window to destroy.
+    :param tk_window: The window whose main loop to stop.
     :param is_load_button: The button to change its state.
     """
     is_load_button.state = 'T'
-    tk_window.destroy()
+    tk_window.quit()
 
 
 def on_exit(window: tk.Tk, is_load: State) -> None:
     """
     This function that handles the "WM_DELETE_WINDOW" event.
-    :param window: A window to destroy.
+    :param window: The window whose main loop to stop.
     :param is_load: Whether the user wants to load an existing canvas or not.
     """
     # Make sure the user wants to exit the program
@@ -190,20 +206,27 @@ def on_exit(window: tk.Tk, is_load: State) -> None:
         # "if __name__ == '__main__'"
         # part of the program know that the user exited the program.
         is_load.state = ''
-        window.destroy()
+        window.quit()
 
 
-def hello_window(is_load: State) -> None:
+def hello_window(window: tk.Tk, is_load: State, images: ImageCache) -> None:
     """
-    This function shows the initial window.
+    This function shows the initial screen on the root window.
+    :param window: The root window of the program.
+    :param is_load: Whether the user wants to load an existing canvas or not.
+    :param images: The cache to get the tutorial images from.
     """
-    window: tk.Tk = tk.Tk()
     window.protocol("WM_DELETE_WINDOW", lambda: on_exit(window, is_load))
     window.geometry("480x100")
     window.resizable(False, False)
     window.title("Or's Illustrator")
 
-    frame: tk.Frame = tk.Frame(window)
+    # Everything in the hello screen lives in this frame,
+    # so the tutorial can hide and restore it
+    hello_frame: tk.Frame = tk.Frame(window)
+    hello_frame.pack(fill=tk.BOTH, expand=True)
+
+    frame: tk.Frame = tk.Frame(hello_frame)
     frame.configure(bg="black")
     frame.pack(fill=tk.BOTH, expand=True)
 
@@ -211,15 +234,16 @@ def hello_window(is_load: State) -> None:
                                font=("David", 23), bg="black", fg="white")
     label.pack(fill=tk.BOTH, expand=True)
 
-    load_button = tk.Button(window, text="Load an existing canvas",
+    load_button = tk.Button(hello_frame, text="Load an existing canvas",
                             command=lambda: click(window, is_load),
                             relief="raised", borderwidth=0,
                             bg="black", fg="white")
-    new_canvas_button = tk.Button(window, text="Create an empty canvas",
-                                  command=window.destroy, relief="raised",
+    new_canvas_button = tk.Button(hello_frame, text="Create an empty canvas",
+                                  command=window.quit, relief="raised",
                                   borderwidth=0, bg="black", fg="white")
-    tutorial_button = tk.Button(window, text="Watch a tutorial",
-                                command=lambda: tutorial(window, is_load),
+    tutorial_button = tk.Button(hello_frame, text="Watch a tutorial",
+                                command=lambda: tutorial(window, hello_frame,
+                                                         images),
                                 relief="raised", borderwidth=0,
                                 bg="black", fg="white")
 
@@ -239,7 +263,6 @@ def hello_window(is_load: State) -> None:
     load_button.pack(side=tk.LEFT)
     tutorial_button.pack(side=tk.LEFT)
     new_canvas_button.pack(side=tk.LEFT)
-    window.mainloop()
 
 
 def main() -> None:
@@ -250,15 +273,24 @@ def main() -> None:
         print(HELP)
     else:
         is_load: State = State()
-        hello_window(is_load)
+        # The single Tk interpreter of the program, for all of its screens
+        root: tk.Tk = tk.Tk()
+        images: ImageCache = ImageCache(root)
+        hello_window(root, is_load, images)
+        root.mainloop()
         if is_load.state != '':  # If the user didn't exit from the hello screen
-            # Create a new root
-            root: tk.Tk = tk.Tk()
+            # Clear the hello screen from the root
+            for child in root.winfo_children():
+                child.destroy()
+            root.geometry('')
+            root.resizable(True, True)
             # Create a new canvas
             canvas.CanvasApp(root,
-                             True if is_load.state == 'T' else False)
-            # run the new root
+                             True if is_load.state == 'T' else False,
+                             images)
+            # run the canvas
             root.mainloop()
+        root.destroy()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,445 @@
+"""
+This module makes drawings smaller without changing how they look.
+It works on the objects the way they are saved, so it runs on an open canvas,
+on a file while it is loaded, or on its own:
+python optimizer.py canvas.json [optimized.json] [--simplify TOLERANCE] [--cull]
+Compressed canvases, like canvas.json.gz, work the same way.
+"""
+from styles import pack_styles, unpack_styles
+from canvas_file import read_canvas, write_canvas, compression_for, \
+    detect_compression
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Set
+import numpy as np
+import argparse
+import json
+
+# The keys a pencil segment may have, segments with other options
+# (a dash pattern for example) are left alone
+SEGMENT_KEYS: List[str] = ["type", "coords", "fill", "width", "layer", "id"]
+# The options that must be equal for segments to be joined
+JOIN_KEYS: List[str] = ["fill", "width", "layer"]
+# The types of objects whose fill can cover the objects below them
+COVER_TYPES: List[str] = ["rectangle", "oval", "polygon"]
+# The reasons objects are culled for, in the order they are looked for
+CULL_REASONS: List[str] = ["degenerate", "duplicate", "occluded"]
+
+
+def can_join(stroke: Dict[str, Any], segment: Dict[str, Any]) -> bool:
+    """
+    This function checks whether a line continues another line,
+    so they can be drawn as one polyline.
+    :param stroke: The information of the line drawn right below segment.
+    :param segment: The information of the line.
+    :return: True if segment starts where stroke ends, with the same color,
+             width and layer, False otherwise.
+    """
+    if stroke["type"] != "line" or segment["type"] != "line":
+        return False
+    if any(key not in SEGMENT_KEYS for key in stroke) or \
+            any(key not in SEGMENT_KEYS for key in segment):
+        return False
+    if any(stroke.get(key) != segment.get(key) for key in JOIN_KEYS):
+        return False
+    coords, next_coords = stroke["coords"], segment["coords"]
+    return len(coords) >= 4 and len(next_coords) >= 4 and \
+        coords[-2:] == next_coords[:2]
+
+
+def merge_strokes(objects: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    This function joins the lines that continue each other into polylines.
+    The pencil draws every mouse motion as a line of its own, so a stroke is
+    many lines, each starting where the one below it ends. Only lines that
+    are next to each other in the stacking order are joined, so nothing
+    moves above or below anything else. A joined line keeps the id of its
+    first line.
+    :param objects: The information of the objects, bottom first,
+                    as returned by file_manager.get_item_info.
+    :return: The information of the objects after joining, bottom first.
+             The given objects are not changed.
+    """
+    merged: List[Dict[str, Any]] = []
+    for obj in objects:
+        if merged and can_join(merged[-1], obj):
+            merged[-1]["coords"].extend(obj["coords"][2:])
+            continue
+        obj = dict(obj)
+        obj["coords"] = list(obj["coords"])
+        merged.append(obj)
+    return merged
+
+
+def simplify(coords: Sequence[float], tolerance: float) -> List[float]:
+    """
+    This function leaves out the points of a polyline that are closer than
+    tolerance to the line through their neighbours (Ramer-Douglas-Peucker).
+    :param coords: The flat coordinates of the polyline.
+    :param tolerance: How far the polyline may move, in canvas pixels.
+    :return: The flat coordinates of the kept points, the ends are always kept.
+    """
+    points = np.asarray(coords, dtype=float).reshape(-1, 2)
+    if len(points) <= 2 or tolerance <= 0:
+        return list(coords)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    ranges = [(0, len(points) - 1)]
+    while ranges:
+        first, last = ranges.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        between = points[first + 1:last]
+        direction = end - start
+        length = np.hypot(*direction)
+        if length == 0:
+            distances = np.hypot(*(between - start).T)
+        else:
+            # The distance of every point from the line through the ends
+            distances = np.abs(direction[0] * (between[:, 1] - start[1]) -
+                               direction[1] * (between[:, 0] - start[0])) \
+                / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            middle = first + 1 + farthest
+            keep[middle] = True
+            ranges.append((first, middle))
+            ranges.append((middle, last))
+    return points[keep].ravel().tolist()
+
+
+def is_degenerate(obj: Dict[str, Any]) -> bool:
+    """
+    This function checks whether an object draws nothing: a line whose
+    points are all the same (a single click of the pencil), a rectangle,
+    oval or polygon that is a single point or has no area and no outline,
+    or text without any visible character.
+    :param obj: The information of the object.
+    :return: True if the object draws nothing, False otherwise.
+    """
+    if obj["type"] == "text":
+        return not str(obj.get("text", "")).strip()
+    xs, ys = obj["coords"][::2], obj["coords"][1::2]
+    if not xs or (min(xs) == max(xs) and min(ys) == max(ys)):
+        return True
+    if obj["type"] == "line" or obj.get("outline", "") != "":
+        return False
+    if obj["type"] in ["rectangle", "oval"]:
+        return min(xs) == max(xs) or min(ys) == max(ys)
+    return polygon_area(np.column_stack((xs, ys[:len(xs)]))) == 0
+
+
+def polygon_area(points: np.ndarray) -> float:
+    """
+    This function calculates the signed area of a polygon (shoelace formula).
+    :param points: An array of shape (n, 2) of the polygon's vertices.
+    :return: The area, positive if the vertices go counterclockwise
+             in a y-up frame.
+    """
+    x, y = points[:, 0], points[:, 1]
+    return float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2
+
+
+def find_duplicates(objects: Sequence[Dict[str, Any]]) -> List[int]:
+    """
+    This function finds the objects that have an exact copy above them.
+    The copy draws the same pixels over them, so they are never seen,
+    whatever is between them. The copy must be on the same layer, so
+    hiding a layer does not show them either.
+    :param objects: The information of the objects, bottom first.
+    :return: The indices of the lower copies, in order.
+    """
+    seen: Set[Tuple[Any, ...]] = set()
+    duplicates: List[int] = []
+    for i in range(len(objects) - 1, -1, -1):
+        key = tuple((option, tuple(value) if isinstance(value, list) else value)
+                    for option, value in sorted(objects[i].items())
+                    if option != "id")
+        if key in seen:
+            duplicates.append(i)
+        else:
+            seen.add(key)
+    return sorted(duplicates)
+
+
+def padded_box(obj: Dict[str, Any]) -> Optional[Tuple[float, float,
+                                                       float, float]]:
+    """
+    This function calculates the box an object may draw in, with its line
+    width and a pixel to spare.
+    :param obj: The information of the object.
+    :return: The box (x1, y1, x2, y2), or None for text, whose size depends
+             on the fonts installed.
+    """
+    if obj["type"] == "text" or len(obj["coords"]) < 2:
+        return None
+    try:
+        pad = float(obj.get("width", 1)) / 2 + 1
+    except ValueError:
+        pad = 1
+    xs, ys = obj["coords"][::2], obj["coords"][1::2]
+    return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+
+
+def is_cover(obj: Dict[str, Any]) -> bool:
+    """
+    This function checks whether an object's fill can cover other objects
+    exactly: filled rectangles, ovals and convex polygons.
+    :param obj: The information of the object.
+    :return: True if the object can cover others, False otherwise.
+    """
+    if obj["type"] not in COVER_TYPES or obj.get("fill", "") == "":
+        return False
+    points = np.asarray(obj["coords"], dtype=float).reshape(-1, 2)
+    if obj["type"] != "polygon":
+        return len(points) == 2
+    if len(points) < 3 or polygon_area(points) == 0:
+        return False
+    # Concave and crossing polygons are not tested, their fill has holes
+    # a box can not be checked against by its corners
+    edges = np.roll(points, -1, axis=0) - points
+    next_edges = np.roll(edges, -1, axis=0)
+    turns = edges[:, 0] * next_edges[:, 1] - edges[:, 1] * next_edges[:, 0]
+    if not (np.all(turns >= 0) or np.all(turns <= 0)):
+        return False
+    # A star turns the same way at every vertex too, but goes around twice
+    angles = np.arctan2(turns, np.einsum("ij,ij->i", edges, next_edges))
+    return bool(np.isclose(abs(angles.sum()), 2 * np.pi))
+
+
+def covered_corners(cover: Dict[str, Any], boxes: np.ndarray) -> np.ndarray:
+    """
+    This function checks which boxes are completely inside the fill of
+    a cover, by testing their corners, which is exact for convex fills.
+    :param cover: The information of the covering object, see is_cover.
+    :param boxes: An array of shape (n, 4) of the boxes.
+    :return: A boolean array of shape (n,), True for the covered boxes.
+    """
+    points = np.asarray(cover["coords"], dtype=float).reshape(-1, 2)
+    corners = np.stack([boxes[:, [0, 1]], boxes[:, [2, 1]],
+                        boxes[:, [2, 3]], boxes[:, [0, 3]]], axis=1)
+    if cover["type"] == "rectangle":
+        low, high = points.min(axis=0), points.max(axis=0)
+        inside = np.all((corners >= low) & (corners <= high), axis=2)
+    elif cover["type"] == "oval":
+        center = points.mean(axis=0)
+        radii = np.abs(points[1] - points[0]) / 2
+        if np.any(radii == 0):
+            return np.zeros(len(boxes), dtype=bool)
+        inside = np.sum(((corners - center) / radii) ** 2, axis=2) <= 1
+    else:
+        if polygon_area(points) < 0:
+            points = points[::-1]
+        starts, ends = points, np.roll(points, -1, axis=0)
+        # A point is inside a convex polygon if it is left of every edge
+        cross = (ends[:, 0] - starts[:, 0]) * \
+            (corners[..., np.newaxis, 1] - starts[:, 1]) - \
+            (ends[:, 1] - starts[:, 1]) * \
+            (corners[..., np.newaxis, 0] - starts[:, 0])
+        inside = np.all(cross >= 0, axis=2)
+    return np.all(inside, axis=1)
+
+
+def find_occluded(objects: Sequence[Dict[str, Any]]) -> List[int]:
+    """
+    This function finds the objects that are completely covered by a filled
+    shape above them on the same layer. The objects are swept by the left
+    side of their boxes, so each cover only tests the objects whose boxes
+    start inside it, and those are tested exactly.
+    :param objects: The information of the objects, bottom first.
+    :return: The indices of the covered objects, in order.
+    """
+    all_boxes = [padded_box(obj) for obj in objects]
+    indices = [i for i, box in enumerate(all_boxes) if box is not None]
+    if not indices:
+        return []
+    boxes = np.array([all_boxes[i] for i in indices])
+    order = np.argsort(boxes[:, 0], kind="stable")
+    lefts = boxes[order, 0]
+    positions = np.array(indices)
+    occluded: Set[int] = set()
+    for c, cover in enumerate(objects):
+        if not is_cover(cover):
+            continue
+        xs, ys = cover["coords"][::2], cover["coords"][1::2]
+        start = np.searchsorted(lefts, min(xs), side="left")
+        end = np.searchsorted(lefts, max(xs), side="right")
+        candidates = order[start:end]
+        candidates = candidates[positions[candidates] < c]
+        candidate_boxes = boxes[candidates]
+        # The boxes have to be inside the cover's box to be inside its fill
+        candidates = candidates[(candidate_boxes[:, 2] <= max(xs)) &
+                                (candidate_boxes[:, 1] >= min(ys)) &
+                                (candidate_boxes[:, 3] <= max(ys))]
+        candidates = [n for n in candidates
+                      if objects[positions[n]].get("layer") ==
+                      cover.get("layer")]
+        if not candidates:
+            continue
+        covered = covered_corners(cover, boxes[candidates])
+        occluded.update(int(positions[n])
+                        for n, is_covered in zip(candidates, covered)
+                        if is_covered)
+    return sorted(occluded)
+
+
+class CullReport:
+    """
+    Class that represents what culling a drawing found.
+
+    Attributes:
+        found (Dict[str, List[int]]): The indices of the objects found
+                                      for each reason in CULL_REASONS.
+        object_count (int): The amount of objects before culling.
+        bytes_before (int): The size of the objects when saved, in bytes.
+        bytes_after (int): The size of the objects left, when saved.
+    """
+
+    def __init__(self, found: Dict[str, List[int]], object_count: int,
+                 bytes_before: int, bytes_after: int) -> None:
+        """
+        Initialize the report.
+        :param found: The indices of the objects found for each reason.
+        :param object_count: The amount of objects before culling.
+        :param bytes_before: The size of the objects when saved, in bytes.
+        :param bytes_after: The size of the objects left, when saved.
+        """
+        self.found: Dict[str, List[int]] = found
+        self.object_count: int = object_count
+        self.bytes_before: int = bytes_before
+        self.bytes_after: int = bytes_after
+
+    def removed(self) -> List[int]:
+        """
+        This function returns the objects that culling removes.
+        :return: Their indices, in order, each only once.
+        """
+        return sorted(set().union(*self.found.values()))
+
+    def __str__(self) -> str:
+        lines = [f"{len(self.found[reason])} {reason}" for reason in
+                 CULL_REASONS]
+        lines.append(f"{len(self.removed())} of {self.object_count} objects"
+                     f" removed, {self.bytes_before - self.bytes_after}"
+                     f" of {self.bytes_before} bytes saved")
+        return "\n".join(lines)
+
+
+def cull(objects: Sequence[Dict[str, Any]]) \
+        -> Tuple[List[Dict[str, Any]], CullReport]:
+    """
+    This function removes the objects that are never seen: degenerate
+    objects, copies below their exact duplicates, and objects covered
+    by a filled shape above them.
+    :param objects: The information of the objects, bottom first,
+                    as returned by file_manager.get_item_info.
+    :return: The objects that are left, bottom first, and the report of
+             what was removed.
+    """
+    found: Dict[str, List[int]] = {
+        "degenerate": [i for i, obj in enumerate(objects)
+                       if is_degenerate(obj)]}
+    found["duplicate"] = find_duplicates(objects)
+    found["occluded"] = find_occluded(objects)
+    removed = set().union(*found.values())
+    kept = [obj for i, obj in enumerate(objects) if i not in removed]
+    bytes_before = len(json.dumps(list(objects)))
+    # Every object is followed by ", " in the saved list
+    bytes_saved = sum(len(json.dumps(objects[i])) + 2 for i in removed)
+    report = CullReport(found, len(objects), bytes_before,
+                        bytes_before - bytes_saved)
+    return kept, report
+
+
+def optimize(objects: Sequence[Dict[str, Any]], tolerance: float = 0.0,
+             is_cull: bool = False) -> List[Dict[str, Any]]:
+    """
+    This function makes a drawing smaller: it joins pencil strokes into
+    polylines, simplifies them if a tolerance is given, and removes the
+    objects that are never seen if asked to.
+    :param objects: The information of the objects, bottom first,
+                    as returned by file_manager.get_item_info.
+    :param tolerance: How far simplified lines may move, in canvas pixels.
+                      Defaults to 0, which keeps every point.
+    :param is_cull: Whether to remove the objects that are never seen,
+                    see cull. Defaults to False.
+    :return: The information of the objects after optimizing, bottom first.
+    """
+    optimized = merge_strokes(objects)
+    if tolerance > 0:
+        for obj in optimized:
+            if obj["type"] == "line":
+                obj["coords"] = simplify(obj["coords"], tolerance)
+    if is_cull:
+        optimized, _ = cull(optimized)
+    return optimized
+
+
+def read_objects(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    This function reads a saved canvas, compressed or not.
+    :param path: The path of the file of the canvas.
+    :return: The canvas itself, and its objects with their styles.
+    """
+    entries = read_canvas(path)
+    # The first entry is the canvas itself, not an object
+    header = entries[0]
+    return header, unpack_styles(header.get("styles", []), entries[1:])
+
+
+def optimize_file(path: str, out_path: Optional[str] = None,
+                  tolerance: float = 0.0,
+                  is_cull: bool = False) -> Dict[str, int]:
+    """
+    This function optimizes a saved canvas.
+    :param path: The path of the .JSON file of the canvas.
+    :param out_path: Where to save the optimized canvas, compressed by its
+                     extension, see canvas_file. Defaults to None, which
+                     overwrites the canvas, compressed as it was.
+    :param tolerance: How far simplified lines may move, in canvas pixels.
+                      Defaults to 0, which keeps every point.
+    :param is_cull: Whether to remove the objects that are never seen.
+                    Defaults to False.
+    :return: The amount of objects before and after optimizing.
+    """
+    header, objects = read_objects(path)
+    optimized = optimize(objects, tolerance, is_cull)
+    if optimized != objects:
+        # The saved history leads to the objects before optimizing
+        header.pop("history", None)
+        header.pop("next_id", None)
+    header["styles"], packed = pack_styles(optimized)
+    write_canvas(out_path or path, [header] + packed,
+                 compression_for(out_path) if out_path
+                 else detect_compression(path))
+    return {"before": len(objects), "after": len(optimized)}
+
+
+def main() -> None:
+    """
+    This function optimizes the canvas given on the command line.
+    """
+    parser = argparse.ArgumentParser(
+        description="Join the pencil strokes of a saved canvas into polylines.")
+    parser.add_argument("path", help="the .JSON file of the canvas")
+    parser.add_argument("out_path", nargs="?",
+                        help="where to save the optimized canvas,"
+                             " the canvas itself by default")
+    parser.add_argument("--simplify", type=float, default=0.0,
+                        metavar="TOLERANCE",
+                        help="leave out points closer than TOLERANCE pixels"
+                             " to the stroke")
+    parser.add_argument("--cull", action="store_true",
+                        help="also remove degenerate, duplicate and covered"
+                             " objects")
+    parser.add_argument("--report", action="store_true",
+                        help="only report what --cull would remove")
+    args = parser.parse_args()
+    if args.report:
+        print(cull(merge_strokes(read_objects(args.path)[1]))[1])
+        return
+    counts = optimize_file(args.path, args.out_path, args.simplify, args.cull)
+    print(f"{counts['before']} objects became {counts['after']}")
+
+
+if __name__ == '__main__':
+    main()
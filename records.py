@@ -0,0 +1,180 @@
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple, Type
+import sys
+
+
+def intern(value: Any) -> Any:
+    """
+    This function makes equal strings share one string object, so the colors,
+    widths and fonts used by many objects are only kept once.
+    :param value: The value to intern.
+    :return: The interned string, or the value if it is not a string.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record(Mapping):
+    """
+    Class that represents a read-only dictionary whose keys are the slots of
+    its class. The key of a slot that was not set is missing, like a key
+    that was not put in a dictionary. Records have no hash table of their
+    own, so they take a fraction of the memory of dictionaries, and they
+    are equal to the dictionaries that have the same keys and values.
+
+    Attributes:
+        KEYS (Tuple[str, ...]): The keys a record of the class can have.
+    """
+    __slots__ = ()
+    KEYS: Tuple[str, ...] = ()
+
+    def __init__(self, values: Mapping) -> None:
+        """
+        Initialize a record.
+        :param values: The value of each key, all of them in KEYS.
+        """
+        for key, value in values.items():
+            setattr(self, key, intern(value))
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.KEYS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass  # The slot was not set
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.KEYS and hasattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self.KEYS if hasattr(self, key))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    @classmethod
+    def fits(cls, values: Mapping) -> bool:
+        """
+        This function checks whether a record of the class can hold values.
+        :param values: The values.
+        :return: True if all the keys of the values are in KEYS.
+        """
+        return all(key in cls.KEYS for key in values)
+
+
+class ObjectInfo(Record):
+    """
+    Class that represents the information of an object, as returned by
+    file_manager.get_item_info. The coordinates are kept as 32 bit floats,
+    which are exact for whole and half pixels. Each type of object has
+    its own subclass, with the keys get_item_info returns for it.
+    """
+    __slots__ = ()
+
+    def __init__(self, values: Mapping) -> None:
+        super().__init__(values)
+        if "coords" in values:
+            self.coords = array("f", values["coords"])
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+        # A new list, like the coordinates get_item_info returns
+        return value.tolist() if key == "coords" else value
+
+
+class LineInfo(ObjectInfo):
+    """
+    Class that represents the information of a line.
+    """
+    __slots__ = KEYS = ("type", "coords", "fill", "width", "layer", "id")
+
+
+class ShapeInfo(ObjectInfo):
+    """
+    Class that represents the information of a rectangle, an oval
+    or a polygon.
+    """
+    __slots__ = KEYS = ("type", "coords", "fill", "outline", "width",
+                        "layer", "id")
+
+
+class TextInfo(ObjectInfo):
+    """
+    Class that represents the information of a text.
+    """
+    __slots__ = KEYS = ("type", "coords", "text", "fill", "font", "layer",
+                        "id")
+
+
+# The record the information of each type of object is kept as
+INFO_RECORDS: Dict[str, Type[ObjectInfo]] = {
+    "line": LineInfo,
+    "rectangle": ShapeInfo,
+    "oval": ShapeInfo,
+    "polygon": ShapeInfo,
+    "text": TextInfo
+}
+
+
+class ObjectAction(Record):
+    """
+    Class that represents an action that drew or deleted an object.
+    """
+    __slots__ = KEYS = ("type", "object", "info")
+
+
+class StateChange(Record):
+    """
+    Class that represents an action that changed one option of an object,
+    from its previous state to its new state.
+    """
+    __slots__ = KEYS = ("type", "object", "prev_state", "new_state")
+
+
+# The record each type of action is kept as, the other actions stay
+# dictionaries. Those are the actions done on one object at a time,
+# which are most of the actions of a drawing.
+ACTION_RECORDS: Dict[str, Type[Record]] = {
+    'drawing': ObjectAction,
+    'delete object': ObjectAction,
+    'moving': StateChange,
+    'change outline color': StateChange,
+    'change fill': StateChange,
+    'change width': StateChange,
+    'change layer': StateChange,
+    'changing order': StateChange
+}
+
+
+def compact(value: Any) -> Any:
+    """
+    This function replaces the actions and the information of objects in
+    a value with records, however deep in lists and dictionaries they are.
+    :param value: The value, for example an action as kept in
+                  CanvasApp.actions.
+    :return: The compact value. Records, values that are not lists or
+             dictionaries and values that are already compact are returned
+             as they are, so a redone action is still the undone one.
+    """
+    if isinstance(value, list):
+        items = [compact(item) for item in value]
+        return value if all(new is old for new, old in zip(items, value)) \
+            else items
+    if not isinstance(value, dict):
+        return value
+    value_type = value.get("type")
+    if isinstance(value_type, str):
+        info_record = INFO_RECORDS.get(value_type)
+        if info_record is not None and info_record.fits(value):
+            return info_record(value)
+        record = ACTION_RECORDS.get(value_type)
+        if record is not None and record.fits(value):
+            return record({key: compact(item)
+                           for key, item in value.items()})
+    compacted = {key: compact(item) for key, item in value.items()}
+    return value if all(compacted[key] is item
+                        for key, item in value.items()) else compacted
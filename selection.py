@@ -0,0 +1,54 @@
+from typing import List, Sequence
+import numpy as np
+
+CHUNK_POINTS: int = 4096  # How many points are tested against a lasso at once
+
+
+def points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """
+    This function checks which points are inside a polygon, by the even-odd
+    rule, testing all the points against all the edges at once.
+    :param points: An array of shape (n, 2) of the points.
+    :param polygon: An array of shape (m, 2) of the polygon's vertices.
+    :return: A boolean array of shape (n,), True for the points inside.
+    """
+    inside = np.zeros(len(points), dtype=bool)
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    # The other end of every edge, the last edge closes the polygon
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    for start in range(0, len(points), CHUNK_POINTS):
+        chunk = points[start:start + CHUNK_POINTS]
+        px, py = chunk[:, 0:1], chunk[:, 1:2]
+        # The edges that a horizontal ray from each point could cross
+        crosses = (y1 > py) != (y2 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_at = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        hits = crosses & (px < x_at)
+        inside[start:start + CHUNK_POINTS] = np.count_nonzero(hits, axis=1) % 2 == 1
+    return inside
+
+
+def objects_in_lasso(coords: Sequence[Sequence[float]],
+                     lasso: Sequence[float]) -> List[int]:
+    """
+    This function finds the objects that are completely inside a lasso.
+    :param coords: The flat coordinates of each object's points.
+    :param lasso: The flat coordinates of the lasso's points.
+    :return: The indices (in coords) of the objects whose points are all
+             inside the lasso.
+    """
+    polygon = np.asarray(lasso, dtype=float).reshape(-1, 2)
+    if len(polygon) < 3:
+        return []
+    # Objects without points are never inside
+    indices = [i for i, object_coords in enumerate(coords)
+               if len(object_coords) >= 2]
+    if not indices:
+        return []
+    counts = np.array([len(coords[i]) // 2 for i in indices])
+    points = np.concatenate([np.asarray(coords[i][:counts[n] * 2], dtype=float)
+                             for n, i in enumerate(indices)]).reshape(-1, 2)
+    inside = points_in_polygon(points, polygon)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    all_inside = np.logical_and.reduceat(inside, starts)
+    return [indices[n] for n in np.flatnonzero(all_inside)]
@@ -0,0 +1,172 @@
+from typing import Dict, List, Tuple, Optional, Sequence, Iterable
+import numpy as np
+import math
+
+DEFAULT_CELL_SIZE: int = 64  # The size of a grid cell, in canvas pixels
+# The types of objects whose coordinates are two corners of a box
+BOX_TYPES: List[str] = ["rectangle", "oval", "text"]
+# The types of objects whose last point connects back to their first
+CLOSED_TYPES: List[str] = ["polygon"]
+
+Point = Tuple[float, float]
+Cell = Tuple[int, int]
+
+
+def snap_to_grid(x: float, y: float, spacing: float) -> Point:
+    """
+    This function moves a point to the nearest crossing of a grid.
+    :param x: The x coordinate of the point.
+    :param y: The y coordinate of the point.
+    :param spacing: The distance between the lines of the grid.
+    :return: The nearest crossing of the grid.
+    """
+    return round(x / spacing) * spacing, round(y / spacing) * spacing
+
+
+def snap_points(obj_type: str, coords: Sequence[float]) -> np.ndarray:
+    """
+    This function finds the points of an object that others snap to:
+    its vertices, the midpoints of its edges and the corners of its
+    bounding box. Boxes also snap to their center.
+    :param obj_type: The type of the object. Text objects are given by the
+                     two corners of their bounding box.
+    :param coords: The flat coordinates of the object.
+    :return: An array of shape (n, 2) of the points.
+    """
+    points = np.asarray(coords[:len(coords) // 2 * 2],
+                        dtype=float).reshape(-1, 2)
+    if not len(points):
+        return points
+    low, high = points.min(axis=0), points.max(axis=0)
+    corners = np.array([low, [high[0], low[1]], high, [low[0], high[1]]])
+    if obj_type in BOX_TYPES:
+        # The edges of a box are the edges of its bounding box
+        edges = np.vstack((corners, corners[:1]))
+        midpoints = (edges[:-1] + edges[1:]) / 2
+        return np.vstack((corners, midpoints, (low + high) / 2))
+    edges = np.vstack((points, points[:1])) if obj_type in CLOSED_TYPES \
+        else points
+    midpoints = (edges[:-1] + edges[1:]) / 2
+    return np.vstack((points, midpoints, corners))
+
+
+class SnapIndex:
+    """
+    Class that represents the points objects snap to, kept in a uniform
+    grid, so finding the nearest point only looks at the cells around it.
+    The points of an object are replaced whenever the object changes,
+    touching only the cells they were and are in.
+
+    Attributes:
+        cell_size (int): The size of a grid cell.
+    """
+
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE) -> None:
+        """
+        Initialize an empty index.
+        :param cell_size: The size of a grid cell.
+                          Defaults to DEFAULT_CELL_SIZE.
+        """
+        self.cell_size: int = cell_size
+        # The points of every key in each cell
+        self.__cells: Dict[Cell, Dict[int, np.ndarray]] = {}
+        self.__points: Dict[int, np.ndarray] = {}
+        self.__cells_of: Dict[int, List[Cell]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__points)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.__points
+
+    def insert(self, key: int, points: np.ndarray) -> None:
+        """
+        This function sets the points of a key, replacing its old points.
+        :param key: The key of the points, usually the id of an object.
+        :param points: An array of shape (n, 2) of the points.
+        """
+        self.remove(key)
+        points = points[np.isfinite(points).all(axis=1)]
+        if not len(points):
+            return
+        self.__points[key] = points
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        # Sort the points by cell, so each cell's points are a slice
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        cells, points = cells[order], points[order]
+        changes = np.flatnonzero(np.any(cells[1:] != cells[:-1], axis=1)) + 1
+        starts = np.concatenate(([0], changes))
+        ends = np.concatenate((changes, [len(points)]))
+        cells_of: List[Cell] = []
+        for start, end in zip(starts, ends):
+            cell = (int(cells[start, 0]), int(cells[start, 1]))
+            self.__cells.setdefault(cell, {})[key] = points[start:end]
+            cells_of.append(cell)
+        self.__cells_of[key] = cells_of
+
+    def remove(self, key: int) -> None:
+        """
+        This function removes the points of a key.
+        Removing a missing key does nothing.
+        :param key: The key of the points.
+        """
+        if self.__points.pop(key, None) is None:
+            return
+        for cell in self.__cells_of.pop(key):
+            in_cell = self.__cells[cell]
+            del in_cell[key]
+            if not in_cell:
+                del self.__cells[cell]
+
+    def points(self, key: int) -> np.ndarray:
+        """
+        This function returns the points of a key.
+        :param key: The key of the points.
+        :return: An array of shape (n, 2) of the points,
+                 empty for a missing key.
+        """
+        return self.__points.get(key, np.empty((0, 2)))
+
+    def nearest(self, x: float, y: float, radius: float,
+                exclude: Iterable[int] = ()) -> Optional[Point]:
+        """
+        This function finds the nearest point to a location.
+        :param x: The x coordinate of the location.
+        :param y: The y coordinate of the location.
+        :param radius: How far from the location points are looked for.
+        :param exclude: The keys whose points are left out, like the object
+                        that is being drawn. Defaults to no keys.
+        :return: The nearest point, or None if no point is within radius.
+        """
+        excluded = set(exclude)
+        size = self.cell_size
+        col1, row1 = math.floor((x - radius) / size), \
+            math.floor((y - radius) / size)
+        col2, row2 = math.floor((x + radius) / size), \
+            math.floor((y + radius) / size)
+        if (col2 - col1 + 1) * (row2 - row1 + 1) > len(self.__cells):
+            # The radius covers more cells than there are in use
+            cells: Iterable[Dict[int, np.ndarray]] = self.__cells.values()
+        else:
+            cells = [self.__cells[(col, row)]
+                     for col in range(col1, col2 + 1)
+                     for row in range(row1, row2 + 1)
+                     if (col, row) in self.__cells]
+        found = [points for in_cell in cells
+                 for key, points in in_cell.items() if key not in excluded]
+        if not found:
+            return None
+        candidates = np.concatenate(found)
+        distances = np.hypot(candidates[:, 0] - x, candidates[:, 1] - y)
+        closest = int(np.argmin(distances))
+        if distances[closest] > radius:
+            return None
+        return float(candidates[closest, 0]), float(candidates[closest, 1])
+
+    def clear(self) -> None:
+        """
+        This function empties the index.
+        """
+        self.__cells.clear()
+        self.__points.clear()
+        self.__cells_of.clear()
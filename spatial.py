@@ -0,0 +1,184 @@
+from typing import Dict, Set, Tuple, Iterable, Iterator
+import math
+
+BBox = Tuple[float, float, float, float]  # (x1, y1, x2, y2)
+
+DEFAULT_CELL_SIZE: int = 256  # The size of a grid cell, in canvas pixels
+MAX_CELLS: int = 64  # Boxes covering more cells than this are kept aside
+
+
+def boxes_overlap(first: BBox, second: BBox) -> bool:
+    """
+    This function checks whether two bounding boxes overlap.
+    :param first: The first bounding box.
+    :param second: The second bounding box.
+    :return: True if the boxes overlap (or touch), False otherwise.
+    """
+    return (first[0] <= second[2] and second[0] <= first[2] and
+            first[1] <= second[3] and second[1] <= first[3])
+
+
+def box_contains(outer: BBox, inner: BBox) -> bool:
+    """
+    This function checks whether a bounding box contains another one.
+    :param outer: The bounding box that may contain inner.
+    :param inner: The bounding box that may be contained in outer.
+    :return: True if outer contains inner, False otherwise.
+    """
+    return (outer[0] <= inner[0] and outer[1] <= inner[1] and
+            inner[2] <= outer[2] and inner[3] <= outer[3])
+
+
+def grow_box(box: BBox, amount: float) -> BBox:
+    """
+    This function grows a bounding box on every side.
+    :param box: The bounding box.
+    :param amount: How much to grow each side by.
+    :return: The grown bounding box.
+    """
+    return box[0] - amount, box[1] - amount, box[2] + amount, box[3] + amount
+
+
+class GridIndex:
+    """
+    Class that represents a spatial index of bounding boxes over a uniform
+    grid, answering "which boxes overlap this region" without scanning
+    all the boxes.
+
+    Attributes:
+        cell_size (int): The size of a grid cell.
+    """
+
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE) -> None:
+        """
+        Initialize an empty index.
+        :param cell_size: The size of a grid cell.
+                          Defaults to DEFAULT_CELL_SIZE.
+        """
+        self.cell_size: int = cell_size
+        self.__cells: Dict[Tuple[int, int], Set[int]] = {}
+        self.__boxes: Dict[int, BBox] = {}
+        # Keys whose boxes are too big to be put in the grid
+        self.__large: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.__boxes)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.__boxes
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.__boxes)
+
+    def __cell_range(self, box: BBox) -> Tuple[int, int, int, int]:
+        """
+        This function finds the grid cells a bounding box covers.
+        :param box: The bounding box.
+        :return: The first and last cell columns and rows.
+        """
+        size = self.cell_size
+        return (math.floor(box[0] / size), math.floor(box[1] / size),
+                math.floor(box[2] / size), math.floor(box[3] / size))
+
+    def __cell_count(self, box: BBox) -> int:
+        """
+        This function counts the grid cells a bounding box covers.
+        :param box: The bounding box.
+        :return: The amount of cells box covers.
+        """
+        col1, row1, col2, row2 = self.__cell_range(box)
+        return (col2 - col1 + 1) * (row2 - row1 + 1)
+
+    def insert(self, key: int, box: BBox) -> None:
+        """
+        This function adds a bounding box to the index.
+        :param key: The key of the box.
+        :param box: The bounding box.
+        """
+        if key in self.__boxes:
+            self.remove(key)
+        self.__boxes[key] = box
+        if self.__cell_count(box) > MAX_CELLS:
+            self.__large.add(key)
+            return
+        col1, row1, col2, row2 = self.__cell_range(box)
+        for col in range(col1, col2 + 1):
+            for row in range(row1, row2 + 1):
+                self.__cells.setdefault((col, row), set()).add(key)
+
+    def remove(self, key: int) -> None:
+        """
+        This function removes a bounding box from the index.
+        Removing a missing key does nothing.
+        :param key: The key of the box.
+        """
+        box = self.__boxes.pop(key, None)
+        if box is None:
+            return
+        if key in self.__large:
+            self.__large.discard(key)
+            return
+        col1, row1, col2, row2 = self.__cell_range(box)
+        for col in range(col1, col2 + 1):
+            for row in range(row1, row2 + 1):
+                cell = self.__cells.get((col, row))
+                if cell is not None:
+                    cell.discard(key)
+                    if not cell:
+                        del self.__cells[(col, row)]
+
+    def update(self, key: int, box: BBox) -> None:
+        """
+        This function changes the bounding box of a key.
+        :param key: The key of the box.
+        :param box: The new bounding box.
+        """
+        old = self.__boxes.get(key)
+        if old is not None and key not in self.__large and \
+                self.__cell_range(old) == self.__cell_range(box):
+            # Still in the same cells, only the box itself changes
+            self.__boxes[key] = box
+            return
+        self.insert(key, box)
+
+    def bbox(self, key: int) -> BBox:
+        """
+        This function returns the bounding box of a key.
+        :param key: The key of the box.
+        :return: The bounding box of key.
+        """
+        return self.__boxes[key]
+
+    def query(self, x1: float, y1: float, x2: float, y2: float) -> Set[int]:
+        """
+        This function finds all the boxes that overlap a region.
+        :param x1: The left side of the region.
+        :param y1: The top side of the region.
+        :param x2: The right side of the region.
+        :param y2: The bottom side of the region.
+        :return: The keys of the boxes that overlap the region.
+        """
+        region: BBox = (x1, y1, x2, y2)
+        if not all(math.isfinite(value) for value in region) or \
+                self.__cell_count(region) > len(self.__cells):
+            # The region covers more cells than there are in use
+            candidates: Iterable[int] = self.__boxes
+        else:
+            col1, row1, col2, row2 = self.__cell_range(region)
+            found: Set[int] = set(self.__large)
+            for col in range(col1, col2 + 1):
+                for row in range(row1, row2 + 1):
+                    cell = self.__cells.get((col, row))
+                    if cell:
+                        found.update(cell)
+            candidates = found
+        return {key for key in candidates
+                if boxes_overlap(self.__boxes[key], region)}
+
+    def clear(self) -> None:
+        """
+        This function empties the index.
+        """
+        self.__cells.clear()
+        self.__boxes.clear()
+        self.__large.clear()
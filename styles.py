@@ -0,0 +1,116 @@
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+# The options of objects that make their style, which most objects share
+# with many others
+STYLE_OPTIONS: Tuple[str, ...] = ("fill", "outline", "width", "font")
+
+# The key of the style of an object in a saved canvas
+STYLE_KEY: str = "style"
+
+
+class StyleTable:
+    """
+    Class that represents a registry of styles: the values of the style
+    options of objects. Each style is kept once, and objects refer to it
+    by its id, the position of the style in the table.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty table.
+        """
+        self.__styles: List[Dict[str, Any]] = []
+        self.__ids: Dict[Tuple[Tuple[str, Any], ...], int] = {}
+
+    def add(self, style: Mapping[str, Any]) -> int:
+        """
+        This function finds the id of a style, which is added to the table
+        if it is not in it yet.
+        :param style: The values of the style options.
+        :return: The id of the style.
+        :raise TypeError: If a value of the style can not be hashed.
+        """
+        key = tuple(sorted(style.items()))
+        style_id = self.__ids.get(key)
+        if style_id is None:
+            style_id = self.__ids[key] = len(self.__styles)
+            self.__styles.append(dict(key))
+        return style_id
+
+    def __getitem__(self, style_id: int) -> Dict[str, Any]:
+        """
+        This function returns a style. The returned dictionary is shared by
+        all the objects of the style, so it must not be changed.
+        :param style_id: The id of the style.
+        :return: The values of the style options.
+        """
+        return self.__styles[style_id]
+
+    def __len__(self) -> int:
+        return len(self.__styles)
+
+    def styles(self) -> List[Dict[str, Any]]:
+        """
+        This function returns all the styles, the way they are saved.
+        :return: A copy of every style, by id.
+        """
+        return [dict(style) for style in self.__styles]
+
+
+def pack_styles(objects: Iterable[Mapping[str, Any]]) \
+        -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    This function moves the style options of objects to a style table,
+    the way canvases are saved. Objects whose style can not be hashed keep
+    their style options.
+    :param objects: The information of the objects,
+                    as returned by file_manager.get_item_info.
+    :return: The styles, by id, and the objects, which refer to their style
+             by its id. The given objects are not changed.
+    """
+    table = StyleTable()
+    packed: List[Dict[str, Any]] = []
+    for obj in objects:
+        style = {option: obj[option] for option in STYLE_OPTIONS
+                 if option in obj}
+        try:
+            style_id = table.add(style)
+        except TypeError:
+            packed.append(dict(obj))
+            continue
+        packed_obj = {key: value for key, value in obj.items()
+                      if key not in STYLE_OPTIONS}
+        packed_obj[STYLE_KEY] = style_id
+        packed.append(packed_obj)
+    return table.styles(), packed
+
+
+def unpack_styles(styles: Sequence[Mapping[str, Any]],
+                  objects: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    This function puts the style options of objects back in them.
+    :param styles: The styles, by id, as returned by pack_styles.
+    :param objects: The objects, those that have no style id keep their
+                    style options, like the objects of older canvases.
+    :return: The information of the objects, with their style options.
+    """
+    unpacked: List[Dict[str, Any]] = []
+    for obj in objects:
+        if STYLE_KEY in obj:
+            style = styles[obj[STYLE_KEY]]
+            obj = {key: value for key, value in obj.items()
+                   if key != STYLE_KEY}
+            obj.update(style)
+        unpacked.append(obj)
+    return unpacked
+
+
+def is_valid_style_id(style_id: Any, styles: Sequence[Any]) -> bool:
+    """
+    This function checks whether a saved style id refers to a style.
+    :param style_id: The style id.
+    :param styles: The styles, by id.
+    :return: True if style_id is the id of one of the styles.
+    """
+    return isinstance(style_id, int) and not isinstance(style_id, bool) and \
+        0 <= style_id < len(styles)
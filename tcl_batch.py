@@ -0,0 +1,106 @@
+from typing import List, Dict, Optional, Any, Sequence
+import tkinter as tk
+import re
+
+# The characters that Tcl would substitute or split words at
+_SPECIAL = re.compile(r'([\\{}\[\]$";\s])')
+# The variable the ids of the created items are collected in
+_IDS_VARIABLE: str = "::paintor_batch_ids"
+
+
+def tcl_word(value: Any) -> str:
+    """
+    This function converts a value to one word of a Tcl script,
+    escaping every character Tcl would otherwise substitute.
+    Lists and tuples become Tcl lists, as tkinter passes them.
+    :param value: The value to convert.
+    :return: The Tcl word.
+    """
+    if isinstance(value, (list, tuple)):
+        value = " ".join(tcl_word(element) for element in value)
+    elif isinstance(value, float):
+        value = repr(value)
+    else:
+        value = str(value)
+    if not value:
+        return "{}"
+    return _SPECIAL.sub(lambda match: "\\n" if match.group(1) == "\n"
+                        else "\\" + match.group(1), value)
+
+
+class TclBatch:
+    """
+    Class that represents many commands of a canvas, collected into one
+    Tcl script that is evaluated at once. Each command of a canvas costs a
+    round trip between Python and Tcl, and the option processing of tkinter,
+    so bulk changes are much faster in a batch.
+
+    Attributes:
+        widget (tk.Misc): The canvas the commands are sent to.
+    """
+
+    def __init__(self, widget: tk.Misc) -> None:
+        """
+        Initialize the batch.
+        :param widget: The canvas the commands are sent to.
+        """
+        self.widget: tk.Misc = widget
+        self.__commands: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.__commands)
+
+    def add(self, *args: Any) -> None:
+        """
+        This function adds a command of the canvas to the batch,
+        for example add('coords', tk_id, 0, 0, 10, 10).
+        :param args: The command and its arguments.
+        """
+        self.__commands.append(" ".join(
+            [tcl_word(str(self.widget))] + [tcl_word(arg) for arg in args]))
+
+    def create(self, itemType: str, coords: Sequence[float],
+               options: Dict[str, Any], below: Optional[int] = None) -> None:
+        """
+        This function adds the creation of an item to the batch.
+        An item that Tk refuses, because of a bad option for example,
+        does not stop the rest of the batch.
+        :param itemType: The type of the item, 'line' for example.
+        :param coords: The flat coordinates of the item.
+        :param options: The options of the item.
+        :param below: The Tk id of an item to put the new item right below.
+                      Defaults to None, which leaves it on top.
+        """
+        words = [tcl_word(str(self.widget)), "create", tcl_word(itemType)]
+        words.extend(tcl_word(value) for value in coords)
+        for option, value in options.items():
+            words.append(tcl_word("-" + option))
+            words.append(tcl_word(value))
+        command = " ".join(words)
+        # A refused item gets an empty id
+        on_success = f"lappend {_IDS_VARIABLE} $id"
+        if below is not None:
+            on_success += f"; {tcl_word(str(self.widget))} lower $id {below}"
+        self.__commands.append(
+            f"if {{[catch {{{command}}} id]}} "
+            f"{{lappend {_IDS_VARIABLE} {{}}}} else {{{on_success}}}")
+
+    def run(self) -> List[Optional[int]]:
+        """
+        This function evaluates all the commands of the batch in one call,
+        and empties the batch.
+        :return: The Tk ids of the created items, in the order they were
+                 added, None for the items Tk refused.
+        """
+        if not self.__commands:
+            return []
+        script = "\n".join([f"set {_IDS_VARIABLE} {{}}"] + self.__commands +
+                           [f"set {_IDS_VARIABLE}"])
+        self.__commands = []
+        tk_app = self.widget.tk
+        try:
+            result = tk_app.eval(script)
+        finally:
+            tk_app.eval(f"unset -nocomplain {_IDS_VARIABLE} id")
+        return [int(tk_id) if tk_id else None
+                for tk_id in tk_app.splitlist(result)]
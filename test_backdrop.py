@@ -0,0 +1,42 @@
+from backdrop import render_tile, tile_range, tile_region, TILE_SIZE
+from typing import Optional, Tuple
+
+COLORS = {"black": (0, 0, 0), "red": (255, 0, 0), "white": (255, 255, 255)}
+
+
+def to_rgb(color: str) -> Optional[Tuple[int, int, int]]:
+    return COLORS.get(color)
+
+
+def test_tile_range() -> None:
+    assert tile_range((0, 0, TILE_SIZE - 1, TILE_SIZE - 1), 1) == (0, 0, 0, 0)
+    assert tile_range((-1, 0, TILE_SIZE, 10), 1) == (-1, 0, 1, 0)
+    # Zooming in makes every tile cover less of the canvas
+    assert tile_range((0, 0, TILE_SIZE, TILE_SIZE), 2) == (0, 0, 2, 2)
+    assert tile_region(1, -1, 2) == (TILE_SIZE / 2, -TILE_SIZE / 2,
+                                     TILE_SIZE, 0)
+
+
+def test_render_tile() -> None:
+    objects = [
+        {"type": "rectangle", "coords": [10, 10, 50, 50], "fill": "red",
+         "outline": "", "width": "1.0"},
+        {"type": "line", "coords": [0, 100, 200, 100], "fill": "black",
+         "width": "3.0"}
+    ]
+    image = render_tile(objects, 0, 0, 1, (255, 255, 255), to_rgb)
+    assert image.size == (TILE_SIZE, TILE_SIZE)
+    assert image.getpixel((30, 30)) == (255, 0, 0)
+    assert image.getpixel((150, 100)) == (0, 0, 0)
+    assert image.getpixel((300, 300)) == (255, 255, 255)
+    # The tile to the right only sees what crosses into it
+    image = render_tile(objects, 1, 0, 1, (255, 255, 255), to_rgb)
+    assert image.getpixel((30, 30)) == (255, 255, 255)
+
+
+def test_render_tile_zoomed() -> None:
+    objects = [{"type": "oval", "coords": [0, 0, 100, 100], "fill": "red",
+                "outline": "black", "width": "1.0"}]
+    image = render_tile(objects, 0, 0, 2, (255, 255, 255), to_rgb)
+    assert image.getpixel((100, 100)) == (255, 0, 0)
+    assert image.getpixel((250, 100)) == (255, 255, 255)
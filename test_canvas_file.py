@@ -0,0 +1,72 @@
+from canvas_file import read_canvas, write_canvas, iter_entries, \
+    detect_compression, compression_for, READ_ERRORS
+from typing import Any, List
+import canvas_file
+import gzip
+import io
+import json
+import pytest
+
+CANVAS: List[Any] = [
+    {"mode": "white", "styles": [{"fill": "black", "width": "2.0"}]},
+    {"type": "line", "coords": [0, 0.5, 10, 1e-3], "style": 0},
+    {"type": "text", "coords": [5, 5], "text": "a, [b]\n\"c\" }",
+     "fill": "red", "font": "Arial 12"}
+]
+
+
+@pytest.mark.parametrize("name, compression", [
+    ("canvas.json", None), ("canvas.json.gz", "gzip"),
+    ("canvas.json.bz2", "bzip2"), ("canvas.json.xz", "xz")])
+def test_write_and_read(tmp_path: Any, name: str, compression: Any) -> None:
+    path = str(tmp_path / name)
+    assert compression_for(path) == compression
+    write_canvas(path, iter(CANVAS), compression)
+    assert detect_compression(path) == compression
+    assert read_canvas(path) == CANVAS
+
+
+@pytest.mark.parametrize("name", ["canvas.json.gz", "canvas.json.bz2",
+                                  "canvas.json.xz"])
+def test_read_corrupt_file(tmp_path: Any, name: str) -> None:
+    path = tmp_path / name
+    write_canvas(str(path), iter(CANVAS * 50), compression_for(name))
+    data = bytearray(path.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(READ_ERRORS):
+        read_canvas(str(path))
+
+
+def test_read_broken_gzip_stream(tmp_path: Any) -> None:
+    # Broken deflate data that zlib itself refuses
+    path = tmp_path / "canvas.json.gz"
+    data = bytearray(gzip.compress(json.dumps(CANVAS * 50).encode()))
+    data[12] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(READ_ERRORS):
+        read_canvas(str(path))
+
+
+def test_read_old_canvas(tmp_path: Any) -> None:
+    # Canvases were saved in one line by json.dump
+    path = tmp_path / "canvas.json"
+    path.write_text(json.dumps(CANVAS))
+    assert read_canvas(str(path)) == CANVAS
+
+
+@pytest.mark.parametrize("text", [
+    json.dumps(CANVAS), json.dumps(CANVAS, indent=4), " [ ] ",
+    "[1, 23456, [7, 8], \"9\"]", "[123456789]", "[true,false,null]"])
+def test_entries_across_reads(monkeypatch: Any, text: str) -> None:
+    # Every entry is split between reads
+    monkeypatch.setattr(canvas_file, "READ_SIZE", 3)
+    assert list(iter_entries(io.StringIO(text))) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", [
+    "", "{}", "[1 2]", "[1,]", "[1", "[{\"a\": 1}", "[, 1]"])
+def test_invalid_entries(monkeypatch: Any, text: str) -> None:
+    monkeypatch.setattr(canvas_file, "READ_SIZE", 2)
+    with pytest.raises(json.decoder.JSONDecodeError):
+        list(iter_entries(io.StringIO(text)))
@@ -0,0 +1,28 @@
+from detail import decimate, build_detail_levels, level_for_zoom
+import numpy as np
+
+
+def test_decimate_keeps_endpoints() -> None:
+    points = np.array([[0, 0], [0.1, 0.1], [0.2, 0.2], [5, 5], [5.1, 5.1]])
+    kept = decimate(points, 1.0)
+    assert kept.tolist() == [[0, 0], [5, 5], [5.1, 5.1]]
+
+
+def test_build_detail_levels() -> None:
+    coords = [value for x in range(1000) for value in (x * 0.25, 0)]
+    levels = build_detail_levels(coords)
+    assert levels
+    # Every level is coarser than the one before it, and keeps the endpoints
+    sizes = [len(level) for level in levels]
+    assert sizes == sorted(sizes, reverse=True) and sizes[0] < len(coords)
+    for level in levels:
+        assert level[:2] == coords[:2] and level[-2:] == coords[-2:]
+    # Shapes with few points are always drawn exactly
+    assert build_detail_levels([0, 0, 10, 10, 20, 0]) == []
+
+
+def test_level_for_zoom() -> None:
+    assert level_for_zoom(1, 5) == -1
+    assert level_for_zoom(0.1, 0) == -1
+    assert level_for_zoom(0.25, 5) == 1
+    assert level_for_zoom(0.001, 5) == 4
@@ -0,0 +1,45 @@
+from eraser import circle_intervals, cut_shapes
+import numpy as np
+import pytest
+
+
+def test_circle_intervals() -> None:
+    starts = np.array([[0.0, 0.0], [0.0, 5.0], [4.0, 0.0], [5.0, 1.0]])
+    ends = np.array([[10.0, 0.0], [10.0, 5.0], [6.0, 0.0], [5.0, 1.0]])
+    enter, leave = circle_intervals(starts, ends, 5, 0, 2)
+    # Through the middle, missing, all inside, a point inside
+    assert enter == pytest.approx([0.3, 0, 0, 0])
+    assert leave == pytest.approx([0.7, 0, 1, 1])
+
+
+def test_line_is_split_around_the_circle() -> None:
+    assert cut_shapes([("line", [0, 0, 10, 0])], 5, 0, 2) == \
+        [[[0, 0, 3, 0], [7, 0, 10, 0]]]
+
+
+def test_untouched_and_fully_erased_shapes() -> None:
+    shapes = [("line", [0, 5, 10, 5]), ("line", [4, 0, 6, 0]),
+              ("polygon", [4, 0, 6, 0, 5, 1])]
+    assert cut_shapes(shapes, 5, 0, 2) == [None, [], []]
+
+
+def test_end_of_a_line_is_erased() -> None:
+    assert cut_shapes([("line", [0, 0, 10, 0, 10, 10])], 10, 10, 5) == \
+        [[[0, 0, 10, 0, 10, 5]]]
+
+
+def test_closed_outline_is_cut_open() -> None:
+    # The pieces on both sides of where the outline closes are joined
+    pieces = cut_shapes([("rectangle", [0, 0, 10, 10])], 0, 5, 1)
+    assert pieces == [[[0, 4, 0, 0, 10, 0, 10, 10, 0, 10, 0, 6]]]
+
+
+def test_outline_cut_twice() -> None:
+    pieces = cut_shapes([("polygon", [0, 0, 10, 0, 10, 10, 0, 10])], 5, 5, 6)
+    assert len(pieces[0]) == 4
+    assert all(len(piece) == 6 for piece in pieces[0])  # Around each corner
+
+
+def test_nothing_to_cut() -> None:
+    assert cut_shapes([], 0, 0, 1) == []
+    assert cut_shapes([("line", [])], 0, 0, 1) == [None]
@@ -0,0 +1,48 @@
+from typing import List
+from fonts import FontIndex, load_cached_fonts, save_cached_fonts
+
+FAMILIES: List[str] = ['Arial', 'DejaVu Sans', 'DejaVu Sans Mono',
+                       'DejaVu Serif', 'Liberation Sans', 'Noto Sans-Bold']
+
+
+def test_font_index_prefix() -> None:
+    index = FontIndex(FAMILIES)
+    assert index.search('dejavu') == ['DejaVu Sans', 'DejaVu Sans Mono',
+                                      'DejaVu Serif']
+    assert index.search('ARI') == ['Arial']
+
+
+def test_font_index_word_start() -> None:
+    index = FontIndex(FAMILIES)
+    # Every word of a name can be typed, not just the first one
+    assert index.search('sans') == ['DejaVu Sans', 'DejaVu Sans Mono',
+                                    'Liberation Sans', 'Noto Sans-Bold']
+    assert index.search('mono') == ['DejaVu Sans Mono']
+    assert index.search('bold') == ['Noto Sans-Bold']
+    # A match in the middle of a word is not a word start
+    assert index.search('rial') == []
+
+
+def test_font_index_empty_query() -> None:
+    index = FontIndex(FAMILIES)
+    assert index.search('') == FAMILIES
+    assert index.search('   ') == FAMILIES
+    assert index.search('xyz') == []
+
+
+def test_fonts_cache(tmp_path) -> None:
+    path = str(tmp_path / "fonts.json")
+    signature = {"tk": "8.6.13", "platform": "linux", "dirs": {"/a": 1.0}}
+    # Nothing was cached yet
+    assert load_cached_fonts(signature, path) is None
+    save_cached_fonts(FAMILIES, signature, path)
+    assert load_cached_fonts(signature, path) == FAMILIES
+    # Installing a font changes the signature and invalidates the cache
+    changed = {"tk": "8.6.13", "platform": "linux", "dirs": {"/a": 2.0}}
+    assert load_cached_fonts(changed, path) is None
+
+
+def test_fonts_cache_corrupted(tmp_path) -> None:
+    path = tmp_path / "fonts.json"
+    path.write_text("not json")
+    assert load_cached_fonts({}, str(path)) is None
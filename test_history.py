@@ -0,0 +1,225 @@
+from history import History, touched_objects, describe, undo_on_info, \
+    state_after, redo_on_document, encode_actions, decode_actions, \
+    CHECKPOINT_INTERVAL, HISTORY_CHUNK_SIZE
+from collections import OrderedDict
+from typing import Dict, Any
+import pytest
+
+LINE: Dict[str, Any] = {"type": "line", "coords": [0, 0, 10, 10],
+                        "fill": "black", "width": "2.0", "layer": "Layer 1",
+                        "id": 1}
+
+
+def test_touched_objects() -> None:
+    assert touched_objects({'type': 'change fill', 'object': 3}) == [3]
+    assert touched_objects({'type': 'moving group', 'objects': [1, 2]}) == \
+        [1, 2]
+    assert touched_objects({'type': 'delete all', 'actions': [
+        {'info': {'id': 4}}, {'info': {}}]}) == [4]
+
+
+def test_history_index() -> None:
+    history = History()
+    history.append({'type': 'drawing', 'object': 1, 'info': LINE})
+    history.append({'type': 'drawing', 'object': 2, 'info': LINE})
+    history.append({'type': 'moving group', 'objects': [1, 2],
+                    'dx': 1, 'dy': 1})
+    history.append({'type': 'change fill', 'object': 1,
+                    'prev_state': 'black', 'new_state': 'red'})
+    assert history.positions_of(1) == [0, 2, 3]
+    assert history.positions_of(2) == [1, 2]
+    assert history.pop()['type'] == 'change fill'
+    assert history.positions_of(1) == [0, 2]
+    history.pop(0)  # Not the last action, the index is built again
+    assert history.positions_of(1) == [1] and history.positions_of(2) == [0, 1]
+    del history[:]
+    assert history.positions_of(2) == [] and not history
+
+
+def test_history_is_a_list() -> None:
+    history = History([{'type': 'change fill', 'object': 5,
+                        'prev_state': '', 'new_state': 'red'}])
+    history += [{'type': 'change width', 'object': 5,
+                 'prev_state': '1.0', 'new_state': '3.0'}]
+    assert len(history) == 2 and history.positions_of(5) == [0, 1]
+    assert history[-1]['type'] == 'change width'
+
+
+def test_undo_on_info() -> None:
+    moved = undo_on_info({'type': 'moving group', 'objects': [1],
+                          'dx': 2, 'dy': 3}, 1, LINE)
+    assert moved['coords'] == [-2, -3, 8, 7] and LINE['coords'][0] == 0
+    assert undo_on_info({'type': 'change width', 'object': 1,
+                         'prev_state': '1.0'}, 1, LINE)['width'] == '1.0'
+    recolored = undo_on_info({'type': 'change group color', 'objects': [7, 1],
+                              'prev_states': ['blue', 'green']}, 1, LINE)
+    assert recolored['fill'] == 'green'
+    transformed = undo_on_info({'type': 'transform', 'objects': [1],
+                                'prev_states': [('polygon', [0, 0, 1, 1])]},
+                               1, LINE)
+    assert transformed['type'] == 'polygon'
+
+
+def test_state_after() -> None:
+    history = History()
+    history.append({'type': 'drawing', 'object': 1, 'info': LINE})
+    history.append({'type': 'change fill', 'object': 1,
+                    'prev_state': 'black', 'new_state': 'red'})
+    history.append({'type': 'change width', 'object': 1,
+                    'prev_state': '2.0', 'new_state': '5.0'})
+    current = dict(LINE, fill='red', width='5.0')
+    positions = history.positions_of(1)
+    assert state_after(history, positions, 0, 1, current) == LINE
+    assert state_after(history, positions, 1, 1, current)['fill'] == 'red'
+    assert state_after(history, positions, 2, 1, current) == current
+
+
+@pytest.mark.parametrize("action, expected", [
+    ({'type': 'change fill', 'new_state': '#ff0000'}, "Fill changed to #ff0000"),
+    ({'type': 'drawing'}, "Drawn"),
+    ({'type': 'unknown'}, "Changed")
+])
+def test_describe(action: Dict[str, Any], expected: str) -> None:
+    assert describe(action) == expected
+
+
+def test_optimize_actions() -> None:
+    merged = dict(LINE, coords=[0, 0, 10, 10, 20, 0])
+    second = dict(LINE, coords=[10, 10, 20, 0], id=2)
+    action = {'type': 'optimize', 'prev_infos': [LINE, second],
+              'new_infos': [merged]}
+    assert touched_objects(action) == [1, 2]
+    assert undo_on_info(action, 1, merged) == LINE
+    assert describe(action) == "Optimized"
+
+
+def test_erase_actions() -> None:
+    piece = dict(LINE, coords=[0, 0, 3, 3], id=5)
+    action = {'type': 'erase', 'prev_infos': [LINE], 'new_infos': [[piece]]}
+    assert touched_objects(action) == [1, 5]
+    assert undo_on_info(action, 1, piece) == LINE
+    assert undo_on_info(action, 5, piece) == piece
+    assert describe(action) == "Erased"
+
+
+def drawing(item: int) -> Dict[str, Any]:
+    return {'type': 'drawing', 'object': item,
+            'info': dict(LINE, coords=[item, 0, item, 10], id=item)}
+
+
+def test_redo_on_document() -> None:
+    document: OrderedDict = OrderedDict()
+    for item in [1, 2, 3]:
+        redo_on_document(drawing(item), document)
+    first = document[1]
+    redo_on_document({'type': 'moving group', 'objects': [1], 'dx': 1,
+                      'dy': 2}, document)
+    assert document[1]['coords'] == [2, 2, 2, 12]
+    assert first['coords'] == [1, 0, 1, 10]  # Replaced, not changed
+    redo_on_document({'type': 'changing order', 'object': 3,
+                      'prev_state': True, 'new_state': False}, document)
+    redo_on_document({'type': 'delete object', 'object': 2}, document)
+    assert list(document) == [3, 1]
+
+
+def test_jump_replays_from_checkpoints() -> None:
+    history = History()
+    count = CHECKPOINT_INTERVAL * 3 + 5
+    for item in range(count):
+        history.append(drawing(item))
+    history.append({'type': 'change fill', 'object': 7,
+                    'prev_state': 'black', 'new_state': 'red'})
+    document = history.jump(10)
+    assert list(document) == list(range(10))
+    assert len(history) == 10 and len(history.future()) == count - 9
+    assert history.positions_of(7) == [7]
+    document = history.jump(count + 1)
+    assert document[7]['fill'] == 'red'
+    assert history.positions_of(7) == [7, count]
+    assert history.document_at(5) == OrderedDict(
+        (item, drawing(item)['info']) for item in range(5))
+    with pytest.raises(IndexError):
+        history.document_at(count + 2)
+
+
+def test_new_action_starts_a_branch() -> None:
+    history = History([drawing(1), drawing(2)])
+    action = history.pop()
+    history.append(action)  # Redone
+    history.pop()
+    assert history.next_action() is action
+    history.append(drawing(3))
+    assert history.future() == [] and history.next_action() is None
+    assert list(history.document_at(2)) == [1, 3]
+    old, new = history.branches()
+    assert (old.action, old.depth) == (action, 2)
+    assert history.current_branch() is new
+    # Both branches share the node of the first action
+    assert old.parent is new.parent
+    assert list(history.switch_to(old)) == [1, 2]
+    assert list(history) == [history[0], action]
+    assert history.positions_of(3) == [] and history.positions_of(2) == [1]
+    history.pop()
+    assert history.next_action() is action
+
+
+def test_action_that_can_not_be_done_is_not_kept() -> None:
+    history = History([drawing(1)])
+    with pytest.raises(KeyError):
+        # A change without its new state
+        history.append({'type': 'change fill', 'object': 1,
+                        'prev_state': 'black'})
+    assert len(history) == 1 and history.branches() == [
+        history.current_branch()]
+    history.append({'type': 'change fill', 'object': 1,
+                    'prev_state': 'black', 'new_state': 'red'})
+    assert history.document_at(2)[1]['fill'] == 'red'
+
+
+def test_encode_actions() -> None:
+    actions = [drawing(1), {'type': 'transform', 'objects': [1],
+                            'prev_states': [('line', [0, 0, 1, 1])],
+                            'new_states': [('line', [0, 0, 2, 2])]}]
+    decoded = decode_actions(encode_actions(actions))
+    assert decoded[0] == actions[0]
+    assert decoded[1]['prev_states'] == [['line', [0, 0, 1, 1]]]
+
+
+def test_restored_history_is_decoded_lazily() -> None:
+    count = HISTORY_CHUNK_SIZE + 10
+    saved = History(drawing(item) for item in range(count))
+    chunks = saved.encoded()
+    assert [size for size, _ in chunks] == [HISTORY_CHUNK_SIZE, 10]
+    document = saved.document_at(count)
+
+    history = History()
+    history.restore(chunks, document)
+    assert history and len(history) == 0
+    assert history.archived_count() == count
+    assert history.encoded() == chunks  # Saved again as it is
+    assert history.pop() == drawing(count - 1)
+    # Only the last chunk is decoded
+    assert len(history) == 9 and history.archived_count() == HISTORY_CHUNK_SIZE
+    assert history.positions_of(count - 2) == [8]
+    assert history.next_action() == drawing(count - 1)
+    # The document before the decoded actions needs all of them
+    assert list(history.document_at(3)) == list(range(HISTORY_CHUNK_SIZE + 3))
+    assert list(history.document_at(0)) == []
+    assert history.archived_count() == 0 and len(history) == count - 1
+    assert list(history.jump(count)) == list(range(count))
+
+
+@pytest.mark.parametrize("text", ["bm90IHpsaWI=", "not base64!",
+                                  encode_actions([])[:-4],
+                                  "eNqLjgUAARUAuQ=="])
+def test_corrupt_history_is_not_restored(text: str) -> None:
+    saved = History([drawing(1), drawing(2)])
+    chunks = [(1, text)] + saved.encoded()
+    document = saved.document_at(2)
+
+    history = History([drawing(3)])
+    with pytest.raises(ValueError):
+        history.restore(chunks, document)
+    # The history is left as it was and stays usable
+    assert history.archived_count() == 0
+    assert history.pop() == drawing(3) and not history
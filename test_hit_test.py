@@ -0,0 +1,72 @@
+from hit_test import segment_distances, outline_points, hit_objects, \
+    in_ellipses
+import numpy as np
+import pytest
+
+
+def test_segment_distances() -> None:
+    starts = np.array([[0.0, 0.0], [0.0, 0.0], [5.0, 5.0]])
+    ends = np.array([[10.0, 0.0], [0.0, 10.0], [5.0, 5.0]])
+    distances = segment_distances(12, 3, starts, ends)
+    assert distances == pytest.approx([np.hypot(2, 3), 12, np.hypot(7, 2)])
+
+
+def test_outline_points_closes_shapes() -> None:
+    rectangle = outline_points("rectangle", [0, 0, 10, 20])
+    assert rectangle.tolist() == [[0, 0], [10, 0], [10, 20], [0, 20], [0, 0]]
+    line = outline_points("line", [0, 0, 10, 20])
+    assert line.tolist() == [[0, 0], [10, 20]]
+    assert outline_points("line", [3, 4]).tolist() == [[3, 4], [3, 4]]
+
+
+def test_hollow_rectangle_is_hit_on_its_outline_only() -> None:
+    shapes = [("rectangle", [0, 0, 100, 100], False, 1.0)]
+    assert hit_objects(shapes, 50, 50, 3) == []
+    assert hit_objects(shapes, 50, 2, 3) == [0]
+    assert hit_objects(shapes, 104, 50, 3) == []
+
+
+def test_filled_shapes_are_hit_inside() -> None:
+    shapes = [("rectangle", [0, 0, 100, 100], True, 1.0),
+              ("polygon", [200, 0, 300, 0, 250, 100], True, 1.0),
+              ("text", [400, 0, 450, 20], True, 0.0)]
+    assert hit_objects(shapes, 50, 50, 1) == [0]
+    assert hit_objects(shapes, 250, 50, 1) == [1]
+    assert hit_objects(shapes, 210, 90, 1) == []  # Outside the triangle
+    assert hit_objects(shapes, 420, 10, 1) == [2]
+
+
+def test_line_width_widens_the_hit() -> None:
+    shapes = [("line", [0, 0, 100, 0], False, 1.0),
+              ("line", [0, 0, 100, 0], False, 20.0)]
+    assert hit_objects(shapes, 50, 8, 2) == [1]
+    assert hit_objects(shapes, 50, 1, 2) == [0, 1]
+
+
+def test_line_width_is_in_screen_pixels() -> None:
+    shapes = [("line", [0, 0, 100, 0], False, 20.0)]
+    # Zoomed in, 20 pixels are 5 units of the coordinates
+    assert hit_objects(shapes, 50, 6, 2, zoom=4) == []
+    assert hit_objects(shapes, 50, 4, 2, zoom=4) == [0]
+    # Zoomed out, they are 40 units
+    assert hit_objects(shapes, 50, 21, 2, zoom=0.5) == [0]
+
+
+def test_ovals_use_the_ellipse() -> None:
+    shapes = [("oval", [0, 0, 100, 50], True, 1.0),
+              ("oval", [0, 0, 100, 50], False, 1.0)]
+    # Inside the bounding box, but outside the ellipse
+    assert hit_objects(shapes, 5, 5, 1) == []
+    assert hit_objects(shapes, 50, 25, 1) == [0]
+    assert hit_objects(shapes, 50, 1, 2) == [0, 1]
+
+
+def test_in_ellipses() -> None:
+    boxes = np.array([[0.0, 0.0, 10.0, 10.0], [0.0, 0.0, 10.0, 0.0]])
+    assert in_ellipses(boxes, 5, 5).tolist() == [True, False]
+
+
+def test_objects_without_points_are_skipped() -> None:
+    shapes = [("line", [], False, 1.0), ("line", [0, 0, 10, 0], False, 1.0)]
+    assert hit_objects(shapes, 5, 0, 1) == [1]
+    assert hit_objects([], 5, 0, 1) == []
@@ -37,7 +37,33 @@ from file_manager import is_parsed_correctly, check_required_keys, \
     # Missing text for the text object
     ([{'mode': 'white'},
       {"type": "line", "coords": [0, 0], "fill": "black", "width": 1},
-      {"type": "invalid_type"}], False)  # Mixed valid and invalid objects
+      {"type": "invalid_type"}], False),  # Mixed valid and invalid objects
+    ([{'mode': 'white', 'history': [[2, "eJyLjgUAARUAuQ=="]]}], True),
+    # Valid saved history
+    ([{'mode': 'white', 'history': [["2", 2]]}], False),
+    # Invalid saved history
+    ([{'mode': 'white', 'history': [[2, "eJyLjgUAARUAuQ=="]], 'next_id': 7}],
+     True),  # Valid id of the next object
+    ([{'mode': 'white', 'next_id': "7"}], False),
+    # Invalid id of the next object
+    ([{'mode': 'white', 'styles': [{"fill": "black", "width": "2.0"}]},
+      {"type": "line", "coords": [0, 0], "style": 0}], True),
+    # Valid style table
+    ([{'mode': 'white', 'styles': [{"fill": "black", "width": "2.0"}]},
+      {"type": "line", "coords": [0, 0], "style": 1}], False),
+    # Style id out of the style table
+    ([{'mode': 'white', 'styles': [{"fill": "black"}]},
+      {"type": "line", "coords": [0, 0], "style": 0}], False),
+    # Missing width in the style of the line object
+    ([{'mode': 'white', 'layers': [{"name": "Layer 1", "visible": True,
+                                    "locked": False}, {"name": "Sketch"}]},
+      {"type": "line", "coords": [0, 0], "fill": "black", "width": 1,
+       "layer": "Sketch"}], True),  # Valid layers
+    ([{'mode': 'white', 'layers': []}], False),  # No layers
+    ([{'mode': 'white', 'layers': [{"visible": True}]}],
+     False),  # Layer without a name
+    ([{'mode': 'white', 'layers': [{"name": "Sketch"}, {"name": "Sketch"}]}],
+     False)  # Two layers with the same name
 ])
 def test_is_parsed_right(objects: List[Dict[str, Any]],
                          expected_result: bool) -> None:
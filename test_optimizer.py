@@ -0,0 +1,165 @@
+from optimizer import can_join, merge_strokes, simplify, optimize, \
+    optimize_file, is_degenerate, find_duplicates, is_cover, find_occluded, \
+    cull
+from canvas_file import read_canvas, write_canvas, detect_compression
+from typing import Dict, Any, List
+import json
+
+
+def segment(x1: float, y1: float, x2: float, y2: float, item: int,
+            **options: Any) -> Dict[str, Any]:
+    info = {"type": "line", "coords": [x1, y1, x2, y2], "fill": "black",
+            "width": "2.0", "layer": "Layer 1", "id": item}
+    info.update(options)
+    return info
+
+
+def stroke(points: List[float], first_id: int) -> List[Dict[str, Any]]:
+    return [segment(*points[i:i + 4], first_id + i // 2)
+            for i in range(0, len(points) - 2, 2)]
+
+
+def test_can_join() -> None:
+    assert can_join(segment(0, 0, 1, 1, 1), segment(1, 1, 2, 2, 2))
+    assert not can_join(segment(0, 0, 1, 1, 1), segment(1, 2, 2, 2, 2))
+    assert not can_join(segment(0, 0, 1, 1, 1),
+                        segment(1, 1, 2, 2, 2, fill="red"))
+    assert not can_join(segment(0, 0, 1, 1, 1),
+                        segment(1, 1, 2, 2, 2, layer="Layer 2"))
+    # Lines with other options are left alone
+    assert not can_join(segment(0, 0, 1, 1, 1),
+                        segment(1, 1, 2, 2, 2, dash="4 2"))
+    rectangle = {"type": "rectangle", "coords": [0, 0, 1, 1], "fill": "",
+                 "outline": "black", "width": "2.0"}
+    assert not can_join(rectangle, segment(1, 1, 2, 2, 2))
+
+
+def test_merge_strokes() -> None:
+    objects = stroke([0, 0, 1, 1, 2, 0, 3, 1], 1) + stroke([5, 5, 6, 6], 4)
+    merged = merge_strokes(objects)
+    assert [obj["coords"] for obj in merged] == [[0, 0, 1, 1, 2, 0, 3, 1],
+                                                 [5, 5, 6, 6]]
+    assert [obj["id"] for obj in merged] == [1, 4]
+    # The given objects are not changed
+    assert objects[0]["coords"] == [0, 0, 1, 1]
+
+
+def test_merge_keeps_the_stacking_order() -> None:
+    rectangle = {"type": "rectangle", "coords": [0, 0, 1, 1], "fill": "red",
+                 "outline": "black", "width": "2.0", "id": 9}
+    objects = [segment(0, 0, 1, 1, 1), rectangle, segment(1, 1, 2, 2, 2)]
+    # The rectangle is between the segments, so they stay apart
+    assert merge_strokes(objects) == objects
+
+
+def test_simplify() -> None:
+    straight = [0, 0, 1, 0.1, 2, 0, 3, -0.1, 4, 0]
+    assert simplify(straight, 0.5) == [0, 0, 4, 0]
+    assert simplify(straight, 0) == straight
+    corner = [0, 0, 5, 0, 5, 5]
+    assert simplify(corner, 0.5) == corner
+    assert simplify([0, 0, 1, 1], 5) == [0, 0, 1, 1]
+
+
+def test_optimize_simplifies_lines_only() -> None:
+    objects = stroke([0, 0, 1, 0.1, 2, 0], 1)
+    polygon = {"type": "polygon", "coords": [0, 0, 1, 0.1, 2, 0],
+               "fill": "red", "outline": "", "width": "1.0"}
+    optimized = optimize(objects + [polygon], 0.5)
+    assert optimized[0]["coords"] == [0, 0, 2, 0]
+    assert optimized[1]["coords"] == polygon["coords"]
+
+
+def test_optimize_file(tmp_path: Any) -> None:
+    path = tmp_path / "canvas.json"
+    objects = [{"mode": "white"}] + stroke([0, 0, 1, 1, 2, 0, 3, 1], 1)
+    path.write_text(json.dumps(objects))
+    out_path = tmp_path / "optimized.json"
+    assert optimize_file(str(path), str(out_path)) == {"before": 3,
+                                                       "after": 1}
+    saved = json.loads(out_path.read_text())
+    # The style of the line is saved once, in the style table
+    assert saved[0] == {"mode": "white",
+                        "styles": [{"fill": "black", "width": "2.0"}]}
+    assert len(saved) == 2 and saved[1]["style"] == 0
+    assert "fill" not in saved[1]
+
+
+def test_optimize_compressed_file(tmp_path: Any) -> None:
+    path = str(tmp_path / "canvas.json.gz")
+    objects = [{"mode": "white"}] + stroke([0, 0, 1, 1, 2, 0, 3, 1], 1)
+    write_canvas(path, objects, "gzip")
+    assert optimize_file(path) == {"before": 3, "after": 1}
+    # The canvas stays compressed
+    assert detect_compression(path) == "gzip"
+    assert len(read_canvas(path)) == 2
+
+
+def shape(obj_type: str, coords: List[float], fill: str = "", item: int = 0,
+          **options: Any) -> Dict[str, Any]:
+    info = {"type": obj_type, "coords": coords, "fill": fill,
+            "outline": "black", "width": "2.0", "layer": "Layer 1",
+            "id": item}
+    info.update(options)
+    return info
+
+
+def test_is_degenerate() -> None:
+    assert is_degenerate(segment(3, 3, 3, 3, 1))
+    assert not is_degenerate(segment(3, 3, 4, 3, 1))
+    # A click of the rectangle tool
+    assert is_degenerate(shape("rectangle", [5, 5, 5, 5]))
+    # A flat rectangle still draws its outline
+    assert not is_degenerate(shape("rectangle", [5, 5, 9, 5]))
+    assert is_degenerate(shape("oval", [5, 5, 9, 5], "red", outline=""))
+    assert is_degenerate(shape("polygon", [0, 0, 1, 1, 2, 2], "red",
+                               outline=""))
+    assert not is_degenerate(shape("polygon", [0, 0, 1, 1, 2, 0], "red",
+                                   outline=""))
+    assert is_degenerate({"type": "text", "coords": [0, 0], "text": "  ",
+                          "fill": "black", "font": "Arial 12"})
+
+
+def test_find_duplicates() -> None:
+    objects = [segment(0, 0, 5, 5, 1), shape("oval", [0, 0, 9, 9], item=2),
+               segment(0, 0, 5, 5, 3), segment(0, 0, 5, 5, 4,
+                                                layer="Layer 2")]
+    # Only the lower copy on the same layer goes
+    assert find_duplicates(objects) == [0]
+
+
+def test_is_cover() -> None:
+    assert is_cover(shape("rectangle", [0, 0, 10, 10], "red"))
+    assert not is_cover(shape("rectangle", [0, 0, 10, 10]))
+    assert is_cover(shape("polygon", [0, 0, 10, 0, 5, 10], "red"))
+    concave = [0, 0, 10, 0, 10, 10, 5, 2, 0, 10]
+    assert not is_cover(shape("polygon", concave, "red"))
+    star = [50, 0, 79, 90, 2, 35, 98, 35, 21, 90]
+    assert not is_cover(shape("polygon", star, "red"))
+
+
+def test_find_occluded() -> None:
+    objects = [segment(10, 10, 20, 20, 1),  # Under the rectangle
+               segment(10, 10, 99, 20, 2),  # Sticks out of it
+               segment(40, 40, 45, 45, 3),  # In the corner, outside the oval
+               shape("rectangle", [0, 0, 50, 50], "red", 4),
+               segment(10, 10, 20, 20, 5),  # Above the rectangle
+               segment(60, 60, 70, 70, 6, layer="Layer 2"),
+               shape("oval", [50, 50, 100, 100], "blue", 7),
+               segment(73, 80, 77, 84, 8),  # Under the triangle
+               shape("polygon", [60, 90, 90, 90, 75, 60], "green", 9)]
+    assert find_occluded(objects) == [0, 2, 7]
+
+
+def test_cull_reports() -> None:
+    objects = [segment(3, 3, 3, 3, 1), segment(0, 0, 5, 5, 2),
+               segment(0, 0, 5, 5, 3), shape("rectangle", [-9, -9, 9, 9],
+                                                "red", 4)]
+    kept, report = cull(objects)
+    assert kept == objects[3:]
+    assert report.found == {"degenerate": [0], "duplicate": [1],
+                            "occluded": [0, 1, 2]}
+    assert report.removed() == [0, 1, 2] and report.object_count == 4
+    assert report.bytes_after < report.bytes_before
+    assert "3 of 4 objects removed" in str(report)
+    assert optimize(objects, is_cull=True) == kept
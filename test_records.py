@@ -0,0 +1,70 @@
+from records import compact, LineInfo, ShapeInfo, ObjectAction, StateChange
+from history import History
+from typing import Dict, Any
+import pytest
+
+LINE: Dict[str, Any] = {"type": "line", "coords": [0, 0, 10.5, 10],
+                        "fill": "black", "width": "2.0", "layer": "Layer 1",
+                        "id": 1}
+
+
+def test_compact_info() -> None:
+    info = compact(LINE)
+    assert isinstance(info, LineInfo)
+    assert info == LINE and dict(info) == LINE
+    assert info["coords"] == [0, 0, 10.5, 10]
+    assert info["coords"] is not info["coords"]  # A new list every time
+    assert "outline" not in info and info.get("outline") is None
+    with pytest.raises(KeyError):
+        info["outline"]
+    with pytest.raises(TypeError):
+        info["fill"] = "red"
+    # Equal strings are kept once
+    assert compact(dict(LINE, fill="".join(["bl", "ack"])))["fill"] is \
+        info["fill"]
+    assert isinstance(compact(dict(LINE, type="oval", outline="")),
+                      ShapeInfo)
+
+
+def test_compact_actions() -> None:
+    drawing = {'type': 'drawing', 'object': 1, 'info': LINE}
+    action = compact(drawing)
+    assert isinstance(action, ObjectAction)
+    assert isinstance(action['info'], LineInfo) and action == drawing
+    # The previous state of changing the order is all it has
+    order = compact({'type': 'changing order', 'object': 1,
+                     'prev_state': True})
+    assert isinstance(order, StateChange) and len(order) == 3
+    # Other actions stay dictionaries, of records
+    delete_all = compact({'type': 'delete all', 'actions': [{'info': LINE}]})
+    assert isinstance(delete_all, dict)
+    assert isinstance(delete_all['actions'][0]['info'], LineInfo)
+    # Unknown keys are kept by dictionaries
+    assert isinstance(compact(dict(LINE, tags="a")), dict)
+    assert compact(action) is action
+    assert compact(delete_all) is delete_all
+
+
+def test_history_keeps_records() -> None:
+    history = History([{'type': 'drawing', 'object': 1, 'info': LINE}])
+    history.append({'type': 'change fill', 'object': 1,
+                    'prev_state': 'black', 'new_state': 'red'})
+    assert isinstance(history[0], ObjectAction)
+    assert isinstance(history[1], StateChange)
+    assert history.document_at(2)[1] == dict(LINE, fill='red')
+
+
+def test_redo_of_a_dictionary_action() -> None:
+    history = History()
+    history.append({'type': 'drawing', 'object': 1, 'info': LINE})
+    history.append({'type': 'moving group', 'objects': [1], 'dx': 5,
+                    'dy': 0})
+    history.append({'type': 'drawing', 'object': 2,
+                    'info': dict(LINE, id=2)})
+    history.pop()
+    history.pop()
+    assert len(history.future()) == 2
+    history.append(history.next_action())  # Redo the move
+    assert len(history.future()) == 1 and len(history.branches()) == 1
+    history.append(history.next_action())
+    assert history.future() == [] and len(history.branches()) == 1
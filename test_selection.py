@@ -0,0 +1,30 @@
+from selection import points_in_polygon, objects_in_lasso
+import numpy as np
+
+SQUARE = [0, 0, 100, 0, 100, 100, 0, 100]
+
+
+def test_points_in_polygon() -> None:
+    points = np.array([[50, 50], [150, 50], [-1, 50], [99, 1]], dtype=float)
+    polygon = np.array(SQUARE, dtype=float).reshape(-1, 2)
+    assert points_in_polygon(points, polygon).tolist() == \
+        [True, False, False, True]
+
+
+def test_points_in_concave_polygon() -> None:
+    # A 'U' shape, the middle of its opening is outside
+    polygon = np.array([0, 0, 30, 0, 30, 80, 70, 80, 70, 0, 100, 0,
+                        100, 100, 0, 100], dtype=float).reshape(-1, 2)
+    points = np.array([[50, 40], [15, 40], [50, 90]], dtype=float)
+    assert points_in_polygon(points, polygon).tolist() == [False, True, True]
+
+
+def test_objects_in_lasso() -> None:
+    coords = [
+        [10, 10, 20, 20],  # Inside
+        [10, 10, 200, 20],  # Partly inside
+        [],  # No points
+        [50, 50, 60, 50, 60, 60]  # Inside
+    ]
+    assert objects_in_lasso(coords, SQUARE) == [0, 3]
+    assert objects_in_lasso(coords, [0, 0, 10, 10]) == []  # Not a polygon
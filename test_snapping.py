@@ -0,0 +1,69 @@
+from snapping import snap_to_grid, snap_points, SnapIndex
+import numpy as np
+
+
+def test_snap_to_grid() -> None:
+    assert snap_to_grid(12, 29, 10) == (10, 30)
+    assert snap_to_grid(-14, 6, 20) == (-20, 0)
+
+
+def test_snap_points_of_a_line() -> None:
+    points = snap_points("line", [0, 0, 10, 0, 10, 20])
+    expected = [[0, 0], [10, 0], [10, 20],  # Vertices
+                [5, 0], [10, 10],  # Midpoints
+                [0, 0], [10, 0], [10, 20], [0, 20]]  # Bounding box corners
+    assert points.tolist() == expected
+
+
+def test_snap_points_of_a_closed_polygon() -> None:
+    points = snap_points("polygon", [0, 0, 10, 0, 0, 10])
+    # The closing edge has a midpoint too
+    assert [5, 5] in points.tolist()
+
+
+def test_snap_points_of_a_box() -> None:
+    points = snap_points("oval", [0, 0, 10, 20]).tolist()
+    assert [0, 0] in points and [10, 20] in points and [0, 20] in points
+    assert [5, 0] in points and [10, 10] in points
+    assert [5, 10] in points  # The center
+
+
+def test_nearest_point() -> None:
+    index = SnapIndex(cell_size=10)
+    index.insert(1, np.array([[0.0, 0.0], [100.0, 100.0]]))
+    index.insert(2, np.array([[3.0, 4.0]]))
+    assert index.nearest(4, 4, 2) == (3.0, 4.0)
+    assert index.nearest(4, 4, 2, exclude=[2]) is None
+    assert index.nearest(4, 4, 10, exclude=[2]) == (0.0, 0.0)
+    assert index.nearest(50, 50, 5) is None
+
+
+def test_nearest_crosses_cells() -> None:
+    index = SnapIndex(cell_size=10)
+    index.insert(1, np.array([[9.5, 9.5]]))
+    assert index.nearest(10.5, 10.5, 2) == (9.5, 9.5)
+    # A radius covering more cells than are in use looks at all of them
+    assert index.nearest(1000, 1000, 5000) == (9.5, 9.5)
+
+
+def test_insert_replaces_and_remove() -> None:
+    index = SnapIndex(cell_size=10)
+    index.insert(1, np.array([[0.0, 0.0], [55.0, 5.0]]))
+    index.insert(1, np.array([[200.0, 200.0]]))
+    assert len(index) == 1
+    assert index.nearest(0, 0, 5) is None
+    assert index.points(1).tolist() == [[200.0, 200.0]]
+    index.remove(1)
+    index.remove(1)
+    assert 1 not in index
+    assert index.nearest(200, 200, 5) is None
+    assert index.points(1).shape == (0, 2)
+
+
+def test_points_are_split_by_cell() -> None:
+    index = SnapIndex(cell_size=10)
+    points = np.array([[x, 0.0] for x in range(0, 100, 3)])
+    index.insert(1, points)
+    for x, _ in points:
+        assert index.nearest(x + 0.4, 0.4, 1) == (x, 0.0)
+    assert sorted(index.points(1).tolist()) == sorted(points.tolist())
@@ -0,0 +1,54 @@
+from spatial import GridIndex, boxes_overlap, box_contains, grow_box
+
+
+def test_boxes_overlap() -> None:
+    assert boxes_overlap((0, 0, 10, 10), (5, 5, 15, 15))
+    assert boxes_overlap((0, 0, 10, 10), (10, 10, 20, 20))  # Touching
+    assert not boxes_overlap((0, 0, 10, 10), (11, 0, 20, 10))
+
+
+def test_box_contains() -> None:
+    assert box_contains((0, 0, 10, 10), (2, 2, 8, 8))
+    assert box_contains((0, 0, 10, 10), (0, 0, 10, 10))
+    assert not box_contains((0, 0, 10, 10), (2, 2, 11, 8))
+
+
+def test_grow_box() -> None:
+    assert grow_box((0, 0, 10, 10), 2.5) == (-2.5, -2.5, 12.5, 12.5)
+
+
+def test_grid_index_query() -> None:
+    index = GridIndex(cell_size=100)
+    index.insert(1, (0, 0, 10, 10))
+    index.insert(2, (500, 500, 520, 520))
+    index.insert(3, (-250, -250, -240, -240))
+    assert index.query(-5, -5, 5, 5) == {1}
+    assert index.query(0, 0, 1000, 1000) == {1, 2}
+    assert index.query(-300, -300, 600, 600) == {1, 2, 3}
+    # Sharing a grid cell is not enough, the boxes must overlap
+    assert index.query(50, 50, 60, 60) == set()
+
+
+def test_grid_index_update_and_remove() -> None:
+    index = GridIndex(cell_size=100)
+    index.insert(1, (0, 0, 10, 10))
+    index.update(1, (1000, 1000, 1010, 1010))
+    assert index.query(0, 0, 20, 20) == set()
+    assert index.query(990, 990, 1020, 1020) == {1}
+    index.remove(1)
+    index.remove(1)  # Removing twice does nothing
+    assert len(index) == 0
+    assert index.query(990, 990, 1020, 1020) == set()
+
+
+def test_grid_index_large_boxes() -> None:
+    index = GridIndex(cell_size=10)
+    # Covers far more cells than are put in the grid
+    index.insert(1, (-100000, -5, 100000, 5))
+    index.insert(2, (0, 0, 1, 1))
+    assert index.query(50000, 0, 50001, 1) == {1}
+    assert index.query(0, 0, 1, 1) == {1, 2}
+    inf = float("inf")
+    assert index.query(-inf, -inf, inf, inf) == {1, 2}
+    index.remove(1)
+    assert index.query(50000, 0, 50001, 1) == set()
@@ -0,0 +1,48 @@
+from styles import StyleTable, pack_styles, unpack_styles, is_valid_style_id
+from typing import Dict, Any, List
+
+LINE: Dict[str, Any] = {"type": "line", "coords": [0, 0, 10, 10],
+                        "fill": "black", "width": "2.0", "layer": "Layer 1",
+                        "id": 1}
+
+
+def test_style_table() -> None:
+    table = StyleTable()
+    first = table.add({"fill": "black", "width": "2.0"})
+    assert table.add({"width": "2.0", "fill": "black"}) == first
+    second = table.add({"fill": "red", "width": "2.0"})
+    assert second != first and len(table) == 2
+    assert table[first] == {"fill": "black", "width": "2.0"}
+    assert table.styles() == [table[first], table[second]]
+
+
+def test_pack_styles() -> None:
+    objects: List[Dict[str, Any]] = [
+        LINE, dict(LINE, id=2), dict(LINE, fill="red", id=3),
+        {"type": "text", "coords": [5, 5], "text": "Hi", "fill": "black",
+         "font": "Arial 12"}]
+    styles, packed = pack_styles(objects)
+    assert len(styles) == 3
+    assert [obj["style"] for obj in packed] == [0, 0, 1, 2]
+    assert packed[0] == {"type": "line", "coords": [0, 0, 10, 10],
+                         "layer": "Layer 1", "id": 1, "style": 0}
+    assert unpack_styles(styles, packed) == objects
+    assert "style" not in objects[0]  # The objects are not changed
+
+
+def test_unpack_old_objects() -> None:
+    # Canvases saved before the style table keep the styles in the objects
+    assert unpack_styles([], [LINE]) == [LINE]
+    # Styles that can not be hashed stay in their objects
+    odd = dict(LINE, fill=["black"])
+    styles, packed = pack_styles([odd])
+    assert styles == [] and packed == [odd]
+
+
+def test_is_valid_style_id() -> None:
+    styles = [{"fill": "black"}]
+    assert is_valid_style_id(0, styles)
+    assert not is_valid_style_id(1, styles)
+    assert not is_valid_style_id(-1, styles)
+    assert not is_valid_style_id(True, styles)
+    assert not is_valid_style_id("0", styles)
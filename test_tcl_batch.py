@@ -0,0 +1,72 @@
+from tcl_batch import TclBatch, tcl_word
+import tkinter as tk
+import pytest
+
+# A Tcl command that stands for a canvas: it records the commands it gets,
+# creates items with increasing ids and refuses the color 'bad'
+FAKE_CANVAS = """
+set ::calls {}
+set ::next_id 0
+proc .canvas {args} {
+    lappend ::calls $args
+    if {[lindex $args 0] eq "create" && [lsearch -exact $args bad] >= 0} {
+        error "unknown color name \\"bad\\""
+    }
+    if {[lindex $args 0] eq "create"} {
+        return [incr ::next_id]
+    }
+    return {}
+}
+"""
+
+
+class FakeCanvas:
+    """
+    Class that represents the Tcl side of a canvas, without a display.
+    """
+
+    def __init__(self) -> None:
+        self.tk = tk.Tcl().tk
+        self.tk.eval(FAKE_CANVAS)
+
+    def __str__(self) -> str:
+        return ".canvas"
+
+    def calls(self) -> list:
+        return [list(self.tk.splitlist(call))
+                for call in self.tk.splitlist(self.tk.eval("set ::calls"))]
+
+
+@pytest.mark.parametrize("value", [
+    "plain", "two words", "{DejaVu Sans} 12", "$dollar [bracket] \\back",
+    "new\nline", "semi;colon \"quoted\"", "", "}", "\\"
+])
+def test_tcl_word_round_trip(value: str) -> None:
+    interpreter = tk.Tcl()
+    assert interpreter.eval(f"set x {tcl_word(value)}") == value
+
+
+def test_tcl_word_lists_and_numbers() -> None:
+    interpreter = tk.Tcl()
+    assert interpreter.tk.splitlist(interpreter.eval(
+        f"set x {tcl_word(('a b', 'c'))}")) == ('a b', 'c')
+    assert float(interpreter.eval(f"set x {tcl_word(0.1)}")) == 0.1
+
+
+def test_batch_runs_once_and_returns_ids() -> None:
+    canvas = FakeCanvas()
+    batch = TclBatch(canvas)
+    batch.create("line", [0, 0, 10.5, 10], {"fill": "red", "width": 2})
+    batch.create("text", [5, 5], {"text": "hello {world}", "fill": "bad"})
+    batch.create("oval", [0, 0, 1, 1], {"fill": ""}, below=1)
+    batch.add("delete", 7)
+    assert len(batch) == 4
+    assert batch.run() == [1, None, 2]
+    assert len(batch) == 0 and batch.run() == []
+    calls = canvas.calls()
+    assert calls[0] == ["create", "line", "0", "0", "10.5", "10",
+                        "-fill", "red", "-width", "2"]
+    assert calls[1][-3] == "hello {world}"  # Refused, but passed intact
+    assert calls[2][-2:] == ["-fill", ""]
+    assert calls[3] == ["lower", "2", "1"]
+    assert calls[4] == ["delete", "7"]
@@ -0,0 +1,43 @@
+from transform import rotation, scaling, skewing, mirroring, around, \
+    keeps_axes, box_to_polygon, transform_coords, transform_shapes, OVAL_POINTS
+import pytest
+
+
+def test_rotation_around_pivot() -> None:
+    affine = around(rotation(90), (10, 10))
+    # The pivot stays, a point to its right goes below it
+    assert transform_coords([[10, 10, 20, 10]], affine)[0] == \
+        pytest.approx([10, 10, 10, 20])
+
+
+def test_scaling_and_mirroring() -> None:
+    assert transform_coords([[0, 0, 4, 2]], around(scaling(2, 3), (0, 0))) == \
+        [[0, 0, 8, 6]]
+    assert transform_coords([[0, 0, 4, 2]], around(mirroring(True), (2, 0))) == \
+        [[4, 0, 0, 2]]
+
+
+def test_keeps_axes() -> None:
+    assert keeps_axes(around(scaling(2, 0.5), (3, 4)))
+    assert keeps_axes(around(mirroring(False), (3, 4)))
+    assert not keeps_axes(around(rotation(30), (0, 0)))
+    assert not keeps_axes(around(skewing(10, 0), (0, 0)))
+
+
+def test_box_to_polygon() -> None:
+    assert box_to_polygon("rectangle", [0, 0, 2, 1]) == [0, 0, 2, 0, 2, 1, 0, 1]
+    oval = box_to_polygon("oval", [0, 0, 2, 2])
+    assert len(oval) == OVAL_POINTS * 2
+    assert oval[:2] == pytest.approx([2, 1])
+
+
+def test_transform_shapes() -> None:
+    shapes = [("rectangle", [0, 0, 2, 2]), ("line", [0, 0, 1, 1]),
+              ("text", [5, 5])]
+    scaled = transform_shapes(shapes, around(scaling(2, 2), (0, 0)))
+    assert scaled == [("rectangle", [0, 0, 4, 4]), ("line", [0, 0, 2, 2]),
+                      ("text", [10, 10])]
+    rotated = transform_shapes(shapes, around(rotation(45), (0, 0)))
+    assert [obj_type for obj_type, _ in rotated] == ["polygon", "line", "text"]
+    assert len(rotated[0][1]) == 8
+    assert transform_shapes([], around(rotation(45), (0, 0))) == []
@@ -0,0 +1,133 @@
+from typing import List, Sequence, Tuple
+import numpy as np
+import math
+
+OVAL_POINTS: int = 64  # How many points a transformed oval is drawn with
+# The types of objects whose coordinates are two corners of a box,
+# they stay boxes only while the transform keeps the axes straight
+BOX_TYPES: List[str] = ["rectangle", "oval"]
+
+Shape = Tuple[str, List[float]]  # (The type of the object, its coordinates)
+
+
+def rotation(degrees: float) -> np.ndarray:
+    """
+    This function returns the matrix that rotates by an angle.
+    The y axis of the canvas points down, so positive angles rotate clockwise.
+    :param degrees: The angle to rotate by, in degrees.
+    :return: A 2x2 matrix.
+    """
+    radians = math.radians(degrees)
+    cos, sin = math.cos(radians), math.sin(radians)
+    return np.array([[cos, -sin], [sin, cos]])
+
+
+def scaling(sx: float, sy: float) -> np.ndarray:
+    """
+    This function returns the matrix that scales by a factor on every axis.
+    :param sx: The factor to scale the x axis by.
+    :param sy: The factor to scale the y axis by.
+    :return: A 2x2 matrix.
+    """
+    return np.array([[sx, 0.0], [0.0, sy]])
+
+
+def skewing(x_degrees: float, y_degrees: float) -> np.ndarray:
+    """
+    This function returns the matrix that skews by an angle along every axis.
+    :param x_degrees: The angle to slant vertical lines by, in degrees.
+    :param y_degrees: The angle to slant horizontal lines by, in degrees.
+    :return: A 2x2 matrix.
+    """
+    return np.array([[1.0, math.tan(math.radians(x_degrees))],
+                     [math.tan(math.radians(y_degrees)), 1.0]])
+
+
+def mirroring(horizontal: bool) -> np.ndarray:
+    """
+    This function returns the matrix that mirrors left to right,
+    or top to bottom.
+    :param horizontal: True to mirror left to right, False for top to bottom.
+    :return: A 2x2 matrix.
+    """
+    return scaling(-1.0, 1.0) if horizontal else scaling(1.0, -1.0)
+
+
+def around(matrix: np.ndarray, pivot: Tuple[float, float]) -> np.ndarray:
+    """
+    This function makes a linear transform keep a pivot in place.
+    :param matrix: The 2x2 matrix of the transform.
+    :param pivot: The x and y coordinates of the pivot.
+    :return: A 2x3 affine matrix, its last column is the translation.
+    """
+    pivot_vector = np.asarray(pivot, dtype=float)
+    return np.column_stack((matrix, pivot_vector - matrix @ pivot_vector))
+
+
+def keeps_axes(affine: np.ndarray) -> bool:
+    """
+    This function checks whether a transform keeps boxes upright,
+    which is true for scaling and mirroring and false for rotating or skewing.
+    :param affine: The 2x3 affine matrix of the transform.
+    :return: True if the transform keeps the x and y axes straight.
+    """
+    return bool(np.isclose(affine[0, 1], 0) and np.isclose(affine[1, 0], 0))
+
+
+def box_to_polygon(obj_type: str, coords: Sequence[float]) -> List[float]:
+    """
+    This function converts a rectangle or an oval to a polygon,
+    so it can be rotated or skewed.
+    :param obj_type: 'rectangle' or 'oval'.
+    :param coords: The two corners of the object's box.
+    :return: The flat coordinates of the polygon.
+    """
+    x1, y1, x2, y2 = coords[:4]
+    if obj_type == "rectangle":
+        return [x1, y1, x2, y1, x2, y2, x1, y2]
+    angles = np.linspace(0, 2 * math.pi, OVAL_POINTS, endpoint=False)
+    points = np.column_stack(((x1 + x2) / 2 + (x2 - x1) / 2 * np.cos(angles),
+                              (y1 + y2) / 2 + (y2 - y1) / 2 * np.sin(angles)))
+    return points.ravel().tolist()
+
+
+def transform_coords(coords: Sequence[Sequence[float]],
+                     affine: np.ndarray) -> List[List[float]]:
+    """
+    This function transforms the points of many objects at once.
+    :param coords: The flat coordinates of each object.
+    :param affine: The 2x3 affine matrix of the transform.
+    :return: The transformed flat coordinates of each object.
+    """
+    if not coords:
+        return []
+    lengths = [len(object_coords) for object_coords in coords]
+    points = np.concatenate([np.asarray(object_coords, dtype=float)
+                             for object_coords in coords]).reshape(-1, 2)
+    moved = (points @ affine[:, :2].T + affine[:, 2]).ravel().tolist()
+    result: List[List[float]] = []
+    start = 0
+    for length in lengths:
+        result.append(moved[start:start + length])
+        start += length
+    return result
+
+
+def transform_shapes(shapes: Sequence[Shape],
+                     affine: np.ndarray) -> List[Shape]:
+    """
+    This function transforms objects. Rectangles and ovals become polygons
+    when the transform does not keep them upright. The text of text objects
+    is not turned, only their position is moved.
+    :param shapes: The type and the coordinates of each object.
+    :param affine: The 2x3 affine matrix of the transform.
+    :return: The new type and coordinates of each object.
+    """
+    upright = keeps_axes(affine)
+    converted: List[Shape] = [
+        (obj_type, list(coords)) if upright or obj_type not in BOX_TYPES
+        else ("polygon", box_to_polygon(obj_type, coords))
+        for obj_type, coords in shapes]
+    moved = transform_coords([coords for _, coords in converted], affine)
+    return [(obj_type, coords)
+            for (obj_type, _), coords in zip(converted, moved)]
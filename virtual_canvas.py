@@ -0,0 +1,1860 @@
+from spatial import GridIndex, BBox, boxes_overlap, box_contains, grow_box
+from fonts import measure_text
+from detail import build_detail_levels, level_for_zoom, \
+    PIXEL_TOLERANCE, MIN_DETAIL_POINTS
+from backdrop import render_tile, tile_range, tile_region, Color, \
+    TILE_SIZE, MAX_TILES, FREEZABLE_TYPES
+from tcl_batch import TclBatch
+from hit_test import hit_objects, HitShape
+from snapping import SnapIndex, snap_points
+from styles import StyleTable, STYLE_OPTIONS
+from PIL import ImageTk
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Union, List, Tuple, Dict, Set, Any, Iterator, \
+    Iterable, Sequence
+import tkinter as tk
+import numpy as np
+import bisect
+import heapq
+import math
+
+VIEW_MARGIN: int = 512  # Objects this close to the view exist as Tk items too
+SCROLL_LIMIT: int = 1_000_000  # How far the canvas can be scrolled to
+MIN_ZOOM: float = 1 / 64
+MAX_ZOOM: float = 32
+DEFAULT_LAYER: str = "Layer 1"  # The layer of a new canvas
+BACKDROP_TAG: str = "backdrop"  # The tag of the backdrop's Tk items
+# The key of the style id in the information of an object,
+# which is not the name of any Tk option
+STYLE_ID_KEY: str = "style_id"
+
+# The options tkinter uses when an option was not given
+DEFAULT_OPTIONS: Dict[str, Dict[str, str]] = {
+    "line": {"fill": "black", "width": "1.0"},
+    "rectangle": {"fill": "", "outline": "black", "width": "1.0"},
+    "oval": {"fill": "", "outline": "black", "width": "1.0"},
+    "polygon": {"fill": "black", "outline": "", "width": "1.0"},
+    "text": {"fill": "black", "font": "TkDefaultFont", "text": ""}
+}
+
+# The options that each type of object does not have
+UNKNOWN_OPTIONS: Dict[str, List[str]] = {
+    "line": ["outline", "text", "font"],
+    "rectangle": ["text", "font"],
+    "oval": ["text", "font"],
+    "polygon": ["text", "font"],
+    "text": ["outline"]
+}
+
+# The options that change the size of an object
+GEOMETRY_OPTIONS: List[str] = ["width", "font", "text"]
+
+# The types of objects that are drawn with less points when zoomed out
+DETAIL_TYPES: List[str] = ["line", "polygon"]
+
+TagOrId = Union[int, str]
+StackKey = Tuple[int, float]  # (The rank of the layer, z)
+
+
+def flatten_coords(coords: Any) -> List[float]:
+    """
+    This function flattens coordinates the way tkinter accepts them,
+    for example (x1, y1, x2, y2), [[x1, y1], [x2, y2]] or [(x1, y1), ...].
+    :param coords: The coordinates to flatten.
+    :return: A flat list of the coordinates.
+    """
+    flat: List[float] = []
+    for value in coords:
+        if isinstance(value, (list, tuple)):
+            flat.extend(flatten_coords(value))
+        else:
+            flat.append(float(value))
+    return flat
+
+
+class Layer:
+    """
+    Class that represents a layer of the canvas.
+    Change visible through VirtualCanvas.set_layer_visible, so the Tk items
+    of the layer's objects are created or deleted.
+
+    Attributes:
+        name (str): The name of the layer, unique in its canvas.
+        visible (bool): Whether the layer's objects are shown.
+        locked (bool): Whether the layer's objects can not be erased
+                       or selected.
+    """
+
+    def __init__(self, name: str, visible: bool = True,
+                 locked: bool = False) -> None:
+        """
+        Initialize the layer.
+        :param name: The name of the layer.
+        :param visible: Whether the layer's objects are shown.
+                        Defaults to True.
+        :param locked: Whether the layer's objects can not be erased or
+                       selected. Defaults to False.
+        """
+        self.name: str = name
+        self.visible: bool = visible
+        self.locked: bool = locked
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        This function describes the layer the way it is saved.
+        :return: A dictionary of the layer's attributes.
+        """
+        return {"name": self.name, "visible": self.visible,
+                "locked": self.locked}
+
+
+class VirtualCanvas(tk.Canvas):
+    """
+    Class that represents a scrollable, effectively unbounded canvas.
+    All of its objects are kept in Python, and only the objects near the
+    visible region (plus a margin) exist as Tk items, so Tk's memory and
+    redraw cost follow what is visible and not the size of the drawing.
+
+    The item methods of tk.Canvas (create_*, coords, itemconfig, itemcget,
+    type, move, delete, tag_raise, find_*, bbox) work as usual,
+    but the ids they take and return are the ids of the objects in the
+    document, which stay valid while their Tk items come and go.
+    An object that is deleted and created again inside recreating gets its
+    id back, so the history and the saved files can refer to it by id.
+    Coordinates are canvas coordinates at the actual size, whatever the zoom
+    is (canvasx and canvasy convert window coordinates to them too).
+
+    Every object belongs to a layer, and the layers stack above each other.
+    The objects of hidden layers have no Tk items and are left out of the
+    spatial index, so they cost nothing until the layer is shown again.
+
+    Objects can be frozen: their Tk items are replaced by a raster backdrop,
+    drawn below all the other objects, and they can not be found until they
+    are thawed. Changing a frozen object thaws it. Only objects below all
+    the live ones are frozen, and a live object that ends up below frozen
+    ones thaws them.
+
+    Attributes:
+        margin (int): How close to the view objects have Tk items,
+                      in screen pixels.
+        zoom (float): The zoom of the canvas, 1 is the actual size.
+        current_layer (str): The layer new objects are added to.
+    """
+
+    def __init__(self, master: tk.Misc, margin: int = VIEW_MARGIN,
+                 **kw: Any) -> None:
+        """
+        Initialize the canvas.
+        :param master: The parent of the canvas.
+        :param margin: How close to the view objects have Tk items.
+                       Defaults to VIEW_MARGIN.
+        :param kw: Options of tk.Canvas.
+        """
+        super().__init__(master, **kw)
+        self.margin: int = margin
+        self.zoom: float = 1.0
+        # The information of every object, as returned by get_item_info,
+        # but with the id of its style instead of the style options
+        self.__objects: Dict[int, Dict[str, Any]] = {}
+        # The styles of the objects, shared by all the objects of a style
+        self.__styles: StyleTable = StyleTable()
+        # The stacking order of the objects, higher is on top
+        self.__z: Dict[int, float] = {}
+        self.__top_z: float = 0
+        self.__bottom_z: float = 0
+        self.__next_id: int = 1
+        # While batching, the objects waiting for Tk items and the Tk items
+        # waiting to be deleted, see batch
+        self.__batching: int = 0
+        self.__pending: Set[int] = set()
+        self.__doomed: List[int] = []
+        # The id the next object gets instead of a new one, see recreating
+        self.__reused_id: Optional[int] = None
+        self.__index: GridIndex = GridIndex()
+        # The points other objects snap to, of every shown object, and the
+        # objects whose points are updated on the next query
+        self.__snaps: SnapIndex = SnapIndex()
+        self.__unsnapped: Set[int] = set()
+        # The objects that exist as Tk items, and their Tk ids
+        self.__to_tk: Dict[int, int] = {}
+        self.__from_tk: Dict[int, int] = {}
+        # The objects that exist as Tk items, sorted by (key, object)
+        self.__stack: List[Tuple[StackKey, int]] = []
+        # The layers, bottom first, and the objects of each layer
+        self.__layers: List[Layer] = [Layer(DEFAULT_LAYER)]
+        self.__ranks: Dict[str, int] = {DEFAULT_LAYER: 0}
+        self.__members: Dict[str, Set[int]] = {DEFAULT_LAYER: set()}
+        self.__layer_of: Dict[int, str] = {}
+        self.current_layer: str = DEFAULT_LAYER
+        # The objects that have each tag
+        self.__tagged: Dict[str, Set[int]] = {}
+        # How far the Tk items of a tag were moved ahead of their objects
+        self.__previews: Dict[str, Tuple[float, float]] = {}
+        # The frozen objects, which are drawn by the backdrop
+        self.__frozen: Set[int] = set()
+        self.__frozen_index: GridIndex = GridIndex()
+        # The stacking order of the highest frozen object, when it is known
+        self.__frozen_top: Optional[StackKey] = None
+        # The rendered tiles of the backdrop, least recently used first,
+        # and the Tk ids of the tiles that are shown
+        self.__tiles: OrderedDict[Tuple[int, int], ImageTk.PhotoImage] = \
+            OrderedDict()
+        self.__tile_items: Dict[Tuple[int, int], int] = {}
+        self.__backdrop_dirty: bool = False
+        self.__colors: Dict[str, Optional[Color]] = {}
+        # The region whose objects exist as Tk items
+        self.__region: Optional[BBox] = None
+        self.__refresh_pending: bool = False
+        # The detail levels of dense objects, computed when first needed
+        self.__details: Dict[int, List[List[float]]] = {}
+        # The detail level each Tk item is drawn in, if it is not exact
+        self.__drawn_levels: Dict[int, int] = {}
+
+        self.configure(scrollregion=(-SCROLL_LIMIT, -SCROLL_LIMIT,
+                                     SCROLL_LIMIT, SCROLL_LIMIT))
+        # Start with the origin of the canvas at the top-left corner
+        super().xview_moveto(0.5)
+        super().yview_moveto(0.5)
+        self.bind("<Configure>", lambda event: self.schedule_refresh(),
+                  add="+")
+
+    # ----- The document -----
+
+    def __normalize(self, option: str, value: Any) -> Any:
+        """
+        This function converts an option's value to the form
+        tkinter.Canvas.itemcget returns it in.
+        :param option: The name of the option.
+        :param value: The value of the option.
+        :return: The normalized value.
+        """
+        if option == "tags":
+            if isinstance(value, str):
+                return tuple(self.tk.splitlist(value))
+            return tuple(str(tag) for tag in value)
+        if isinstance(value, (list, tuple)):
+            # format gives the string form of the list, as Tk would
+            return str(self.tk.call("format", "%s", tuple(value)))
+        if option == "width" and isinstance(value, (int, float)):
+            return str(float(value))
+        return str(value)
+
+    def __option(self, info: Dict[str, Any], option: str,
+                 default: Any = None) -> Any:
+        """
+        This function gets an option of an object from its style or itself.
+        :param info: The information of the object.
+        :param option: The name of the option.
+        :param default: What to return if the object has no such option.
+                        Defaults to None.
+        :return: The value of the option.
+        """
+        if option in STYLE_OPTIONS:
+            return self.__styles[info[STYLE_ID_KEY]].get(option, default)
+        return info.get(option, default)
+
+    def __options(self, info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        This function gets all the options of an object, the way Tk takes
+        them.
+        :param info: The information of the object.
+        :return: A new dictionary of the options of the object.
+        """
+        options = {key: value for key, value in info.items()
+                   if key not in ("type", "coords", STYLE_ID_KEY)}
+        options.update(self.__styles[info[STYLE_ID_KEY]])
+        return options
+
+    def __set_options(self, info: Dict[str, Any],
+                      options: Dict[str, Any]) -> None:
+        """
+        This function changes options of an object, its style options by
+        changing its style.
+        :param info: The information of the object.
+        :param options: The normalized values of the options to change.
+        """
+        style: Optional[Dict[str, Any]] = None
+        for option, value in options.items():
+            if option in STYLE_OPTIONS:
+                if style is None:
+                    style = dict(self.__styles[info[STYLE_ID_KEY]])
+                style[option] = value
+            else:
+                info[option] = value
+        if style is not None:
+            info[STYLE_ID_KEY] = self.__styles.add(style)
+
+    def __expanded(self, info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        This function gets the information of an object with its style
+        options, as returned by get_item_info.
+        :param info: The information of the object.
+        :return: A new dictionary of the information.
+        """
+        expanded = {"type": info["type"], "coords": info["coords"]}
+        expanded.update(self.__options(info))
+        return expanded
+
+    def __bbox_of(self, info: Dict[str, Any]) -> BBox:
+        """
+        This function calculates the bounding box of an object, the way the
+        spatial index keeps it. Lines and outlines are left out, since their
+        width is in screen pixels and the index does not change with the
+        zoom, see __reach.
+        :param info: The information of the object.
+        :return: The bounding box of the object.
+        """
+        coords: List[float] = info["coords"]
+        if info["type"] == "text":
+            width, height = measure_text(self, self.__option(info, "font"),
+                                         info["text"])
+            return (coords[0] - width / 2, coords[1] - height / 2,
+                    coords[0] + width / 2, coords[1] + height / 2)
+        xs, ys = coords[::2], coords[1::2]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def __width_reach(self, width: Any) -> float:
+        """
+        This function calculates how far a line of a width is drawn beyond
+        its coordinates (and the pixel Tk adds), at the current zoom.
+        :param width: The width option of the line, in screen pixels.
+        :return: The distance, in canvas units.
+        """
+        try:
+            pixels = float(width) / 2 + 1
+        except ValueError:
+            pixels = 1
+        return pixels / self.zoom
+
+    def __reach(self, item: int) -> float:
+        """
+        This function calculates how far an object is drawn beyond the
+        bounding box of the spatial index.
+        :param item: The id of the object.
+        :return: The distance, in canvas units.
+        """
+        info = self.__objects[item]
+        if info["type"] == "text":
+            return 0
+        return self.__width_reach(self.__option(info, "width", 1))
+
+    def __widest_reach(self) -> float:
+        """
+        This function calculates how far any object is drawn beyond the
+        bounding box of the spatial index, to widen the queries of the index
+        by.
+        :return: The distance, in canvas units.
+        """
+        return max((self.__width_reach(self.__styles[style_id].get("width", 1))
+                    for style_id in range(len(self.__styles))),
+                   default=self.__width_reach(1))
+
+    def __drawn_bbox(self, item: int) -> BBox:
+        """
+        This function calculates the bounding box an object is drawn in,
+        at the current zoom.
+        :param item: The id of the object.
+        :return: The bounding box, in canvas units.
+        """
+        box = self.__index.bbox(item) if item in self.__index \
+            else self.__bbox_of(self.__objects[item])
+        return grow_box(box, self.__reach(item))
+
+    def __update_snaps(self) -> None:
+        """
+        This function updates the snap points of the objects that have
+        changed since the last query, so drawing and loading do not pay for
+        them until snapping is used.
+        """
+        for item in self.__unsnapped:
+            info = self.__objects[item]
+            if info["type"] == "text":
+                points = snap_points("text", self.__bbox_of(info))
+            else:
+                points = snap_points(info["type"], info["coords"])
+            self.__snaps.insert(item, points)
+        self.__unsnapped.clear()
+
+    def __resolve(self, tag_or_id: TagOrId) -> List[int]:
+        """
+        This function finds the objects a tag or an id refers to.
+        :param tag_or_id: An object id, 'all', 'current' or a tag.
+        :return: The ids of the objects.
+        """
+        if isinstance(tag_or_id, str) and tag_or_id.isdigit():
+            tag_or_id = int(tag_or_id)
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.__objects else []
+        if tag_or_id == "all":
+            return list(self.__objects)
+        if tag_or_id == "current":
+            return [self.__from_tk[tk_id]
+                    for tk_id in super().find_withtag("current")
+                    if tk_id in self.__from_tk]
+        return list(self.__tagged.get(tag_or_id, ()))
+
+    @staticmethod
+    def __is_tag(tag_or_id: TagOrId) -> bool:
+        """
+        This function checks whether a tag or an id is a tag the Tk items
+        of the objects have too, so one Tk call can handle all of them.
+        :param tag_or_id: An object id, 'all', 'current' or a tag.
+        :return: True if tag_or_id is a tag, False otherwise.
+        """
+        return isinstance(tag_or_id, str) and not tag_or_id.isdigit() and \
+            tag_or_id not in ("all", "current")
+
+    def __set_tags(self, item: int, tags: Tuple[str, ...]) -> None:
+        """
+        This function changes the tags of an object in the document.
+        :param item: The id of the object.
+        :param tags: The new tags of the object.
+        """
+        info = self.__objects[item]
+        for tag in info.get("tags", ()):
+            self.__tagged[tag].discard(item)
+            if not self.__tagged[tag]:
+                del self.__tagged[tag]
+        if tags:
+            info["tags"] = tags
+        else:
+            info.pop("tags", None)
+        for tag in tags:
+            self.__tagged.setdefault(tag, set()).add(item)
+
+    def __first(self, tag_or_id: TagOrId) -> Optional[int]:
+        """
+        This function finds the object a tag or an id refers to.
+        :param tag_or_id: An object id, 'current' or a tag.
+        :return: The id of the lowest object the tag refers to,
+                 or None if it refers to no object (like Tk, the item
+                 methods do nothing for missing objects).
+        """
+        items = self.__resolve(tag_or_id)
+        if not items:
+            return None
+        return min(items, key=self.__key)
+
+    def __key(self, item: int) -> StackKey:
+        """
+        This function returns the stacking order of an object.
+        Objects are stacked by their layer first, and by their z second.
+        :param item: The id of the object.
+        :return: The key to sort the object by, higher is on top.
+        """
+        return self.__ranks[self.__layer_of[item]], self.__z[item]
+
+    def __sorted(self, items: List[int]) -> Tuple[int, ...]:
+        """
+        This function sorts objects by their stacking order, bottom first.
+        :param items: The ids of the objects.
+        :return: The sorted ids.
+        """
+        return tuple(sorted(items, key=self.__key))
+
+    def object_info(self, item: int) -> Dict[str, Any]:
+        """
+        This function returns the stored information of an object,
+        with its style options.
+        :param item: The id of the object.
+        :return: A new dictionary of the information of the object.
+        """
+        return self.__expanded(self.__objects[item])
+
+    def object_count(self) -> int:
+        """
+        This function returns the amount of objects in the document.
+        """
+        return len(self.__objects)
+
+    def next_id(self) -> int:
+        """
+        This function returns the id the next new object gets.
+        """
+        return self.__next_id
+
+    def reserve_ids(self, next_id: int) -> None:
+        """
+        This function makes new objects get ids from next_id on, so they
+        never get the ids of deleted objects that the history refers to.
+        :param next_id: The lowest id new objects may get.
+        """
+        self.__next_id = max(self.__next_id, next_id)
+
+    # ----- Tk items -----
+
+    def __in_region(self, item: int) -> bool:
+        """
+        This function checks whether an object should exist as a Tk item.
+        :param item: The id of the object.
+        :return: True if the object is near the view, False otherwise.
+        """
+        return self.__region is not None and \
+            boxes_overlap(self.__index.bbox(item), self.__region)
+
+    def __materialize(self, item: int) -> None:
+        """
+        This function creates the Tk item of an object.
+        While batching, the Tk item is created when the batch ends.
+        :param item: The id of the object.
+        """
+        if self.__batching:
+            self.__pending.add(item)
+            return
+        info = self.__objects[item]
+        tk_id: int = super()._create(info["type"],
+                                     tuple(self.__screen_coords(item)),
+                                     self.__options(info))
+        self.__to_tk[item] = tk_id
+        self.__from_tk[tk_id] = item
+        entry = (self.__key(item), item)
+        position = bisect.bisect(self.__stack, entry)
+        self.__stack.insert(position, entry)
+        if position + 1 < len(self.__stack):
+            # Keep the stacking order, new Tk items are created on top
+            super().tag_lower(tk_id, self.__to_tk[self.__stack[position + 1][1]])
+
+    def __dematerialize(self, item: int, delete_tk: bool = True) -> int:
+        """
+        This function deletes the Tk item of an object,
+        the object itself stays in the document.
+        :param item: The id of the object.
+        :param delete_tk: Whether to delete the Tk item, or leave it to the
+                          caller to delete many Tk items at once.
+                          Defaults to True.
+        :return: The Tk id of the object.
+        """
+        tk_id = self.__to_tk.pop(item)
+        del self.__from_tk[tk_id]
+        self.__drawn_levels.pop(item, None)
+        position = bisect.bisect_left(self.__stack, (self.__key(item), item))
+        del self.__stack[position]
+        if delete_tk and self.__batching:
+            self.__doomed.append(tk_id)
+        elif delete_tk:
+            super().delete(tk_id)
+        return tk_id
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        This function collects the Tk items that are created and deleted in
+        the with block, and creates and deletes all of them in one Tcl call
+        when the block ends, for bulk changes like loading a drawing.
+        The objects created in the with block have no Tk items until then,
+        and Tk refusing one of them raises TclError when the block ends.
+        """
+        self.__batching += 1
+        try:
+            yield
+        finally:
+            self.__batching -= 1
+            if not self.__batching:
+                self.__flush()
+
+    def __flush(self) -> None:
+        """
+        This function deletes and creates the Tk items collected by batch.
+        """
+        doomed, self.__doomed = self.__doomed, []
+        if doomed:
+            super().delete(*doomed)
+        # The objects may have been deleted, hidden, frozen or moved away
+        pending = [item for item in self.__pending
+                   if item in self.__objects and item not in self.__to_tk and
+                   self.__is_shown(item) and item not in self.__frozen and
+                   self.__in_region(item)]
+        self.__pending.clear()
+        if pending:
+            self.__materialize_many(pending)
+
+    def __materialize_many(self, items: List[int]) -> None:
+        """
+        This function creates the Tk items of many objects in one Tcl call.
+        :param items: The ids of the objects, none of them has a Tk item.
+        """
+        entries = sorted((self.__key(item), item) for item in items)
+        batch = TclBatch(self)
+        for entry in entries:
+            # New Tk items are created on top, so put each one right below
+            # the first older Tk item above it. New Tk items are created
+            # bottom first, so they stay in order among themselves.
+            position = bisect.bisect(self.__stack, entry)
+            below = self.__to_tk[self.__stack[position][1]] \
+                if position < len(self.__stack) else None
+            info = self.__objects[entry[1]]
+            batch.create(info["type"], self.__screen_coords(entry[1]),
+                         self.__options(info), below)
+        created: List[Tuple[StackKey, int]] = []
+        refused: List[int] = []
+        for entry, tk_id in zip(entries, batch.run()):
+            if tk_id is None:
+                refused.append(entry[1])
+                continue
+            self.__to_tk[entry[1]] = tk_id
+            self.__from_tk[tk_id] = entry[1]
+            created.append(entry)
+        self.__stack = list(heapq.merge(self.__stack, created))
+        for item in refused:
+            # Tk refused the object, so it is not kept
+            self.__forget(item)
+        if refused:
+            raise tk.TclError(f"{len(refused)} objects have bad options")
+
+    def __level_of(self, item: int) -> int:
+        """
+        This function chooses the detail level to draw an object in.
+        :param item: The id of the object.
+        :return: The index of the detail level, or -1 for the exact shape.
+        """
+        info = self.__objects[item]
+        if self.zoom >= PIXEL_TOLERANCE / 2 or \
+                info["type"] not in DETAIL_TYPES or \
+                len(info["coords"]) < 2 * MIN_DETAIL_POINTS:
+            return -1
+        if item not in self.__details:
+            self.__details[item] = build_detail_levels(info["coords"])
+        return level_for_zoom(self.zoom, len(self.__details[item]))
+
+    def __screen_coords(self, item: int) -> List[float]:
+        """
+        This function calculates the coordinates of an object's Tk item,
+        in the detail level that fits the zoom.
+        :param item: The id of the object.
+        :return: The coordinates of the Tk item.
+        """
+        level = self.__level_of(item)
+        if level == -1:
+            self.__drawn_levels.pop(item, None)
+            coords = self.__objects[item]["coords"]
+        else:
+            self.__drawn_levels[item] = level
+            coords = self.__details[item][level]
+        zoom = self.zoom
+        if self.__previews:
+            # Tk items created while their tag is dragged join the others
+            dx, dy = self.__preview_offset(item)
+            if dx or dy:
+                return [(value + (dx, dy)[i % 2]) * zoom
+                        for i, value in enumerate(coords)]
+        return [value * zoom for value in coords]
+
+    def __preview_offset(self, item: int) -> Tuple[float, float]:
+        """
+        This function finds how far move_preview has moved the Tk item of an
+        object ahead of the object.
+        :param item: The id of the object.
+        :return: The offset on the x and y axes.
+        """
+        total_dx, total_dy = 0.0, 0.0
+        for tag in self.__objects[item].get("tags", ()):
+            dx, dy = self.__previews.get(tag, (0, 0))
+            total_dx += dx
+            total_dy += dy
+        return total_dx, total_dy
+
+    def __sync(self, item: int) -> None:
+        """
+        This function creates or deletes the Tk item of an object
+        whose size or location has changed.
+        :param item: The id of the object.
+        """
+        if not self.__is_shown(item) or item in self.__frozen:
+            return
+        self.__index.update(item, self.__bbox_of(self.__objects[item]))
+        self.__unsnapped.add(item)
+        in_region = self.__in_region(item)
+        if item in self.__to_tk and not in_region:
+            self.__dematerialize(item)
+        elif item not in self.__to_tk and in_region:
+            self.__materialize(item)
+
+    def tk_id(self, item: int) -> Optional[int]:
+        """
+        This function returns the Tk id of an object.
+        :param item: The id of the object.
+        :return: The Tk id, or None if the object is not near the view.
+        """
+        return self.__to_tk.get(item)
+
+    def item_of(self, tk_id: int) -> Optional[int]:
+        """
+        This function returns the object of a Tk item.
+        :param tk_id: The Tk id of the item.
+        :return: The id of the object, or None if the item is not an object.
+        """
+        return self.__from_tk.get(tk_id)
+
+    def create_overlay(self, itemType: str, coords: List[float],
+                       **options: Any) -> int:
+        """
+        This function creates a Tk item that is not an object of the document,
+        for example the outline of a selection while it is dragged.
+        :param itemType: The type of the item, 'line' for example.
+        :param coords: The coordinates of the item, in canvas coordinates.
+        :param options: The options of the item.
+        :return: The Tk id of the item.
+        """
+        zoom = self.zoom
+        return super()._create(itemType, tuple(value * zoom for value in coords),
+                               options)
+
+    def overlay_coords(self, tk_id: int, coords: List[float]) -> None:
+        """
+        This function changes the coordinates of an item created by
+        create_overlay.
+        :param tk_id: The Tk id of the item.
+        :param coords: The new coordinates, in canvas coordinates.
+        """
+        zoom = self.zoom
+        super().coords(tk_id, *[value * zoom for value in coords])
+
+    def delete_overlay(self, tk_id: int) -> None:
+        """
+        This function deletes an item created by create_overlay.
+        :param tk_id: The Tk id of the item.
+        """
+        super().delete(tk_id)
+
+    def visible_region(self) -> BBox:
+        """
+        This function returns the region of the canvas that is visible.
+        :return: The visible region, in canvas coordinates.
+        """
+        return (self.canvasx(0), self.canvasy(0),
+                self.canvasx(self.winfo_width()),
+                self.canvasy(self.winfo_height()))
+
+    def canvasx(self, screenx: float, gridspacing: Any = None) -> float:
+        return super().canvasx(screenx, gridspacing) / self.zoom
+
+    def canvasy(self, screeny: float, gridspacing: Any = None) -> float:
+        return super().canvasy(screeny, gridspacing) / self.zoom
+
+    def __set_region(self, region: BBox) -> None:
+        """
+        This function makes exactly the objects in region exist as Tk items.
+        :param region: The region, in canvas coordinates.
+        """
+        self.__region = region
+        wanted = self.__index.query(*region)
+        with self.batch():
+            for item in [item for item in self.__to_tk if item not in wanted]:
+                self.__dematerialize(item)
+            for item in wanted:
+                if item not in self.__to_tk:
+                    self.__materialize(item)
+        self.__update_backdrop()
+
+    def refresh_view(self, force: bool = False) -> None:
+        """
+        This function creates the Tk items of the objects that came near the
+        view, and deletes the Tk items of the objects that went away from it.
+        :param force: Whether to refresh even if the view is still inside
+                      the region whose objects exist as Tk items.
+                      Defaults to False.
+        """
+        self.__refresh_pending = False
+        view = self.visible_region()
+        if not force and not self.__backdrop_dirty and \
+                self.__region is not None and box_contains(self.__region, view):
+            return
+        margin = self.margin / self.zoom
+        self.__set_region((view[0] - margin, view[1] - margin,
+                           view[2] + margin, view[3] + margin))
+
+    def schedule_refresh(self) -> None:
+        """
+        This function refreshes the view once the program is idle,
+        so many view changes in a row cost one refresh.
+        """
+        if not self.__refresh_pending:
+            self.__refresh_pending = True
+            self.after_idle(self.refresh_view)
+
+    @contextmanager
+    def fully_materialized(self) -> Iterator[None]:
+        """
+        This function makes all the objects exist as Tk items while
+        in the with block, for code that reads the Tk items directly
+        (exporting, for example).
+        The frozen objects are thawed while in the with block.
+        """
+        frozen = list(self.__frozen)
+        self.thaw()
+        self.__set_region((-float("inf"), -float("inf"),
+                           float("inf"), float("inf")))
+        try:
+            yield
+        finally:
+            self.freeze(frozen)
+            self.refresh_view(force=True)
+
+    def zoom_at(self, factor: float, x: int, y: int) -> None:
+        """
+        This function zooms the canvas in or out.
+        The Tk items are scaled in place, and only the dense objects whose
+        detail level changes get new coordinates.
+        :param factor: How much to zoom by, more than 1 zooms in.
+        :param x: The x window coordinate of the point that stays in place.
+        :param y: The y window coordinate of the point that stays in place.
+        """
+        zoom = min(MAX_ZOOM, max(MIN_ZOOM, self.zoom * factor))
+        factor = zoom / self.zoom
+        if factor == 1:
+            return
+        # The Tk coordinates of the point that stays in place
+        tk_x, tk_y = super().canvasx(x), super().canvasy(y)
+        super().scale("all", 0, 0, factor, factor)
+        self.zoom = zoom
+        limit = SCROLL_LIMIT * zoom
+        self.configure(scrollregion=(-limit, -limit, limit, limit))
+        super().xview_moveto((tk_x * factor - x + limit) / (2 * limit))
+        super().yview_moveto((tk_y * factor - y + limit) / (2 * limit))
+        # Redraw the dense objects whose detail level has changed
+        batch = TclBatch(self)
+        for item, tk_id in self.__to_tk.items():
+            if self.__level_of(item) != self.__drawn_levels.get(item, -1):
+                batch.add("coords", tk_id, *self.__screen_coords(item))
+        batch.run()
+        # The backdrop is rendered for one zoom
+        self.__backdrop_dirty = True
+        self.refresh_view(force=True)
+
+    def xview(self, *args: Any) -> Any:
+        result = super().xview(*args)
+        if args:
+            self.schedule_refresh()
+        return result
+
+    def yview(self, *args: Any) -> Any:
+        result = super().yview(*args)
+        if args:
+            self.schedule_refresh()
+        return result
+
+    def xview_moveto(self, fraction: float) -> None:
+        super().xview_moveto(fraction)
+        self.schedule_refresh()
+
+    def yview_moveto(self, fraction: float) -> None:
+        super().yview_moveto(fraction)
+        self.schedule_refresh()
+
+    def xview_scroll(self, number: int, what: str) -> None:
+        super().xview_scroll(number, what)
+        self.schedule_refresh()
+
+    def yview_scroll(self, number: int, what: str) -> None:
+        super().yview_scroll(number, what)
+        self.schedule_refresh()
+
+    def scan_dragto(self, x: int, y: int, gain: int = 10) -> None:
+        super().scan_dragto(x, y, gain)
+        self.schedule_refresh()
+
+    # ----- The item methods of tk.Canvas -----
+
+    def _create(self, itemType: str, args: Any, kw: Dict[str, Any]) -> int:
+        """
+        This function adds an object to the document.
+        It is called by all the create_* methods of tk.Canvas.
+        :return: The id of the new object.
+        """
+        args = tuple(args)
+        options: Dict[str, Any] = {}
+        if args and isinstance(args[-1], dict):
+            options.update(args[-1])
+            args = args[:-1]
+        options.update(kw)
+        info: Dict[str, Any] = {"type": itemType,
+                                "coords": flatten_coords(args)}
+        normalized = dict(DEFAULT_OPTIONS.get(itemType, {}))
+        for option, value in options.items():
+            normalized[option] = self.__normalize(option, value)
+        info[STYLE_ID_KEY] = self.__styles.add(
+            {option: normalized.pop(option) for option in STYLE_OPTIONS
+             if option in normalized})
+        info.update(normalized)
+        item = self.__next_id
+        if self.__reused_id is not None and self.__reused_id not in self.__objects:
+            item = self.__reused_id
+            self.__next_id = max(self.__next_id, item + 1)
+        else:
+            self.__next_id += 1
+        self.__reused_id = None
+        self.__objects[item] = info
+        for tag in info.get("tags", ()):
+            self.__tagged.setdefault(tag, set()).add(item)
+        self.__top_z += 1
+        self.__z[item] = self.__top_z
+        self.__layer_of[item] = self.current_layer
+        self.__members[self.current_layer].add(item)
+        if not self.__is_shown(item):
+            return item
+        self.__thaw_above(self.__key(item))
+        self.__index.insert(item, self.__bbox_of(info))
+        self.__unsnapped.add(item)
+        if self.__in_region(item):
+            try:
+                self.__materialize(item)
+            except tk.TclError:
+                # Tk refused the object, so it is not added
+                self.__forget(item)
+                raise
+        return item
+
+    def __forget(self, item: int, delete_tk: bool = True) -> Optional[int]:
+        """
+        This function removes an object from the document.
+        :param item: The id of the object.
+        :param delete_tk: Whether to delete the Tk item of the object, or
+                          leave it to the caller. Defaults to True.
+        :return: The Tk id of the object, or None if it had no Tk item.
+        """
+        self.__pending.discard(item)
+        tk_id: Optional[int] = None
+        if item in self.__to_tk:
+            tk_id = self.__dematerialize(item, delete_tk)
+        self.__drop_frozen(item)
+        self.__set_tags(item, ())
+        del self.__objects[item]
+        del self.__z[item]
+        self.__members[self.__layer_of.pop(item)].discard(item)
+        self.__details.pop(item, None)
+        self.__index.remove(item)
+        self.__snaps.remove(item)
+        self.__unsnapped.discard(item)
+        return tk_id
+
+    def coords(self, *args: Any) -> List[float]:
+        item = self.__first(args[0])
+        if item is None:
+            return []
+        if len(args) > 1:
+            self.__unfreeze(item)
+            self.__objects[item]["coords"] = flatten_coords(args[1:])
+            self.__details.pop(item, None)
+            if item in self.__to_tk:
+                super().coords(self.__to_tk[item],
+                               *self.__screen_coords(item))
+            self.__sync(item)
+        return list(self.__objects[item]["coords"])
+
+    def set_shape(self, item: int, itemType: str,
+                  coords: List[float]) -> None:
+        """
+        This function changes the type and the coordinates of an object,
+        for example when a rotated rectangle becomes a polygon.
+        The object keeps its id, options, layer and place in the stack,
+        only its Tk item is created again, Tk items can not change type.
+        :param item: The id of the object.
+        :param itemType: The new type of the object.
+        :param coords: The new coordinates of the object.
+        """
+        info = self.__objects[item]
+        if info["type"] == itemType:
+            self.coords(item, *coords)
+            return
+        self.__unfreeze(item)
+        if item in self.__to_tk:
+            self.__dematerialize(item)
+        info["type"] = itemType
+        info["coords"] = flatten_coords(coords)
+        unknown = UNKNOWN_OPTIONS.get(itemType, [])
+        for option in unknown:
+            info.pop(option, None)
+        style = {option: value for option, value
+                 in self.__styles[info[STYLE_ID_KEY]].items()
+                 if option not in unknown}
+        for option, value in DEFAULT_OPTIONS.get(itemType, {}).items():
+            (style if option in STYLE_OPTIONS else info).setdefault(option,
+                                                                    value)
+        info[STYLE_ID_KEY] = self.__styles.add(style)
+        self.__details.pop(item, None)
+        self.__sync(item)
+
+    def move(self, *args: Any) -> None:
+        tag_or_id, dx, dy = args
+        self.__move_objects(tag_or_id, float(dx), float(dy), True)
+
+    def __move_objects(self, tag_or_id: TagOrId, dx: float, dy: float,
+                       move_tk: bool) -> None:
+        """
+        This function moves objects in the document.
+        :param tag_or_id: The objects to move.
+        :param dx: How far to move the objects on the x axis.
+        :param dy: How far to move the objects on the y axis.
+        :param move_tk: Whether to move the Tk items of the objects too.
+        """
+        items = self.__resolve(tag_or_id)
+        # A tag moves all of its Tk items in one call
+        one_call = move_tk and self.__is_tag(tag_or_id)
+        if one_call:
+            super().move(tag_or_id, dx * self.zoom, dy * self.zoom)
+        for item in items:
+            self.__unfreeze(item)
+            coords = self.__objects[item]["coords"]
+            coords[::2] = [x + dx for x in coords[::2]]
+            coords[1::2] = [y + dy for y in coords[1::2]]
+            self.__details.pop(item, None)
+            if item in self.__to_tk and move_tk and not one_call:
+                super().move(self.__to_tk[item], dx * self.zoom,
+                             dy * self.zoom)
+            self.__sync(item)
+
+    def move_preview(self, tag: str, dx: float, dy: float) -> None:
+        """
+        This function moves only the Tk items of a tag, in one call,
+        so dragging many objects stays smooth. The objects themselves
+        are moved once, by finish_move.
+        :param tag: The tag of the objects.
+        :param dx: How far to move the objects on the x axis.
+        :param dy: How far to move the objects on the y axis.
+        """
+        total_dx, total_dy = self.__previews.get(tag, (0, 0))
+        self.__previews[tag] = (total_dx + dx, total_dy + dy)
+        super().move(tag, dx * self.zoom, dy * self.zoom)
+
+    def finish_move(self, tag: str) -> Tuple[float, float]:
+        """
+        This function moves the objects of a tag to where move_preview
+        has moved their Tk items.
+        :param tag: The tag of the objects.
+        :return: How far the objects were moved on the x and y axes.
+        """
+        dx, dy = self.__previews.pop(tag, (0, 0))
+        if dx or dy:
+            self.__move_objects(tag, dx, dy, False)
+        return dx, dy
+
+    def itemcget(self, tagOrId: TagOrId, option: str) -> Any:
+        item = self.__first(tagOrId)
+        if item is None:
+            return ''
+        info = self.__objects[item]
+        options = self.__options(info) if option in STYLE_OPTIONS else info
+        if option in options and option not in ("type", "coords",
+                                                 STYLE_ID_KEY):
+            return options[option]
+        if option in UNKNOWN_OPTIONS.get(info["type"], []):
+            raise tk.TclError(f'unknown option "-{option}"')
+        if item in self.__to_tk:
+            return super().itemcget(self.__to_tk[item], option)
+        return ''
+
+    def itemconfigure(self, tagOrId: TagOrId,
+                      cnf: Optional[Dict[str, Any]] = None,
+                      **kw: Any) -> Any:
+        options: Dict[str, Any] = dict(cnf or {})
+        options.update(kw)
+        items = self.__resolve(tagOrId)
+        if not options:
+            # Querying all the options is only possible for Tk items
+            for item in items:
+                if item in self.__to_tk:
+                    return super().itemconfigure(self.__to_tk[item])
+            return {}
+        # A tag configures all of its Tk items in one call, so the options
+        # are validated first, the way Tk would
+        one_call = self.__is_tag(tagOrId) and "tags" not in options
+        for item in items:
+            info = self.__objects[item]
+            if one_call or item not in self.__to_tk:
+                for option in options:
+                    if option in UNKNOWN_OPTIONS.get(info["type"], []):
+                        raise tk.TclError(f'unknown option "-{option}"')
+        if one_call:
+            for item in items:
+                self.__unfreeze(item)
+            super().itemconfigure(tagOrId, **options)
+        for item in items:
+            info = self.__objects[item]
+            if not one_call:
+                self.__unfreeze(item)
+                if item in self.__to_tk:
+                    # Tk validates the options
+                    super().itemconfigure(self.__to_tk[item], **options)
+            if "tags" in options:
+                self.__set_tags(item, self.__normalize("tags",
+                                                       options["tags"]))
+            self.__set_options(info, {
+                option: self.__normalize(option, value)
+                for option, value in options.items() if option != "tags"})
+            if any(option in GEOMETRY_OPTIONS for option in options):
+                self.__sync(item)
+        return None
+
+    itemconfig = itemconfigure
+
+    def type(self, tagOrId: TagOrId) -> Optional[str]:
+        item = self.__first(tagOrId)
+        if item is None:
+            return None
+        return self.__objects[item]["type"]
+
+    def delete(self, *args: TagOrId) -> None:
+        # Delete all the Tk items in one call
+        tk_ids: List[int] = []
+        for tag_or_id in args:
+            if tag_or_id == "all":
+                super().delete(*self.__to_tk.values())
+                self.__frozen.clear()
+                self.__frozen_index.clear()
+                self.__frozen_top = None
+                self.__backdrop_dirty = True
+                self.schedule_refresh()
+                self.__objects.clear()
+                self.__details.clear()
+                self.__drawn_levels.clear()
+                self.__z.clear()
+                self.__layer_of.clear()
+                for members in self.__members.values():
+                    members.clear()
+                self.__index.clear()
+                self.__snaps.clear()
+                self.__unsnapped.clear()
+                self.__to_tk.clear()
+                self.__from_tk.clear()
+                self.__stack.clear()
+                self.__tagged.clear()
+                self.__previews.clear()
+                self.__pending.clear()
+                continue
+            for item in self.__resolve(tag_or_id):
+                tk_id = self.__forget(item, False)
+                if tk_id is not None:
+                    tk_ids.append(tk_id)
+        if tk_ids:
+            super().delete(*tk_ids)
+
+    def addtag_withtag(self, newtag: str, tagOrId: TagOrId) -> None:
+        items = self.__resolve(tagOrId)
+        for item in items:
+            tags = self.__objects[item].get("tags", ())
+            if newtag not in tags:
+                self.__set_tags(item, tags + (newtag,))
+        if self.__is_tag(tagOrId):
+            super().addtag_withtag(newtag, tagOrId)
+        else:
+            for item in items:
+                if item in self.__to_tk:
+                    super().addtag_withtag(newtag, self.__to_tk[item])
+
+    def add_tags(self, tagged: Dict[str, Iterable[int]]) -> None:
+        """
+        This function adds tags to many objects, like addtag_withtag does
+        for each of them, and tags all of their Tk items in one Tcl call.
+        :param tagged: The objects to give each tag, by the tag.
+        """
+        batch = TclBatch(self)
+        for tag, items in tagged.items():
+            for item in items:
+                if item not in self.__objects:
+                    continue
+                tags = self.__objects[item].get("tags", ())
+                if tag in tags:
+                    continue
+                self.__set_tags(item, tags + (tag,))
+                if item in self.__to_tk:
+                    batch.add("addtag", tag, "withtag", self.__to_tk[item])
+        batch.run()
+
+    def dtag(self, *args: TagOrId) -> None:
+        tag_or_id = args[0]
+        tag_to_delete = args[1] if len(args) > 1 else tag_or_id
+        items = self.__resolve(tag_or_id)
+        for item in items:
+            tags = self.__objects[item].get("tags", ())
+            if tag_to_delete in tags:
+                self.__set_tags(item, tuple(tag for tag in tags
+                                            if tag != tag_to_delete))
+        if self.__is_tag(tag_or_id):
+            super().dtag(tag_or_id, tag_to_delete)
+        else:
+            for item in items:
+                if item in self.__to_tk:
+                    super().dtag(self.__to_tk[item], tag_to_delete)
+
+    def tag_raise(self, *args: TagOrId) -> None:
+        items = self.__sorted(self.__resolve(args[0]))
+        if len(args) > 1:
+            # Right above another object
+            above = self.__first(args[1])
+            if above is None:
+                return
+            above_z = self.__z[above]
+            higher = [z for z in self.__z.values() if z > above_z]
+            next_z = min(higher) if higher else above_z + 1
+            step = (next_z - above_z) / (len(items) + 1)
+            new_z = [above_z + step * (i + 1) for i in range(len(items))]
+        else:
+            new_z = [self.__top_z + i + 1 for i in range(len(items))]
+            self.__top_z += len(items)
+        self.__restack(items, new_z, args[0])
+
+    def tag_lower(self, *args: TagOrId) -> None:
+        items = self.__sorted(self.__resolve(args[0]))
+        if len(args) > 1:
+            # Right below another object
+            below = self.__first(args[1])
+            if below is None:
+                return
+            below_z = self.__z[below]
+            lower = [z for z in self.__z.values() if z < below_z]
+            previous_z = max(lower) if lower else below_z - 1
+            step = (below_z - previous_z) / (len(items) + 1)
+            new_z = [previous_z + step * (i + 1) for i in range(len(items))]
+        else:
+            new_z = [self.__bottom_z - len(items) + i for i in range(len(items))]
+            self.__bottom_z -= len(items)
+        self.__restack(items, new_z, args[0])
+
+    def raise_in_order(self, items: Sequence[int]) -> None:
+        """
+        This function brings objects to the top of their layers, stacked in
+        the given order rather than in their current one, so a whole stacking
+        order is restored at once.
+        :param items: The ids of the objects, bottom first.
+        """
+        items = [item for item in items if item in self.__objects]
+        if not items:
+            return
+        for item in items:
+            self.__top_z += 1
+            self.__z[item] = self.__top_z
+        self.__stack = sorted((self.__key(item), item)
+                              for _, item in self.__stack)
+        # The Tk items below the lowest raised one keep their order,
+        # the ones above it are raised in the new order, in one Tcl call
+        raised = set(items)
+        first = next((position for position, (_, item)
+                      in enumerate(self.__stack) if item in raised),
+                     len(self.__stack))
+        batch = TclBatch(self)
+        for _, item in self.__stack[first:]:
+            batch.add("raise", self.__to_tk[item])
+        batch.run()
+        if not self.__frozen.isdisjoint(raised):
+            # The backdrop draws the frozen objects in their order
+            self.__frozen_top = None
+            self.__backdrop_dirty = True
+            self.schedule_refresh()
+        if self.__frozen:
+            self.__thaw_covered(self.__objects)
+
+    def __restack(self, items: Tuple[int, ...], new_z: List[float],
+                  tag_or_id: TagOrId) -> None:
+        """
+        This function changes the stacking order of objects.
+        :param items: The ids of the objects, bottom first.
+        :param new_z: The new stacking order of each object.
+        :param tag_or_id: The tag or the id the objects were given by.
+        """
+        moved: List[int] = []
+        for item, z in zip(items, new_z):
+            self.__unfreeze(item)
+            if item in self.__to_tk:
+                position = bisect.bisect_left(self.__stack,
+                                              (self.__key(item), item))
+                del self.__stack[position]
+                moved.append(item)
+            self.__z[item] = z
+        for item in moved:
+            entry = (self.__key(item), item)
+            position = bisect.bisect(self.__stack, entry)
+            self.__stack.insert(position, entry)
+        shown = [self.__key(item) for item in items if self.__is_shown(item)]
+        if shown:
+            self.__thaw_above(min(shown))
+        if not moved:
+            return
+        positions = sorted(bisect.bisect_left(self.__stack,
+                                              (self.__key(item), item))
+                           for item in moved)
+        if self.__is_tag(tag_or_id) and \
+                positions[-1] - positions[0] == len(positions) - 1:
+            # The Tk items stay together, so one call restacks all of them
+            after = positions[-1] + 1
+            if after < len(self.__stack):
+                super().tag_lower(tag_or_id,
+                                  self.__to_tk[self.__stack[after][1]])
+            else:
+                super().tag_raise(tag_or_id)
+            return
+        # Place the Tk items top first, each right below the item above it
+        for position in reversed(positions):
+            tk_id = self.__to_tk[self.__stack[position][1]]
+            if position + 1 < len(self.__stack):
+                super().tag_lower(tk_id,
+                                  self.__to_tk[self.__stack[position + 1][1]])
+            else:
+                super().tag_raise(tk_id)
+
+    def find_all(self) -> Tuple[int, ...]:
+        return self.__sorted(list(self.__objects))
+
+    def find_withtag(self, tagOrId: TagOrId) -> Tuple[int, ...]:
+        return self.__sorted(self.__resolve(tagOrId))
+
+    def __from_tk_ids(self, tk_ids: Tuple[int, ...]) -> Tuple[int, ...]:
+        """
+        This function converts Tk ids to the ids of their objects.
+        :param tk_ids: The Tk ids.
+        :return: The ids of the objects, in the same order.
+        """
+        return tuple(self.__from_tk[tk_id] for tk_id in tk_ids
+                     if tk_id in self.__from_tk)
+
+    def find_closest(self, x: float, y: float, halo: Optional[float] = None,
+                     start: Optional[int] = None) -> Tuple[int, ...]:
+        if not self.__tile_items:
+            return self.__from_tk_ids(super().find_closest(x * self.zoom,
+                                                           y * self.zoom,
+                                                           halo, start))
+        # The backdrop covers the whole view, hide it so it is not the closest
+        super().itemconfigure(BACKDROP_TAG, state=tk.HIDDEN)
+        try:
+            return self.__from_tk_ids(super().find_closest(x * self.zoom,
+                                                           y * self.zoom,
+                                                           halo, start))
+        finally:
+            super().itemconfigure(BACKDROP_TAG, state=tk.NORMAL)
+
+    def find_overlapping(self, x1: float, y1: float,
+                         x2: float, y2: float) -> Tuple[int, ...]:
+        region: BBox = (x1, y1, x2, y2)
+        if self.__region is not None and box_contains(self.__region, region):
+            # Tk tests the exact shapes of the items
+            return self.__from_tk_ids(super().find_overlapping(
+                *[value * self.zoom for value in region]))
+        found = self.__index.query(*grow_box(region, self.__widest_reach()))
+        return self.__sorted([item for item in found
+                              if boxes_overlap(self.__drawn_bbox(item),
+                                               region)])
+
+    def find_enclosed(self, x1: float, y1: float,
+                      x2: float, y2: float) -> Tuple[int, ...]:
+        region: BBox = (x1, y1, x2, y2)
+        if self.__region is not None and box_contains(self.__region, region):
+            return self.__from_tk_ids(super().find_enclosed(
+                *[value * self.zoom for value in region]))
+        return self.__sorted([item for item in self.__index.query(*region)
+                              if box_contains(region,
+                                              self.__drawn_bbox(item))])
+
+    def find_hits(self, x: float, y: float,
+                  tolerance: float) -> Tuple[int, ...]:
+        """
+        This function finds the objects whose exact shape is near a point,
+        unlike find_closest, which goes by the bounding boxes of the items.
+        Only the objects whose bounding box is near the point are tested.
+        :param x: The x canvas coordinate of the point.
+        :param y: The y canvas coordinate of the point.
+        :param tolerance: How far from a line or an outline still hits it.
+        :return: The ids of the objects that are hit, bottom first.
+        """
+        reach = tolerance + self.__widest_reach()
+        candidates = list(self.__index.query(x - reach, y - reach,
+                                             x + reach, y + reach))
+        shapes: List[HitShape] = []
+        for item in candidates:
+            info = self.__objects[item]
+            if info["type"] == "text":
+                shapes.append(("text", self.__index.bbox(item), True, 0.0))
+                continue
+            try:
+                width = float(self.__option(info, "width", 1))
+            except ValueError:
+                width = 1.0
+            shapes.append((info["type"], info["coords"],
+                           info["type"] != "line" and
+                           self.__option(info, "fill") != "",
+                           width))
+        return self.__sorted([candidates[i]
+                              for i in hit_objects(shapes, x, y, tolerance,
+                                                   self.zoom)])
+
+    def snap_target(self, x: float, y: float, radius: float,
+                    exclude: Iterable[int] = ()) -> Optional[Tuple[float, float]]:
+        """
+        This function finds the nearest vertex, edge midpoint or bounding box
+        corner of the shown objects to a point.
+        :param x: The x canvas coordinate of the point.
+        :param y: The y canvas coordinate of the point.
+        :param radius: How far from the point to look.
+        :param exclude: The objects to leave out, like the ones being moved.
+                        Defaults to no objects.
+        :return: The point to snap to, or None if there is none near.
+        """
+        self.__update_snaps()
+        return self.__snaps.nearest(x, y, radius, exclude)
+
+    def snap_points_of(self, item: int) -> np.ndarray:
+        """
+        This function returns the points of an object that snap to others.
+        :param item: The id of the object.
+        :return: An array of shape (n, 2) of the points,
+                 empty for the objects of hidden layers.
+        """
+        self.__update_snaps()
+        return self.__snaps.points(item)
+
+    def bbox(self, *args: TagOrId) -> Optional[Tuple[int, int, int, int]]:
+        items: List[int] = []
+        for tag_or_id in args:
+            items.extend(self.__resolve(tag_or_id))
+        if not items:
+            return None
+        if all(item in self.__to_tk for item in items):
+            x1, y1, x2, y2 = super().bbox(*[self.__to_tk[item]
+                                            for item in items])
+            zoom = self.zoom
+            return (int(x1 / zoom), int(y1 / zoom),
+                    int(x2 / zoom), int(y2 / zoom))
+        boxes = [self.__drawn_bbox(item) for item in items]
+        return (int(min(box[0] for box in boxes)),
+                int(min(box[1] for box in boxes)),
+                int(max(box[2] for box in boxes)) + 1,
+                int(max(box[3] for box in boxes)) + 1)
+
+    # ----- Layers -----
+
+    def __is_shown(self, item: int) -> bool:
+        """
+        This function checks whether an object's layer is visible.
+        :param item: The id of the object.
+        :return: True if the object's layer is visible, False otherwise.
+        """
+        return self.__layers[self.__ranks[self.__layer_of[item]]].visible
+
+    def __hide(self, item: int, is_frozen: bool = False) -> None:
+        """
+        This function leaves an object out of the Tk canvas and the index.
+        :param item: The id of the object.
+        :param is_frozen: Whether the object is being frozen, frozen objects
+                          are still drawn, so others keep snapping to them.
+                          Defaults to False.
+        """
+        if item in self.__to_tk:
+            self.__dematerialize(item)
+        self.__index.remove(item)
+        if not is_frozen:
+            self.__snaps.remove(item)
+            self.__unsnapped.discard(item)
+
+    def layers(self) -> List[Layer]:
+        """
+        This function returns the layers of the canvas.
+        :return: The layers, bottom first.
+        """
+        return list(self.__layers)
+
+    def layer(self, name: str) -> Layer:
+        """
+        This function returns a layer by its name.
+        :param name: The name of the layer.
+        :return: The layer.
+        """
+        return self.__layers[self.__ranks[name]]
+
+    def add_layer(self, name: str) -> Layer:
+        """
+        This function adds a layer on top of the other layers.
+        :param name: The name of the new layer, not used by another layer.
+        :return: The new layer.
+        """
+        if name in self.__ranks:
+            raise ValueError(f"There is already a layer named {name}")
+        layer = Layer(name)
+        self.__ranks[name] = len(self.__layers)
+        self.__layers.append(layer)
+        self.__members[name] = set()
+        return layer
+
+    def remove_layer(self, name: str, merge_into: str) -> None:
+        """
+        This function removes a layer.
+        Its objects are moved to another layer, on top of that layer's objects.
+        :param name: The name of the layer to remove.
+        :param merge_into: The name of the layer to move the objects to.
+        """
+        for item in self.__sorted(list(self.__members[name])):
+            self.set_layer(item, merge_into)
+        del self.__members[name]
+        self.__layers.pop(self.__ranks[name])
+        self.__ranks = {layer.name: rank
+                        for rank, layer in enumerate(self.__layers)}
+        self.__frozen_top = None
+        if self.current_layer == name:
+            self.current_layer = merge_into
+
+    def set_layers(self, layers: List[Layer]) -> None:
+        """
+        This function replaces the layers of an empty canvas,
+        when a saved canvas is loaded.
+        :param layers: The new layers, bottom first, with unique names.
+        """
+        names = [layer.name for layer in layers]
+        if len(set(names)) != len(names):
+            raise ValueError("The names of the layers are not unique")
+        self.__layers = list(layers)
+        self.__ranks = {layer.name: rank
+                        for rank, layer in enumerate(self.__layers)}
+        self.__members = {layer.name: set() for layer in self.__layers}
+        self.current_layer = self.__layers[-1].name
+
+    def move_layer(self, name: str, steps: int) -> None:
+        """
+        This function moves a layer up or down the stack of layers.
+        :param name: The name of the layer.
+        :param steps: How many layers to move up, negative moves down.
+        """
+        rank = self.__ranks[name]
+        new_rank = min(len(self.__layers) - 1, max(0, rank + steps))
+        if new_rank == rank:
+            return
+        self.__layers.insert(new_rank, self.__layers.pop(rank))
+        self.__ranks = {layer.name: rank
+                        for rank, layer in enumerate(self.__layers)}
+        # The Tk items below the first moved one keep their order,
+        # the ones above it are raised in the new order, in one Tcl call
+        old_order = [item for _, item in self.__stack]
+        self.__stack = sorted((self.__key(item), item)
+                              for _, item in self.__stack)
+        first = next((position for position, (_, item)
+                      in enumerate(self.__stack)
+                      if item != old_order[position]), len(self.__stack))
+        batch = TclBatch(self)
+        for _, item in self.__stack[first:]:
+            batch.add("raise", self.__to_tk[item])
+        batch.run()
+        if self.__frozen:
+            self.__frozen_top = None
+            self.__backdrop_dirty = True
+            self.schedule_refresh()
+            self.__thaw_covered(self.__objects)
+
+    def set_layer_visible(self, name: str, visible: bool) -> None:
+        """
+        This function shows or hides a layer.
+        The objects of a hidden layer are kept only as data.
+        :param name: The name of the layer.
+        :param visible: Whether to show the layer or hide it.
+        """
+        layer = self.layer(name)
+        if layer.visible == visible:
+            return
+        layer.visible = visible
+        if not self.__frozen.isdisjoint(self.__members[name]):
+            self.__backdrop_dirty = True
+            self.schedule_refresh()
+        with self.batch():
+            for item in self.__members[name]:
+                if visible:
+                    self.__sync(item)
+                else:
+                    self.__hide(item)
+            if visible:
+                self.__thaw_covered(self.__members[name])
+
+    def set_layer_locked(self, name: str, locked: bool) -> None:
+        """
+        This function locks or unlocks a layer.
+        :param name: The name of the layer.
+        :param locked: Whether to lock the layer or unlock it.
+        """
+        self.layer(name).locked = locked
+
+    @contextmanager
+    def drawing_on(self, name: str) -> Iterator[None]:
+        """
+        This function adds the objects created in the with block to a layer,
+        which is added if it is missing.
+        :param name: The name of the layer.
+        """
+        if name not in self.__ranks:
+            self.add_layer(name)
+        previous = self.current_layer
+        self.current_layer = name
+        try:
+            yield
+        finally:
+            self.current_layer = previous
+
+    @contextmanager
+    def recreating(self, item: Optional[int]) -> Iterator[None]:
+        """
+        This function gives the object created in the with block the id item,
+        for example when a deleted object is brought back by undo.
+        If item is None or is the id of an existing object, the object
+        gets a new id.
+        :param item: The id the object had.
+        """
+        self.__reused_id = item
+        try:
+            yield
+        finally:
+            self.__reused_id = None
+
+    def layer_of(self, item: int) -> str:
+        """
+        This function returns the layer of an object.
+        :param item: The id of the object.
+        :return: The name of the object's layer.
+        """
+        return self.__layer_of[item]
+
+    def set_layer(self, item: int, name: str) -> None:
+        """
+        This function moves an object to another layer, on top of its objects.
+        A missing layer is added, so undoing the deletion of an object
+        also brings back its removed layer.
+        :param item: The id of the object.
+        :param name: The name of the layer.
+        """
+        if name not in self.__ranks:
+            self.add_layer(name)
+        self.__unfreeze(item)
+        if item in self.__to_tk:
+            self.__dematerialize(item)
+        self.__members[self.__layer_of[item]].discard(item)
+        self.__layer_of[item] = name
+        self.__members[name].add(item)
+        self.__top_z += 1
+        self.__z[item] = self.__top_z
+        if self.__is_shown(item):
+            self.__thaw_above(self.__key(item))
+            self.__sync(item)
+        else:
+            self.__hide(item)
+
+    def layer_items(self, name: str) -> Tuple[int, ...]:
+        """
+        This function returns the objects of a layer.
+        :param name: The name of the layer.
+        :return: The ids of the layer's objects, bottom first.
+        """
+        return self.__sorted(list(self.__members[name]))
+
+    def is_locked(self, item: int) -> bool:
+        """
+        This function checks whether an object can not be erased or selected.
+        :param item: The id of the object.
+        :return: True if the object's layer is locked, False otherwise.
+        """
+        return self.__layers[self.__ranks[self.__layer_of[item]]].locked
+
+    # ----- Backdrop -----
+
+    def __drop_frozen(self, item: int) -> bool:
+        """
+        This function removes an object from the frozen objects.
+        :param item: The id of the object.
+        :return: True if the object was frozen, False otherwise.
+        """
+        if item not in self.__frozen:
+            return False
+        self.__frozen.discard(item)
+        self.__frozen_index.remove(item)
+        self.__frozen_top = None
+        self.__backdrop_dirty = True
+        self.schedule_refresh()
+        return True
+
+    def __unfreeze(self, item: int) -> None:
+        """
+        This function thaws an object that is about to change.
+        :param item: The id of the object.
+        """
+        if self.__drop_frozen(item):
+            if self.__is_shown(item):
+                self.__thaw_above(self.__key(item))
+            self.__sync(item)
+
+    def __top_frozen(self) -> Optional[StackKey]:
+        """
+        This function finds the stacking order of the highest frozen object.
+        :return: Its key, or None if no object is frozen.
+        """
+        if self.__frozen_top is None and self.__frozen:
+            self.__frozen_top = max(map(self.__key, self.__frozen))
+        return self.__frozen_top
+
+    def __thaw_above(self, key: StackKey) -> None:
+        """
+        This function thaws the frozen objects above a live object,
+        since the backdrop is drawn below all the live objects.
+        :param key: The stacking order of the live object.
+        """
+        top = self.__top_frozen()
+        if top is None or top < key:
+            return
+        for item in [item for item in self.__frozen if self.__key(item) > key]:
+            self.__drop_frozen(item)
+            self.__sync(item)
+
+    def __thaw_covered(self, items: Iterable[int]) -> None:
+        """
+        This function thaws the frozen objects above the lowest of some
+        objects that are live.
+        :param items: The ids of the objects.
+        """
+        live = [self.__key(item) for item in items
+                if item not in self.__frozen and self.__is_shown(item)]
+        if live:
+            self.__thaw_above(min(live))
+
+    def freeze(self, items: Iterable[int]) -> int:
+        """
+        This function replaces the Tk items of objects by the backdrop.
+        Text, and the objects of hidden layers, are not frozen. Since the
+        backdrop is drawn below all the live objects, objects above a live
+        object that stays are not frozen either.
+        :param items: The ids of the objects.
+        :return: The amount of objects that were frozen.
+        """
+        candidates = {item for item in items
+                      if item not in self.__frozen and item in self.__objects
+                      and self.__is_shown(item) and
+                      self.__objects[item]["type"] in FREEZABLE_TYPES}
+        ceiling = min((self.__key(item) for item in self.__objects
+                       if item not in candidates and
+                       item not in self.__frozen and self.__is_shown(item)),
+                      default=None)
+        count = 0
+        for item in candidates:
+            if ceiling is not None and self.__key(item) > ceiling:
+                continue
+            self.__hide(item, True)
+            self.__frozen.add(item)
+            self.__frozen_index.insert(item,
+                                       self.__bbox_of(self.__objects[item]))
+            count += 1
+        if count:
+            self.__frozen_top = None
+            self.__backdrop_dirty = True
+            self.refresh_view()
+        return count
+
+    def thaw(self, items: Optional[Iterable[int]] = None) -> None:
+        """
+        This function gives frozen objects their Tk items back.
+        :param items: The ids of the objects.
+                      Defaults to None, which thaws all the frozen objects.
+        """
+        for item in list(self.__frozen if items is None else items):
+            self.__unfreeze(item)
+        self.refresh_view()
+
+    def is_frozen(self, item: int) -> bool:
+        """
+        This function checks whether an object is frozen.
+        :param item: The id of the object.
+        :return: True if the object is drawn by the backdrop, False otherwise.
+        """
+        return item in self.__frozen
+
+    def frozen_count(self) -> int:
+        """
+        This function returns the amount of frozen objects.
+        """
+        return len(self.__frozen)
+
+    def configure(self, cnf: Optional[Dict[str, Any]] = None,
+                  **kw: Any) -> Any:
+        options: Dict[str, Any] = dict(cnf or {})
+        options.update(kw)
+        if "bg" in options or "background" in options:
+            # The backdrop is rendered over the background
+            self.__backdrop_dirty = True
+            self.schedule_refresh()
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def __rgb(self, color: str) -> Optional[Color]:
+        """
+        This function converts a Tk color to RGB.
+        :param color: The color, any color Tk accepts.
+        :return: The red, green and blue of the color,
+                 or None for the empty (transparent) color.
+        """
+        if color not in self.__colors:
+            if color:
+                red, green, blue = self.winfo_rgb(color)
+                self.__colors[color] = (red >> 8, green >> 8, blue >> 8)
+            else:
+                self.__colors[color] = None
+        return self.__colors[color]
+
+    def __tile_image(self, col: int, row: int) -> ImageTk.PhotoImage:
+        """
+        This function returns a tile of the backdrop,
+        rendering it only if it was not rendered yet.
+        :param col: The column of the tile.
+        :param row: The row of the tile.
+        :return: The image of the tile.
+        """
+        key = (col, row)
+        image = self.__tiles.get(key)
+        if image is not None:
+            self.__tiles.move_to_end(key)
+            return image
+        region = grow_box(tile_region(col, row, self.zoom),
+                          self.__widest_reach())
+        items = [item for item in self.__frozen_index.query(*region)
+                 if self.__is_shown(item)]
+        picture = render_tile([self.__expanded(self.__objects[item])
+                               for item in self.__sorted(items)],
+                              col, row, self.zoom,
+                              self.__rgb(self.cget("bg")) or (255, 255, 255),
+                              self.__rgb)
+        image = ImageTk.PhotoImage(picture, master=self)
+        self.__tiles[key] = image
+        # Forget the least recently used tiles that are not shown
+        for old_key in list(self.__tiles):
+            if len(self.__tiles) <= MAX_TILES:
+                break
+            if old_key not in self.__tile_items:
+                del self.__tiles[old_key]
+        return image
+
+    def __update_backdrop(self) -> None:
+        """
+        This function shows the tiles of the backdrop that are in the region
+        whose objects exist as Tk items, and only those.
+        """
+        if self.__backdrop_dirty:
+            # Everything that was rendered is outdated
+            super().delete(*self.__tile_items.values())
+            self.__tile_items.clear()
+            self.__tiles.clear()
+            self.__backdrop_dirty = False
+        if not self.__frozen and not self.__tile_items:
+            return
+        wanted: Set[Tuple[int, int]] = set()
+        region = self.__region
+        if self.__frozen and region is not None and \
+                all(math.isfinite(value) for value in region):
+            col1, row1, col2, row2 = tile_range(region, self.zoom)
+            reach = self.__widest_reach()
+            for col in range(col1, col2 + 1):
+                for row in range(row1, row2 + 1):
+                    found = self.__frozen_index.query(*grow_box(
+                        tile_region(col, row, self.zoom), reach))
+                    if any(self.__is_shown(item) for item in found):
+                        wanted.add((col, row))
+        for key in [key for key in self.__tile_items if key not in wanted]:
+            super().delete(self.__tile_items.pop(key))
+        for col, row in wanted:
+            if (col, row) in self.__tile_items:
+                continue
+            tk_id: int = super()._create(
+                "image", (col * TILE_SIZE, row * TILE_SIZE),
+                {"image": self.__tile_image(col, row), "anchor": tk.NW,
+                 "tags": BACKDROP_TAG})
+            # The backdrop is below all the other objects
+            super().tag_lower(tk_id)
+            self.__tile_items[(col, row)] = tk_id